@@ -17,6 +17,11 @@ class Comment(models.Model):
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     is_edited = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ]
     
     def __str__(self):
         return f"Комментарий пользователя {self.user_id.username} на задание '{self.task.title}'."
@@ -2,6 +2,8 @@
 
 from management.models import User_project
 from rest_framework import serializers
+from django.db.models import F
+from django.db import transaction
 from tasks.models import Task
 from users.utils import *
 from .models import *
@@ -42,11 +44,13 @@ class CreateCommentSerializer(serializers.ModelSerializer):
 
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
         user = self.context['request'].user
         task = validated_data.pop('task_id')
 
         comment = super().create({**validated_data, 'created_by': user, 'task': task})
+        Task.objects.filter(id=task.id).update(comment_count=F('comment_count') + 1)
 
         log_user_action(
             user=user,
@@ -60,7 +64,8 @@ class CreateCommentSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[receiver], 
             header="Получен новый комментарий", 
-            text=f"К задаче «{task.title}» проекта «{task.project.title}» добавлен новый комментарий."
+            text=f"К задаче «{task.title}» проекта «{task.project.title}» добавлен новый комментарий.",
+            idempotency_key=f"comment-created:{comment.id}"
         )
 
         return comment
@@ -104,6 +109,7 @@ class UpdateCommentSerializer(serializers.ModelSerializer):
         
         return data
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         text = validated_data.get('text')
 
@@ -1,3 +1,43 @@
-from django.test import TestCase
+# comments/tests.py
 
-# Create your tests here.
+from project_management_system_backend.testing import NPlusOneTestCase, ProjectFixtureTestCase
+from unittest.mock import patch
+from tasks.models import Task
+from .views import DeleteCommentView
+from .models import Comment
+
+
+class CommentListQueriesTests(NPlusOneTestCase):
+    def test_get_comments(self):
+        self.assertNoNPlusOne(self.data.member, f'/api/task/{self.data.task.id}/get-comments/', self.rows)
+
+
+class DeleteCommentTests(ProjectFixtureTestCase):
+    user = 'member'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.comment = Comment.objects.get(task=cls.data.task, created_by=cls.data.member)
+        Task.objects.filter(id=cls.data.task.id).update(comment_count=3)
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/comment/{self.comment.id}/delete/'
+
+    def get_comment_count(self):
+        return Task.all_objects.get(id=self.data.task.id).comment_count
+
+    def test_delete(self):
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertEqual(self.get_comment_count(), 2)
+
+    def test_concurrent_delete_decrements_once(self):
+        # Второй запрос получил комментарий до того, как первый его удалил
+        stale = Comment.objects.get(id=self.comment.id)
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+
+        with patch.object(DeleteCommentView, 'get_object', return_value=stale):
+            self.assertEqual(self.client.delete(self.url).status_code, 204)
+
+        self.assertEqual(self.get_comment_count(), 2)
@@ -1,8 +1,13 @@
 # comments/views.py
 
 from rest_framework.generics import CreateAPIView, ListAPIView, UpdateAPIView, DestroyAPIView
+from project_management_system_backend.normalization import NormalizedListMixin
+from management.pagination import OptionalPageNumberPagination
 from management.base_access_views import BaseProjectAccessView
 from rest_framework.exceptions import ValidationError
+from django.db.models import F
+from django.db import transaction
+from tasks.models import Task
 from .serializers import *
 from .models import *
 
@@ -13,14 +18,22 @@ class CreateCommentView(BaseProjectAccessView, CreateAPIView):
     serializer_class = CreateCommentSerializer
 
 
-# Вью для получения комментариев к задаче
-class GetCommentsByTaskIdView(BaseProjectAccessView, ListAPIView):
+# Вью для получения комментариев к задаче (shape=normalized - авторы выносятся в таблицу users)
+class GetCommentsByTaskIdView(BaseProjectAccessView, NormalizedListMixin, ListAPIView):
     serializer_class = GetCommentSerializer
+    pagination_class = OptionalPageNumberPagination
+    normalized_fields = {
+        'created_by': ('users', {
+            'username': 'created_by_username',
+            'first_name': 'created_by_first_name',
+            'last_name': 'created_by_last_name',
+        }),
+    }
 
     def get_queryset(self):
         task = self.kwargs['pk']
 
-        return Comment.objects.filter(task=task)
+        return Comment.objects.filter(task=task).select_related('created_by').order_by('created_at', 'id')
 
 
 # Вью для редактирования комментария
@@ -46,10 +59,15 @@ class DeleteCommentView(DestroyAPIView):
             )
             raise ValidationError({'no_rights': 'У Вас отсутствуют права для удаления этого комментария.'})
 
-        instance.delete()
+        with transaction.atomic():
+            # При одновременном удалении одного комментария счетчик уменьшает только запрос, удаливший строку
+            deleted, _ = Comment.objects.filter(pk=instance.pk).delete()
 
-        log_user_action(
-            user=user, 
-            action_name="Комментарии", 
-            description=f"Пользователь удалил комментарий к задаче «{task_title}»"
-        )
+            if deleted:
+                Task.all_objects.filter(id=instance.task_id).update(comment_count=F('comment_count') - 1)
+
+                log_user_action(
+                    user=user, 
+                    action_name="Комментарии", 
+                    description=f"Пользователь удалил комментарий к задаче «{task_title}»"
+                )
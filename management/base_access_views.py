@@ -9,6 +9,9 @@ class BaseProjectAccessView(GenericAPIView):
 class BaseAdminAccessView(GenericAPIView):
     permission_classes = [IsAdmin]
 
+class BaseAdminOrProjectLeaderAccessView(GenericAPIView):
+    permission_classes = [IsAdminOrProjectLeader]
+
 class BaseProjectLeaderAccessView(GenericAPIView):
     permission_classes = [IsProjectLeader]
 
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project_request',
+            index=models.Index(fields=['project', 'status', 'created_at'], name='project_request_status_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+REQUEST_STATUSES = {1: 'Ожидает', 2: 'Принята', 3: 'Отклонена'}
+FIELDS = {'status': REQUEST_STATUSES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбца
+    atomic = False
+
+    dependencies = [
+        ('management', '0002_project_request_status_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('management', 'project_request', FIELDS),
+            convert_labels('management', 'project_request', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='project_request',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=REQUEST_STATUSES),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def delete_duplicate_members(apps, schema_editor):
+    # Повторные записи участия (остаются самые ранние) мешают созданию ограничения уникальности
+    User_project = apps.get_model('management', 'User_project')
+    seen = set()
+    duplicates = []
+
+    for member_id, project_id, user_id in User_project.objects.order_by('id').values_list('id', 'project', 'user'):
+        if (project_id, user_id) in seen:
+            duplicates.append(member_id)
+        else:
+            seen.add((project_id, user_id))
+
+    User_project.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0003_project_request_status_codes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_members, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user_project',
+            constraint=models.UniqueConstraint(fields=('project', 'user'), name='unique_project_user'),
+        ),
+    ]
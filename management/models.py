@@ -2,8 +2,16 @@
 
 from django.db import models
 from users.models import User
+from project_management_system_backend.fields import LabelChoiceField
 from projects.models import Project
 
+# Коды статусов заявок хранятся в базе, метки отдаются в API (см. LabelChoiceField)
+REQUEST_STATUSES = {
+    1: 'Ожидает',
+    2: 'Принята',
+    3: 'Отклонена',
+}
+
 
 class Group(models.Model):
     name = models.CharField(max_length=150)
@@ -30,6 +38,11 @@ class User_project(models.Model):
     )
     date_joined_project = models.DateField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'user'], name='unique_project_user'),
+        ]
+
     def __str__(self):
         return f"Пользователь {self.user.username} в проекте '{self.project.title}' с ролью - '{self.user_group.name}'."
 
@@ -46,7 +59,12 @@ class Project_request(models.Model):
         on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=20)
+    status = LabelChoiceField(labels=REQUEST_STATUSES)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'created_at'], name='project_request_status_idx'),
+        ]
 
     def __str__(self):
         return f"Запрос пользователя {self.created_by.username} в проект '{self.project.title}' со статусом '{self.status}'."
@@ -0,0 +1,19 @@
+# management/pagination.py
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """
+    Постраничный вывод, включаемый параметрами page или page_size.
+    Без них список возвращается целиком, как и раньше, поэтому существующие клиенты не ломаются.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_query_param not in request.query_params and self.page_size_query_param not in request.query_params:
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
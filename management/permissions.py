@@ -46,6 +46,15 @@ class IsAdmin(BasePermission):
         return False
 
 
+class IsAdminOrProjectLeader(BasePermission):
+    """
+    Разрешает доступ администраторам и пользователям с правом управления проектами.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_admin or request.user.is_project_leader
+
+
 class IsAssigner(BasePermission):
     """
     Разрешает доступ только тем пользователям, которые являются Менеджерами в проекте.
@@ -2,7 +2,10 @@
 
 from rest_framework import serializers
 from projects.models import Project
+from django.db import transaction
+from django.db.models import F
 from users.models import User
+from tasks.models import Task
 from users.utils import *
 from .models import *
 
@@ -32,6 +35,7 @@ class CreateProjectRequestSerializer(serializers.ModelSerializer):
         
         return data
     
+    @transaction.atomic
     def create(self, validated_data):
         user = self.context['request'].user
         project = validated_data['project_id']
@@ -45,7 +49,8 @@ class CreateProjectRequestSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[project.created_by],
             header="Получена новая заявка на вступление в проект",
-            text=f"Пользователь {user.username} подал заявку на вступление в проект «{project.title}»"
+            text=f"Пользователь {user.username} подал заявку на вступление в проект «{project.title}»",
+            idempotency_key=f"project-request:{request_obj.id}"
         )
 
         log_user_action(
@@ -66,22 +71,28 @@ class GetUsersSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'group_in_project', 'last_login', 'date_joined_project']
 
-    def get_group_in_project(self, obj):
-        project = self.context.get('project_id')  
+    def get_membership(self, obj):
+        # Если вью заранее получила участников проекта (словарь user_id: User_project), запрос к БД не нужен
+        memberships = self.context.get('memberships')
+
+        if memberships is not None:
+            return memberships.get(obj.id)
+
+        project = self.context.get('project_id')
 
-        user_project = User_project.objects.filter(
+        return User_project.objects.filter(
             user=obj.id,
             project=project
         ).select_related('user_group').first()
+
+    def get_group_in_project(self, obj):
+        user_project = self.get_membership(obj)
         
         return user_project.user_group.name if user_project else None
     
     def get_date_joined_project(self, obj):
-        project = self.context.get('project_id')
-        user_project = User_project.objects.filter(
-            user=obj.id,
-            project=project
-        ).first()
+        user_project = self.get_membership(obj)
+
         return user_project.date_joined_project if user_project else None
 
 
@@ -137,6 +148,7 @@ class AddProjectMemberSerializer(serializers.ModelSerializer):
 
         return data
 
+    @transaction.atomic
     def create(self, validated_data):
         user_group = validated_data.get('user_group')
         user = validated_data.get('user_id')
@@ -158,7 +170,8 @@ class AddProjectMemberSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[user], 
             header="Вступление в проекты", 
-            text=f"Вас добавили в проект «{project.title}»"
+            text=f"Вас добавили в проект «{project.title}»",
+            idempotency_key=f"member-added:{member.id}"
         )
 
         return member
@@ -175,26 +188,28 @@ class SetProjectRequestStatusSerializer(serializers.ModelSerializer):
         
         project_request = self.instance
 
-        if project_request.status == "Отклонена":
-            raise serializers.ValidationError({"request_already_satisfied":"Заявка уже отклонена."})
+        if project_request.status != "Ожидает":
+            raise serializers.ValidationError({"request_already_satisfied": f"Заявка уже {project_request.status.lower()}."})
 
         if project_request.project.created_by != user:
             raise serializers.ValidationError({"no_rights": "У Вас нет прав для изменения статуса заявки."})
 
         return data
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         instance = super().update(instance, validated_data)
 
+        action = log_user_action(user=instance.project.created_by, 
+            action_name="Управление пользователями", 
+            description=f"Руководитель изменил статус заявки {instance.created_by} на «{instance.status}» в проекте «{instance.project.title}»"
+        )
+
         send_mail_notification(
             users=[instance.created_by], 
             header="Вступление в проекты", 
-            text=f"Статус Вашей заявки на вступление в проект «{instance.project.title}» изменен на «{instance.status}»"
-        )
-
-        log_user_action(user=instance.project.created_by, 
-            action_name="Управление пользователями", 
-            description=f"Руководитель изменил статус заявки {instance.created_by} на «{instance.status}» в проекте «{instance.project.title}»"
+            text=f"Статус Вашей заявки на вступление в проект «{instance.project.title}» изменен на «{instance.status}»",
+            idempotency_key=f"project-request-status:{instance.id}:{action.id}"
         )
 
         return instance
@@ -216,6 +231,7 @@ class UsersProjectsSerializer(serializers.ModelSerializer):
         model = User_project
         fields = ['user', 'project', 'user_group']
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         user = self.context['request'].user
         executor_group = Group.objects.get(name="Исполнитель")
@@ -234,7 +250,7 @@ class UsersProjectsSerializer(serializers.ModelSerializer):
         
         instance.save()
 
-        log_user_action(
+        action = log_user_action(
             user=user, 
             action_name="Управление пользователями", 
             description=f"Руководитель изменил группу для {instance.user.username}"
@@ -243,7 +259,8 @@ class UsersProjectsSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[instance.user],
             header="Изменения группы",
-            text=f"Ваша группа в проекте «{instance.project.title}» была изменена."
+            text=f"Ваша группа в проекте «{instance.project.title}» была изменена.",
+            idempotency_key=f"member-group:{instance.id}:{action.id}"
         )
         
         return instance 
@@ -255,13 +272,14 @@ class ChangeProjectLeaderSerializer(serializers.ModelSerializer):
         model = User
         fields = ['is_project_leader']
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         user = self.context['request'].user
 
         instance.is_project_leader = not instance.is_project_leader
         instance.save()
 
-        log_user_action(
+        action = log_user_action(
             user=user, 
             action_name="Управление пользователями", 
             description=f"Администратор изменил право руководителя для {instance.username}"
@@ -270,7 +288,8 @@ class ChangeProjectLeaderSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[instance], 
             header="Изменение Ваших прав в системе", 
-            text=f"Ваши права управления проектами были изменены."
+            text=f"Ваши права управления проектами были изменены.",
+            idempotency_key=f"leader-rights:{instance.id}:{action.id}"
         )
 
         return instance
@@ -282,13 +301,14 @@ class ChangeActivationSerializer(serializers.ModelSerializer):
         model = User
         fields = ['is_active']
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         user = self.context['request'].user
 
         instance.is_active = not instance.is_active
         instance.save()
 
-        log_user_action(
+        action = log_user_action(
             user=user, 
             action_name="Управление пользователями", 
             description=f"Администратор изменил доступ пользователю {instance.username} к аккаунту"
@@ -297,7 +317,300 @@ class ChangeActivationSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[instance], 
             header="Блокировка аккаунта", 
-            text=f"Доступ к Вашему аккаунту был изменен."
+            text=f"Доступ к Вашему аккаунту был изменен.",
+            idempotency_key=f"account-activation:{instance.id}:{action.id}"
         )
 
         return instance
+
+
+# Участник в массовых операциях: пользователь и его группа в проекте
+class BulkMemberSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    user_group = serializers.ChoiceField(choices=["Исполнитель", "Менеджер"])
+
+
+# Базовый сериализатор для массовых операций в проекте (доступны только руководителю проекта)
+class BaseBulkProjectSerializer(serializers.Serializer):
+    action_description = ''
+
+    def check_rights(self):
+        project = self.context['project']
+        user = self.context['request'].user
+
+        if project.created_by_id != user.id:
+            log_user_action(
+                user=user, 
+                action_name="Управление пользователями", 
+                description=f"Пользователь послал запрос на {self.action_description} в проекте «{project.title}»",
+                status='Ошибка прав доступа'
+            )
+            raise serializers.ValidationError({"no_rights": "У Вас нет прав на управление участниками проекта."})
+
+
+# Базовый сериализатор для массовых операций с участниками проекта
+class BaseBulkMembersSerializer(BaseBulkProjectSerializer):
+    max_members = 500
+
+    def check_user_ids(self, user_ids):
+        if len(user_ids) > self.max_members:
+            raise serializers.ValidationError(f"За один запрос можно обработать не более {self.max_members} пользователей.")
+
+        if len(set(user_ids)) != len(user_ids):
+            raise serializers.ValidationError("Пользователи в списке не должны повторяться.")
+
+    def get_memberships(self, user_ids):
+        return User_project.objects.filter(project=self.context['project'], user__in=user_ids)
+
+
+# Сериализатор для массового добавления пользователей в проект
+class BulkAddProjectMembersSerializer(BaseBulkMembersSerializer):
+    members = BulkMemberSerializer(many=True, allow_empty=False)
+    action_description = 'добавление участников'
+
+    def validate_members(self, members):
+        self.check_user_ids([member['user_id'] for member in members])
+        return members
+
+    def validate(self, data):
+        self.check_rights()
+        user_ids = [member['user_id'] for member in data['members']]
+
+        users = User.objects.in_bulk(user_ids)
+        missing = set(user_ids) - set(users)
+
+        if missing:
+            raise serializers.ValidationError({"users_not_found": f"Пользователи не найдены: {sorted(missing)}."})
+
+        existing = list(self.get_memberships(user_ids).values_list('user', flat=True))
+
+        if existing:
+            raise serializers.ValidationError({"request_already_satisfied": f"Пользователи уже состоят в проекте: {sorted(existing)}."})
+
+        data['users'] = users
+        data['groups'] = {group.name: group for group in Group.objects.filter(name__in={m['user_group'] for m in data['members']})}
+
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        project = self.context['project']
+        users = validated_data['users']
+        groups = validated_data['groups']
+
+        User_project.objects.bulk_create([
+            User_project(project=project, user=users[member['user_id']], user_group=groups[member['user_group']])
+            for member in validated_data['members']
+        ])
+
+        Project_request.objects.filter(project=project, created_by__in=users).exclude(status="Принята").update(status="Принята")
+
+        action = log_user_action(
+            user=self.context['request'].user, 
+            action_name="Вступление в проекты", 
+            description=f"Руководитель добавил в проект «{project.title}»: {', '.join(user.username for user in users.values())}"
+        )
+
+        send_mail_notification(
+            users=users.values(), 
+            header="Вступление в проекты", 
+            text=f"Вас добавили в проект «{project.title}»",
+            idempotency_key=f"members-added:{project.id}:{action.id}"
+        )
+
+        return list(users)
+
+
+# Сериализатор для массового изменения групп участников проекта
+class BulkChangeMemberGroupSerializer(BaseBulkMembersSerializer):
+    members = BulkMemberSerializer(many=True, allow_empty=False)
+    action_description = 'изменение групп участников'
+
+    def validate_members(self, members):
+        self.check_user_ids([member['user_id'] for member in members])
+        return members
+
+    def validate(self, data):
+        self.check_rights()
+        user_ids = [member['user_id'] for member in data['members']]
+
+        memberships = {
+            membership.user_id: membership
+            for membership in self.get_memberships(user_ids).select_related('user', 'user_group')
+        }
+        missing = set(user_ids) - set(memberships)
+
+        if missing:
+            raise serializers.ValidationError({"member_not_found": f"Пользователи не состоят в проекте: {sorted(missing)}."})
+
+        if any(membership.user_group.name == "Руководитель проекта" for membership in memberships.values()):
+            raise serializers.ValidationError({"process_error": "Невозможно изменить группу руководителя проекта."})
+
+        data['memberships'] = memberships
+        data['groups'] = {group.name: group for group in Group.objects.filter(name__in={m['user_group'] for m in data['members']})}
+
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        project = self.context['project']
+        memberships = validated_data['memberships']
+        groups = validated_data['groups']
+        changed = []
+
+        for member in validated_data['members']:
+            membership = memberships[member['user_id']]
+            group = groups[member['user_group']]
+
+            if membership.user_group_id != group.id:
+                membership.user_group = group
+                changed.append(membership)
+
+        User_project.objects.bulk_update(changed, ['user_group'])
+
+        if changed:
+            action = log_user_action(
+                user=self.context['request'].user, 
+                action_name="Управление пользователями", 
+                description=f"Руководитель изменил группу в проекте «{project.title}» для: "
+                            f"{', '.join(membership.user.username for membership in changed)}"
+            )
+
+            send_mail_notification(
+                users=[membership.user for membership in changed],
+                header="Изменения группы",
+                text=f"Ваша группа в проекте «{project.title}» была изменена.",
+                idempotency_key=f"members-group:{project.id}:{action.id}"
+            )
+
+        return [membership.user_id for membership in changed]
+
+
+# Сериализатор для массового исключения участников из проекта
+class BulkRemoveProjectMembersSerializer(BaseBulkMembersSerializer):
+    user_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    action_description = 'исключение участников'
+
+    def validate_user_ids(self, user_ids):
+        self.check_user_ids(user_ids)
+        return user_ids
+
+    def validate(self, data):
+        self.check_rights()
+        project = self.context['project']
+
+        if project.created_by_id in data['user_ids']:
+            raise serializers.ValidationError({"process_error": "Невозможно исключить руководителя проекта."})
+
+        memberships = list(self.get_memberships(data['user_ids']).select_related('user'))
+        missing = set(data['user_ids']) - {membership.user_id for membership in memberships}
+
+        if missing:
+            raise serializers.ValidationError({"member_not_found": f"Пользователи не состоят в проекте: {sorted(missing)}."})
+
+        data['memberships'] = memberships
+
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        project = self.context['project']
+        user_ids = validated_data['user_ids']
+        users = [membership.user for membership in validated_data['memberships']]
+
+        # Удаляем задачи, созданные исключаемыми пользователями, и переназначаем порученные им задачи на создателей.
+        # Архивные задачи тоже затрагиваются, поэтому используется all_objects
+        Task.all_objects.filter(created_by__in=user_ids, project=project).delete()
+        Task.all_objects.filter(assigned_to__in=user_ids, project=project).update(assigned_to=F('created_by'))
+
+        User_project.objects.filter(project=project, user__in=user_ids).delete()
+
+        action = log_user_action(
+            user=self.context['request'].user, 
+            action_name="Вступление в проекты", 
+            description=f"Руководитель исключил из проекта «{project.title}»: {', '.join(user.username for user in users)}"
+        )
+
+        send_mail_notification(
+            users=users, 
+            header="Исключение из проекта", 
+            text=f"Вас исключили из проекта «{project.title}».",
+            idempotency_key=f"members-removed:{project.id}:{action.id}"
+        )
+
+        return user_ids
+
+
+# Сериализатор для массового принятия/отклонения заявок на вступление в проект
+class BulkSetProjectRequestStatusSerializer(BaseBulkProjectSerializer):
+    request_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    status = serializers.ChoiceField(choices=["Принята", "Отклонена"])
+    max_requests = 500
+    action_description = 'изменение статуса заявок'
+
+    def validate_request_ids(self, request_ids):
+        if len(request_ids) > self.max_requests:
+            raise serializers.ValidationError(f"За один запрос можно обработать не более {self.max_requests} заявок.")
+
+        if len(set(request_ids)) != len(request_ids):
+            raise serializers.ValidationError("Заявки в списке не должны повторяться.")
+
+        return request_ids
+
+    def validate(self, data):
+        self.check_rights()
+
+        project_requests = list(
+            Project_request.objects.filter(project=self.context['project'], id__in=data['request_ids']).select_related('created_by')
+        )
+        missing = set(data['request_ids']) - {project_request.id for project_request in project_requests}
+
+        if missing:
+            raise serializers.ValidationError({"request_not_found": f"Заявки не найдены: {sorted(missing)}."})
+
+        # Как и при изменении одной заявки, рассмотренные заявки (принятые или отклоненные) не меняются
+        satisfied = [project_request.id for project_request in project_requests if project_request.status != "Ожидает"]
+
+        if satisfied:
+            raise serializers.ValidationError({"request_already_satisfied": f"Заявки уже рассмотрены: {sorted(satisfied)}."})
+
+        data['project_requests'] = project_requests
+
+        return data
+
+    @transaction.atomic
+    def create(self, validated_data):
+        project = self.context['project']
+        new_status = validated_data['status']
+        project_requests = validated_data['project_requests']
+        # У пользователя может быть несколько заявок в пакете - участником и адресатом письма он становится один раз
+        users = list({project_request.created_by_id: project_request.created_by for project_request in project_requests}.values())
+
+        Project_request.objects.filter(
+            id__in=[project_request.id for project_request in project_requests]
+        ).update(status=new_status)
+
+        if new_status == "Принята":
+            existing = set(User_project.objects.filter(project=project, user__in=users).values_list('user', flat=True))
+            executor_group = Group.objects.get(name="Исполнитель")
+
+            User_project.objects.bulk_create([
+                User_project(project=project, user=user, user_group=executor_group)
+                for user in users if user.id not in existing
+            ])
+
+        action = log_user_action(
+            user=self.context['request'].user, 
+            action_name="Управление пользователями", 
+            description=f"Руководитель изменил статус заявок на «{new_status}» в проекте «{project.title}»: "
+                        f"{', '.join(user.username for user in users)}"
+        )
+
+        send_mail_notification(
+            users=users, 
+            header="Вступление в проекты", 
+            text=f"Статус Вашей заявки на вступление в проект «{project.title}» изменен на «{new_status}»",
+            idempotency_key=f"project-requests-status:{project.id}:{action.id}"
+        )
+
+        return [project_request.id for project_request in project_requests]
@@ -1,3 +1,245 @@
-from django.test import TestCase
+# management/tests.py
 
-# Create your tests here.
+from project_management_system_backend.testing import NPlusOneTestCase, ProjectFixtureTestCase
+from django.utils.timezone import now
+from unittest.mock import patch
+from tasks.models import Task
+from .serializers import BaseBulkMembersSerializer, BulkSetProjectRequestStatusSerializer
+from .views import SearchUsersNotInProjectView
+from .models import User_project, Project_request
+
+
+class ManagementListQueriesTests(NPlusOneTestCase):
+    def test_get_users_in_project(self):
+        # Руководитель и все участники
+        self.assertNoNPlusOne(self.data.leader, f'/api/project/{self.data.project.id}/get-users/', self.rows + 1)
+
+    def test_get_users_not_in_project(self):
+        self.assertNoNPlusOne(self.data.leader, f'/api/project/{self.data.project.id}/get-none-users/', self.rows)
+
+    def test_get_project_requests(self):
+        self.assertNoNPlusOne(self.data.leader, f'/api/project/{self.data.project.id}/get-requests/', self.rows)
+
+
+class SearchUsersNotInProjectTests(ProjectFixtureTestCase):
+    def search(self, **params):
+        response = self.client.get(f'/api/project/{self.data.project.id}/search-none-users/', params)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        return [user['username'] for user in response.data['results']], response.data['next_cursor']
+
+    def test_members_and_admins_excluded(self):
+        # Префикс подходит участникам и администратору, но в выдачу они не попадают
+        self.assertEqual(self.search(q='MEMBER'), ([], None))
+        self.assertEqual(self.search(q='adm'), ([], None))
+        self.assertEqual(self.search(q='OUTSIDER1'), (['outsider1'], None))
+
+    def test_blank_query(self):
+        self.assertEqual(self.search(q='   '), (['outsider0', 'outsider1', 'outsider2'], None))
+
+    def test_cursor(self):
+        self.assertEqual(self.search(limit=2), (['outsider0', 'outsider1'], 'outsider1'))
+        self.assertEqual(self.search(limit=2, cursor='outsider1'), (['outsider2'], None))
+
+    def test_last_page_has_no_cursor(self):
+        self.assertEqual(self.search(limit=3), (['outsider0', 'outsider1', 'outsider2'], None))
+
+    def test_limit_bounds(self):
+        self.assertEqual(self.search(limit=0), (['outsider0'], 'outsider0'))
+
+        with patch.object(SearchUsersNotInProjectView, 'max_limit', 2):
+            self.assertEqual(self.search(limit=1000), (['outsider0', 'outsider1'], 'outsider1'))
+
+    def test_bad_limit(self):
+        response = self.client.get(f'/api/project/{self.data.project.id}/search-none-users/', {'limit': 'x'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'limit': 'Лимит должен быть числом.'})
+
+
+class BulkMembersTests(ProjectFixtureTestCase):
+    def post(self, action, data):
+        return self.client.post(f'/api/project/{self.data.project.id}/{action}/', data, format='json')
+
+    def get_groups(self, users):
+        return dict(
+            User_project.objects.filter(project=self.data.project, user__in=users).values_list('user', 'user_group__name')
+        )
+
+    def test_add_unknown_user(self):
+        response = self.post('bulk-add-members', {'members': [
+            {'user_id': self.data.outsiders[0].id, 'user_group': 'Исполнитель'},
+            {'user_id': 0, 'user_group': 'Исполнитель'},
+        ]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'users_not_found': ['Пользователи не найдены: [0].']})
+        self.assertEqual(self.get_groups([self.data.outsiders[0]]), {})
+        self.assertEqual(Project_request.objects.get(created_by=self.data.outsiders[0]).status, 'Ожидает')
+
+    def test_empty(self):
+        for action, field in (('bulk-add-members', 'members'), ('bulk-remove-members', 'user_ids')):
+            response = self.post(action, {field: []})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(field, response.json())
+
+    def test_limit(self):
+        with patch.object(BaseBulkMembersSerializer, 'max_members', 1):
+            response = self.post('bulk-remove-members', {'user_ids': [user.id for user in self.data.members[1:]]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'user_ids': ['За один запрос можно обработать не более 1 пользователей.']})
+
+    def test_add_is_all_or_nothing(self):
+        response = self.post('bulk-add-members', {'members': [
+            {'user_id': self.data.outsiders[0].id, 'user_group': 'Исполнитель'},
+            {'user_id': self.data.member.id, 'user_group': 'Исполнитель'},
+        ]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('request_already_satisfied', response.json())
+        self.assertEqual(self.get_groups([self.data.outsiders[0]]), {})
+
+    def test_duplicates(self):
+        response = self.post('bulk-remove-members', {'user_ids': [self.data.member.id] * 2})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'user_ids': ['Пользователи в списке не должны повторяться.']})
+
+    def test_change_group_of_non_member(self):
+        response = self.post('bulk-change-member-group', {'members': [
+            {'user_id': self.data.members[1].id, 'user_group': 'Менеджер'},
+            {'user_id': self.data.outsiders[0].id, 'user_group': 'Менеджер'},
+        ]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'member_not_found': [f'Пользователи не состоят в проекте: [{self.data.outsiders[0].id}].']})
+        self.assertEqual(self.get_groups([self.data.members[1]]), {self.data.members[1].id: 'Исполнитель'})
+
+    def test_change_group(self):
+        first, second = self.data.members[:2]
+        response = self.post('bulk-change-member-group', {'members': [
+            {'user_id': first.id, 'user_group': 'Менеджер'},
+            {'user_id': second.id, 'user_group': 'Исполнитель'},
+        ]})
+
+        # Возвращаются только участники, группа которых действительно изменилась
+        self.assertEqual(response.json(), {'user_ids': [first.id]})
+        self.assertEqual(self.get_groups([first, second]), {first.id: 'Менеджер', second.id: 'Исполнитель'})
+
+    def test_change_group_of_leader(self):
+        response = self.post('bulk-change-member-group', {'members': [
+            {'user_id': self.data.leader.id, 'user_group': 'Исполнитель'},
+        ]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('process_error', response.json())
+
+    def test_remove_non_member(self):
+        response = self.post('bulk-remove-members', {'user_ids': [self.data.members[1].id, self.data.outsiders[0].id]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('member_not_found', response.json())
+        self.assertEqual(self.get_groups([self.data.members[1]]), {self.data.members[1].id: 'Исполнитель'})
+
+    def test_remove_reassigns_archived_tasks(self):
+        Task.objects.filter(id=self.data.task.id).update(archived_at=now())
+        response = self.post('bulk-remove-members', {'user_ids': [self.data.member.id]})
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(set(Task.all_objects.filter(project=self.data.project).values_list('assigned_to', flat=True)),
+                         {self.data.leader.id})
+
+    def test_remove_leader(self):
+        response = self.post('bulk-remove-members', {'user_ids': [self.data.leader.id]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('process_error', response.json())
+
+    def test_only_project_leader(self):
+        self.client.force_authenticate(self.data.member)
+        response = self.post('bulk-remove-members', {'user_ids': [self.data.members[1].id]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no_rights', response.json())
+
+
+class BulkSetProjectRequestStatusTests(ProjectFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.requests = list(Project_request.objects.filter(project=cls.data.project).order_by('id'))
+        cls.url = f'/api/project/{cls.data.project.id}/bulk-set-request-status/'
+
+    def post(self, request_ids, new_status='Принята'):
+        return self.client.post(self.url, {'request_ids': request_ids, 'status': new_status}, format='json')
+
+    def test_request_of_other_project(self):
+        other = Project_request.objects.create(project=self.data.projects[1], created_by=self.data.outsiders[0], status='Ожидает')
+        response = self.post([self.requests[1].id, other.id])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('request_not_found', response.json())
+        self.assertEqual(Project_request.objects.get(id=other.id).status, 'Ожидает')
+        self.assertFalse(User_project.objects.filter(user__in=self.data.outsiders).exists())
+
+    def test_several_requests_of_one_user(self):
+        outsider = self.data.outsiders[0]
+        second = Project_request.objects.create(project=self.data.project, created_by=outsider, status='Ожидает')
+
+        with patch('management.serializers.send_mail_notification') as send_mail:
+            response = self.post([self.requests[0].id, second.id])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(User_project.objects.filter(project=self.data.project, user=outsider).count(), 1)
+        self.assertEqual(send_mail.call_args.kwargs['users'], [outsider])
+
+    def test_rejected_request_is_not_accepted(self):
+        rejected = self.requests[0]
+        Project_request.objects.filter(id=rejected.id).update(status='Отклонена')
+
+        response = self.post([rejected.id, self.requests[1].id])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'request_already_satisfied': [f'Заявки уже рассмотрены: {[rejected.id]}.']})
+        self.assertFalse(User_project.objects.filter(project=self.data.project, user__in=self.data.outsiders).exists())
+
+    def test_single_request_status_is_final(self):
+        accepted = self.requests[0]
+        Project_request.objects.filter(id=accepted.id).update(status='Принята')
+
+        response = self.client.patch(
+            f'/api/project/{self.data.project.id}/request/{accepted.id}/set-status/', {'status': 'Отклонена'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'request_already_satisfied': ['Заявка уже принята.']})
+        self.assertEqual(Project_request.objects.get(id=accepted.id).status, 'Принята')
+
+    def test_duplicates(self):
+        response = self.post([self.requests[0].id] * 2)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'request_ids': ['Заявки в списке не должны повторяться.']})
+
+    def test_limit(self):
+        with patch.object(BulkSetProjectRequestStatusSerializer, 'max_requests', 2):
+            response = self.post([project_request.id for project_request in self.requests])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'request_ids': ['За один запрос можно обработать не более 2 заявок.']})
+
+    def test_not_found(self):
+        response = self.post([self.requests[0].id, 0])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('request_not_found', response.json())
+
+    def test_only_project_leader(self):
+        self.client.force_authenticate(self.data.member)
+        response = self.post([self.requests[0].id], 'Отклонена')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no_rights', response.json())
+        self.assertEqual(Project_request.objects.get(id=self.requests[0].id).status, 'Ожидает')
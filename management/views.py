@@ -1,10 +1,13 @@
 # management/views.py
 
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
 from .base_access_views import BaseAdminAccessView, BaseProjectAccessView, BaseProjectLeaderAccessView
 from rest_framework.exceptions import ValidationError
 from .models import User_project, Project_request
+from .pagination import OptionalPageNumberPagination
 from django.shortcuts import get_object_or_404
+from django.db.models import Exists, OuterRef, Q
+from django.db import transaction
 from rest_framework.response import Response
 from projects.models import Project
 from rest_framework import status
@@ -16,6 +19,7 @@ from users.utils import *
 
 # Вью для создания заявки на вступление в проект
 class CreateProjectRequestView(CreateAPIView):
+    throttle_scope = 'join_request'
     serializer_class = CreateProjectRequestSerializer
 
 
@@ -34,10 +38,22 @@ class GetUsersInProjectView(ListAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['project_id'] = self.kwargs['pk']
+        context['memberships'] = {
+            user_project.user_id: user_project
+            for user_project in User_project.objects.filter(project=self.kwargs['pk']).select_related('user_group')
+        }
 
         return context
 
 
+# Пользователи (кроме администраторов), не состоящие в проекте. NOT EXISTS вместо NOT IN позволяет
+# планировщику выполнить антисоединение и не зависит от размера подзапроса
+def get_users_not_in_project(project):
+    return User.objects.filter(is_admin=False).filter(
+        ~Exists(User_project.objects.filter(project=project, user=OuterRef('pk')))
+    )
+
+
 # Вью для получения пользователей, не состоящих в проекте
 class GetUsersNotInProjectView(ListAPIView):
     serializer_class = GetUsersSerializer
@@ -45,19 +61,82 @@ class GetUsersNotInProjectView(ListAPIView):
     def get_queryset(self):
         project = self.kwargs['pk']
 
-        users_in_project = User_project.objects.filter(project=project).values('user')
-        users_not_in_project = User.objects.exclude(id__in=users_in_project).exclude(is_admin=True)
-        
-        return users_not_in_project
+        return get_users_not_in_project(project)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Пользователи вне проекта не имеют группы и даты вступления, запросы к User_project не нужны
+        context['memberships'] = {}
+
+        return context
+
+
+# Вью для поиска пользователей, не состоящих в проекте, по началу логина, email, имени или фамилии
+class SearchUsersNotInProjectView(GenericAPIView):
+    serializer_class = GetUsersSerializer
+    default_limit = 20
+    max_limit = 50
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['memberships'] = {}
+
+        return context
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Лимит должен быть числом.'})
+
+        return min(max(limit, 1), self.max_limit)
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        cursor = request.query_params.get('cursor')
+        limit = self.get_limit()
+
+        users = get_users_not_in_project(self.kwargs['pk'])
+
+        if query:
+            users = users.filter(
+                Q(username__istartswith=query) | Q(email__istartswith=query) |
+                Q(first_name__istartswith=query) | Q(last_name__istartswith=query)
+            )
+
+        # Продолжение выдачи по логину последнего полученного пользователя (keyset), без OFFSET
+        if cursor:
+            users = users.filter(username__gt=cursor)
+
+        users = list(users.order_by('username')[:limit + 1])
+        next_cursor = users[limit - 1].username if len(users) > limit else None
+
+        return Response({
+            'results': self.get_serializer(users[:limit], many=True).data,
+            'next_cursor': next_cursor,
+        })
 
 
 # Вью для получения заявок на вступление в проект
 class GetProjectRequestsView(ListAPIView):
+    """
+    По умолчанию возвращает все непринятые заявки. Параметр status (через запятую) ограничивает
+    выборку указанными статусами, page и page_size включают постраничный вывод.
+    """
     serializer_class = GetProjectRequestsSerializer
+    pagination_class = OptionalPageNumberPagination
 
     def get_queryset(self):
         project = self.kwargs['pk']
-        return Project_request.objects.filter(project=project).exclude(status="Принята")
+        statuses = get_choice_params(self.request, Project_request, 'status')
+        requests = Project_request.objects.filter(project=project)
+
+        if statuses:
+            requests = requests.filter(status__in=statuses)
+        else:
+            requests = requests.exclude(status="Принята")
+
+        return requests.select_related('created_by').order_by('created_at', 'id')
 
 
 # Вью для добавления пользователей в проект
@@ -98,30 +177,33 @@ class RemoveProjectMemberView(DestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
-        # Удаляем все задачи, созданные исключаемым пользователем
-        Task.objects.filter(created_by=self.user_to_remove, project=self.project).delete()
+        with transaction.atomic():
+            # Удаляем все задачи, созданные исключаемым пользователем (включая архивные)
+            Task.all_objects.filter(created_by=self.user_to_remove, project=self.project).delete()
 
-        # Переназначаем задачи, порученные пользователю, на создателя задачи
-        assigned_tasks = Task.objects.filter(assigned_to=self.user_to_remove, project=self.project)
+            # Переназначаем задачи, порученные пользователю, на создателя задачи
+            assigned_tasks = Task.all_objects.filter(assigned_to=self.user_to_remove, project=self.project)
         
-        for task in assigned_tasks:
-            task.assigned_to = task.created_by
-            task.save()
+            for task in assigned_tasks:
+                task.assigned_to = task.created_by
+                task.save()
 
-        # Удаление связи user-project
-        instance.delete()
+            # Удаление связи user-project
+            membership_id = instance.id
+            instance.delete()
 
-        log_user_action(
-            user=request.user, 
-            action_name="Вступление в проекты", 
-            description=f"Руководитель исключил {self.user_to_remove} из проекта «{self.project.title}»"
-        )
+            log_user_action(
+                user=request.user, 
+                action_name="Вступление в проекты", 
+                description=f"Руководитель исключил {self.user_to_remove} из проекта «{self.project.title}»"
+            )
 
-        send_mail_notification(
-            users=[self.user_to_remove], 
-            header="Исключение из проекта", 
-            text=f"Вас исключили из проекта «{self.project.title}»."
-        )
+            send_mail_notification(
+                users=[self.user_to_remove], 
+                header="Исключение из проекта", 
+                text=f"Вас исключили из проекта «{self.project.title}».",
+                idempotency_key=f"member-removed:{membership_id}"
+            )
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -163,3 +245,42 @@ class ChangeActivationView(BaseAdminAccessView, UpdateAPIView):
 
     def get_object(self):
         return User.objects.get(id=self.request.data['user_id'])
+
+
+# Базовая вью для массовых операций с участниками и заявками проекта
+class BaseBulkProjectView(GenericAPIView):
+    result_key = 'user_ids'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['project'] = get_object_or_404(Project, id=self.kwargs['project_id'])
+
+        return context
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+
+        return Response({self.result_key: result}, status=status.HTTP_200_OK)
+
+
+# Вью для массового добавления пользователей в проект
+class BulkAddProjectMembersView(BaseBulkProjectView):
+    serializer_class = BulkAddProjectMembersSerializer
+
+
+# Вью для массового изменения групп участников проекта
+class BulkChangeMemberGroupView(BaseBulkProjectView):
+    serializer_class = BulkChangeMemberGroupSerializer
+
+
+# Вью для массового исключения участников из проекта
+class BulkRemoveProjectMembersView(BaseBulkProjectView):
+    serializer_class = BulkRemoveProjectMembersSerializer
+
+
+# Вью для массового принятия/отклонения заявок на вступление в проект
+class BulkSetProjectRequestStatusView(BaseBulkProjectView):
+    serializer_class = BulkSetProjectRequestStatusSerializer
+    result_key = 'request_ids'
@@ -0,0 +1,94 @@
+# project_management_system_backend/benchmarks.py
+
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from project_statistics.utils import percentile
+from contextlib import nullcontext
+from time import perf_counter
+
+
+def get_client(user=None):
+    """
+    Возвращает тестовый API-клиент, авторизованный JWT-токеном пользователя (если он передан).
+    Запросы проходят через весь стек middleware, аутентификации и прав доступа.
+    """
+    client = APIClient(SERVER_NAME='localhost')
+
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+def measure(client, method, urls, repeat=20, data=None, rollback=False, expected_status=(200,), headers=None):
+    """
+    Выполняет запрос(ы) repeat раз и возвращает перцентили времени ответа (мс) и число SQL-запросов за итерацию.
+    urls может быть строкой или списком адресов, выполняемых последовательно в одной итерации.
+    При rollback=True изменения каждой итерации откатываются, что позволяет повторять изменяющие запросы.
+    headers - дополнительные заголовки в формате WSGI (например, HTTP_ACCEPT_ENCODING).
+    bytes - размер тела ответа(ов) последней итерации в том виде, в каком он передается клиенту.
+    Ограничение частоты запросов на время замера отключается: все итерации идут с одного адреса.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+
+    with override_settings(THROTTLE_ENABLED=False):
+        return _measure(client, method, urls, repeat, data, rollback, expected_status, headers)
+
+
+def _measure(client, method, urls, repeat, data, rollback, expected_status, headers):
+
+    timings = []
+    queries = 0
+    size = 0
+
+    for _ in range(repeat):
+        with transaction.atomic() if rollback else nullcontext():
+            with CaptureQueriesContext(connection) as context:
+                start = perf_counter()
+                size = 0
+
+                for url in urls:
+                    response = getattr(client, method)(url, data, format='json', **(headers or {}))
+
+                    if response.status_code not in expected_status:
+                        raise RuntimeError(f"{method.upper()} {url} вернул статус {response.status_code}.")
+
+                    # Потоковые ответы нужно дочитать, иначе время и запросы генератора не будут учтены
+                    if getattr(response, 'streaming', False):
+                        size += len(b''.join(response.streaming_content))
+                    else:
+                        size += len(response.content)
+
+                timings.append((perf_counter() - start) * 1000)
+
+            queries = len(context.captured_queries)
+
+            if rollback:
+                transaction.set_rollback(True)
+
+    timings.sort()
+
+    return {
+        'p50': percentile(timings, 50),
+        'p95': percentile(timings, 95),
+        'p99': percentile(timings, 99),
+        'queries': queries,
+        'bytes': size,
+    }
+
+
+def format_report(results):
+    """
+    Формирует текстовую таблицу с результатами замеров.
+    """
+    width = max(len(name) for name in results)
+    lines = [f"{'Эндпоинт':<{width}}  {'p50, мс':>9}  {'p95, мс':>9}  {'p99, мс':>9}  {'SQL':>5}"]
+
+    for name, result in results.items():
+        lines.append(
+            f"{name:<{width}}  {result['p50']:>9.1f}  {result['p95']:>9.1f}  {result['p99']:>9.1f}  {result['queries']:>5}"
+        )
+
+    return '\n'.join(lines)
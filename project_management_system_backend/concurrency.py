@@ -0,0 +1,86 @@
+# project_management_system_backend/concurrency.py
+
+from rest_framework.exceptions import APIException
+from django.utils.timezone import now
+from django.db.models import F
+import re
+
+# Сильный ETag версии объекта: "3" или, для сжатого представления, "3-gzip" (см. CompressionMiddleware)
+ETAG_VERSION = re.compile(r'^"(\d+)(?:-(?:gzip|br|zstd))?"$')
+
+
+class PreconditionFailed(APIException):
+    status_code = 412
+    default_detail = {'version_conflict': 'Данные были изменены другим пользователем. Обновите страницу и повторите попытку.'}
+    default_code = 'version_conflict'
+
+
+def get_etag(instance):
+    return f'"{instance.version}"'
+
+
+def get_expected_version(request):
+    """
+    Возвращает версию объекта из заголовка If-Match (значение ETag из ответа, например "3" или "3-gzip"),
+    или None, если заголовок не передан или равен "*". If-Match сравнивает теги строго,
+    поэтому слабые теги (W/"3") отклоняются.
+    """
+    value = request.headers.get('If-Match', '').strip()
+
+    if not value or value == '*':
+        return None
+
+    match = ETAG_VERSION.match(value)
+
+    if match is None:
+        raise PreconditionFailed({'If-Match': 'Некорректное значение заголовка If-Match.'})
+    return int(match.group(1))
+
+
+def update_changed_fields(instance, validated_data, expected_version=None):
+    """
+    Записывает только изменившиеся поля одним условным запросом UPDATE ... WHERE id = ... AND version = ...
+    и увеличивает версию объекта. Ожидаемая версия берется из If-Match, а без него - из прочитанного объекта,
+    поэтому параллельное изменение не перезаписывается молча. Возвращает список измененных полей.
+    """
+    if expected_version is not None and expected_version != instance.version:
+        raise PreconditionFailed()
+
+    changed = {field: value for field, value in validated_data.items() if getattr(instance, field) != value}
+
+    if not changed:
+        return []
+
+    values = dict(changed, updated_at=now())
+    updated = type(instance)._base_manager.filter(pk=instance.pk, version=instance.version).update(
+        version=F('version') + 1, **values
+    )
+
+    if not updated:
+        raise PreconditionFailed()
+
+    for field, value in values.items():
+        setattr(instance, field, value)
+    instance.version += 1
+
+    return list(changed)
+
+
+class ETagMixin:
+    """
+    Примесь для вью чтения и изменения объекта: добавляет к успешному ответу заголовок ETag с версией объекта,
+    который клиент передает в If-Match при следующем изменении.
+    """
+
+    def get_object(self):
+        self.versioned_object = super().get_object()
+        return self.versioned_object
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        instance = getattr(self, 'versioned_object', None)
+
+        if instance is not None and response.status_code == 200:
+            response['ETag'] = get_etag(instance)
+
+        return response
@@ -0,0 +1,92 @@
+# project_management_system_backend/fields.py
+
+from django.utils.functional import cached_property
+from django.core.exceptions import ValidationError
+from django.db import models
+
+
+class LabelChoiceField(models.PositiveSmallIntegerField):
+    """
+    Поле с фиксированным набором значений: в базе хранится малый целочисленный код, а в Python-коде,
+    фильтрах ORM, сериализаторах и ответах API используется текстовая метка (например, «В процессе»).
+    labels - словарь {код: метка}. Коды уже записаны в базе, поэтому их нельзя менять или переиспользовать,
+    новые значения добавляются только с новыми кодами.
+    Сортировка по полю (order_by) идет по коду, а не по алфавиту меток: порядок кодов в labels задает
+    порядок значений (этапы статуса, возрастание приоритета).
+    """
+
+    def __init__(self, *args, labels=None, **kwargs):
+        self.labels = dict(labels or {})
+        self.codes = {label: code for code, label in self.labels.items()}
+        kwargs['choices'] = [(label, label) for label in self.labels.values()]
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('choices', None)
+        kwargs['labels'] = self.labels
+
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Проверки диапазона целых чисел к меткам не применяются, допустимость значения проверяют choices
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.labels[value]
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+
+        if isinstance(value, int) and value in self.labels:
+            return self.labels[value]
+
+        raise ValidationError(f"Недопустимое значение «{value}».", code='invalid_choice')
+
+    def get_prep_value(self, value):
+        if value == '' and self.null:
+            return None
+
+        if isinstance(value, str):
+            try:
+                return self.codes[value]
+            except KeyError:
+                raise ValueError(f"Недопустимое значение «{value}» для поля {self.name}.")
+
+        return super().get_prep_value(value)
+
+
+def convert_labels(app_label, model_name, fields, to_codes=True):
+    """
+    Возвращает функцию для RunPython, которая переписывает текстовые метки в полях fields ({поле: labels})
+    на строковые коды (to_codes=True) или обратно. После нее AlterField меняет тип столбца на целый
+    (или обратно на строковый). Незнакомые метки прерывают миграцию: их нужно сначала добавить в labels.
+    """
+    def convert(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        manager = model._base_manager
+
+        for field_name, labels in fields.items():
+            mapping = {label: str(code) for code, label in labels.items()}
+
+            if not to_codes:
+                mapping = {code: label for label, code in mapping.items()}
+
+            values = set(manager.exclude(**{f'{field_name}__isnull': True}).values_list(field_name, flat=True).distinct())
+            unknown = values - set(mapping) - {''}
+
+            if unknown:
+                raise RuntimeError(
+                    f"{model_name}.{field_name}: неизвестные значения {sorted(unknown)}, добавьте их в labels поля."
+                )
+
+            # Один UPDATE на каждое значение, а не на каждую строку
+            for old, new in mapping.items():
+                if old in values:
+                    manager.filter(**{field_name: old}).update(**{field_name: new})
+
+    return convert
@@ -0,0 +1,490 @@
+# project_management_system_backend/middleware.py
+
+from rest_framework.serializers import BaseSerializer
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.cache import patch_vary_headers
+from contextvars import ContextVar
+from contextlib import contextmanager
+from collections import Counter
+from django.db import connection
+from django.conf import settings
+from threading import Lock
+from time import perf_counter
+import logging
+from importlib.util import find_spec
+import random
+import zlib
+import re
+
+logger = logging.getLogger('request_metrics')
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_SQL_SPACES = re.compile(r"\s+")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def fingerprint_sql(sql):
+    """
+    Приводит SQL-запрос к общему виду: литералы заменяются на ?, списки IN сворачиваются.
+    Запросы, отличающиеся только параметрами, получают одинаковый отпечаток.
+    """
+    sql = _SQL_STRING.sub('?', sql)
+    sql = _SQL_NUMBER.sub('?', sql)
+    sql = _SQL_IN_LIST.sub('IN (...)', sql)
+    return _SQL_SPACES.sub(' ', sql).strip()
+
+
+class RequestMetrics:
+    """
+    Метрики одного запроса: количество и время SQL-запросов, время сериализации и их отпечатки.
+    """
+
+    def __init__(self, capture_sql=True):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.capture_sql = capture_sql
+        self.sql = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += perf_counter() - start
+
+            if self.capture_sql:
+                self.sql.append(sql)
+
+    def fingerprints(self):
+        return Counter(fingerprint_sql(sql) for sql in self.sql)
+
+
+def _timed_serializer_data(getter):
+    """
+    Оборачивает свойство BaseSerializer.data для учета времени сериализации в метриках текущего запроса.
+    Вложенные вызовы не учитываются повторно.
+    """
+    def data(self):
+        metrics = _current_metrics.get()
+
+        if metrics is None or metrics.serializer_depth:
+            return getter(self)
+
+        metrics.serializer_depth += 1
+        start = perf_counter()
+
+        try:
+            return getter(self)
+        finally:
+            metrics.serializer_time += perf_counter() - start
+            metrics.serializer_depth -= 1
+
+    return property(data)
+
+
+@contextmanager
+def measure_request(metrics):
+    """
+    Направляет SQL-запросы и время сериализации внутри блока with в метрики запроса metrics.
+    """
+    token = _current_metrics.set(metrics)
+
+    try:
+        with connection.execute_wrapper(metrics):
+            yield
+    finally:
+        _current_metrics.reset(token)
+
+
+def install_serializer_timing():
+    """
+    Подменяет свойство BaseSerializer.data оберткой, учитывающей время сериализации в метриках запроса.
+    Вызывается при создании RequestMetricsMiddleware, если включен REQUEST_METRICS_SERIALIZER_TIMING.
+    """
+    if not getattr(BaseSerializer, '_request_metrics_patched', False):
+        BaseSerializer.data = _timed_serializer_data(BaseSerializer.data.fget)
+        BaseSerializer._request_metrics_patched = True
+
+
+class MetricsRegistry:
+    """
+    Накопленные в процессе метрики по вью. Каждый процесс (воркер) хранит свои значения,
+    поэтому Prometheus должен опрашивать воркеры по отдельности или суммировать их.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.views = {}
+        self.compression = {}
+
+    def observe(self, view, status_code, total, metrics):
+        with self.lock:
+            stats = self.views.setdefault(view, {
+                'requests': Counter(),
+                'duration_sum': 0.0,
+                'db_time_sum': 0.0,
+                'serializer_time_sum': 0.0,
+                'queries_sum': 0,
+                'buckets': [0] * len(DURATION_BUCKETS),
+            })
+            stats['requests'][str(status_code)] += 1
+            stats['duration_sum'] += total
+            stats['db_time_sum'] += metrics.db_time
+            stats['serializer_time_sum'] += metrics.serializer_time
+            stats['queries_sum'] += metrics.queries
+
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if total <= bound:
+                    stats['buckets'][i] += 1
+
+    def observe_compression(self, encoding, original, compressed):
+        with self.lock:
+            stats = self.compression.setdefault(encoding, {'responses': 0, 'original': 0, 'compressed': 0})
+            stats['responses'] += 1
+            stats['original'] += original
+            stats['compressed'] += compressed
+
+    def render(self):
+        lines = [
+            '# HELP http_requests_total Количество замеренных запросов.',
+            '# TYPE http_requests_total counter',
+        ]
+
+        with self.lock:
+            views = {view: dict(stats, requests=Counter(stats['requests']), buckets=list(stats['buckets']))
+                     for view, stats in self.views.items()}
+            compression = {encoding: dict(stats) for encoding, stats in self.compression.items()}
+
+        for view, stats in views.items():
+            for code, count in stats['requests'].items():
+                lines.append(f'http_requests_total{{view="{view}",status="{code}"}} {count}')
+
+        for name, key, kind in (
+            ('http_request_db_seconds_sum', 'db_time_sum', 'counter'),
+            ('http_request_serializer_seconds_sum', 'serializer_time_sum', 'counter'),
+            ('http_request_db_queries_sum', 'queries_sum', 'counter'),
+        ):
+            lines.append(f'# TYPE {name} {kind}')
+
+            for view, stats in views.items():
+                lines.append(f'{name}{{view="{view}"}} {stats[key]}')
+
+        lines.append('# TYPE http_request_duration_seconds histogram')
+
+        for view, stats in views.items():
+            count = sum(stats['requests'].values())
+
+            for bound, value in zip(DURATION_BUCKETS, stats['buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {value}')
+
+            lines.append(f'http_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {count}')
+            lines.append(f'http_request_duration_seconds_sum{{view="{view}"}} {stats["duration_sum"]}')
+            lines.append(f'http_request_duration_seconds_count{{view="{view}"}} {count}')
+
+        lines.append('# TYPE http_compressed_responses_total counter')
+
+        for encoding, stats in compression.items():
+            lines.append(f'http_compressed_responses_total{{encoding="{encoding}"}} {stats["responses"]}')
+
+        lines.append('# TYPE http_response_bytes_total counter')
+
+        for encoding, stats in compression.items():
+            lines.append(f'http_response_bytes_total{{encoding="{encoding}",stage="original"}} {stats["original"]}')
+            lines.append(f'http_response_bytes_total{{encoding="{encoding}",stage="compressed"}} {stats["compressed"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetricsMiddleware:
+    """
+    Замеряет для каждого запроса количество и время SQL-запросов, время сериализации и общее время.
+    Добавляет заголовок Server-Timing, накапливает метрики для эндпоинта metrics_view и пишет в лог
+    медленные запросы. Текст SQL (отпечатки в логе) сохраняется только при REQUEST_METRICS_CAPTURE_SQL
+    и только для доли запросов REQUEST_METRICS_SAMPLE_RATE. Запросы, выполненные при чтении тела
+    потокового ответа, тоже относятся к запросу: метрики такого ответа записываются после отдачи тела.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if settings.REQUEST_METRICS_SERIALIZER_TIMING:
+            install_serializer_timing()
+
+    def __call__(self, request):
+        capture_sql = settings.REQUEST_METRICS_CAPTURE_SQL and random.random() < settings.REQUEST_METRICS_SAMPLE_RATE
+        metrics = RequestMetrics(capture_sql=capture_sql)
+        start = perf_counter()
+
+        with measure_request(metrics):
+            response = self.get_response(request)
+
+        # Для потокового ответа заголовок отправляется до тела и содержит только то, что измерено к этому моменту
+        response['Server-Timing'] = (
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries", '
+            f'ser;dur={metrics.serializer_time * 1000:.1f}, '
+            f'total;dur={(perf_counter() - start) * 1000:.1f}'
+        )
+
+        if response.streaming:
+            response.streaming_content = self.measure_stream(response.streaming_content, request, response, metrics, start)
+        else:
+            self.record(request, response, metrics, perf_counter() - start)
+
+        return response
+
+    def measure_stream(self, content, request, response, metrics, start):
+        """
+        Отдает части тела потокового ответа, замеряя запросы к БД при формировании каждой из них.
+        Метрики записываются, когда тело прочитано полностью или клиент отключился.
+        """
+        iterator = iter(content)
+        end = object()
+
+        try:
+            while True:
+                with measure_request(metrics):
+                    chunk = next(iterator, end)
+
+                if chunk is end:
+                    break
+
+                yield chunk
+        finally:
+            self.record(request, response, metrics, perf_counter() - start)
+
+    def record(self, request, response, metrics, total):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+
+        if view != 'request-metrics':
+            registry.observe(view, response.status_code, total, metrics)
+
+        if total * 1000 >= settings.REQUEST_METRICS_SLOW_MS:
+            logger.warning(
+                "Медленный запрос %s %s (%s): %.1f мс, SQL-запросов %d (%.1f мс), сериализация %.1f мс. "
+                "Частые запросы:\n%s",
+                request.method, request.path, view, total * 1000, metrics.queries, metrics.db_time * 1000,
+                metrics.serializer_time * 1000,
+                '\n'.join(f'{count} x {sql}' for sql, count in metrics.fingerprints().most_common(10))
+                or '(текст SQL не сохранен, см. REQUEST_METRICS_CAPTURE_SQL и REQUEST_METRICS_SAMPLE_RATE)'
+            )
+
+
+class NPlusOneError(Exception):
+    """
+    Запрос выполнил одинаковые по форме SQL-запросы чаще допустимого (вероятная проблема N+1).
+    """
+
+
+class NPlusOneDetector:
+    """
+    Считает отпечатки SQL-запросов, выполненных внутри блока with, и находит повторяющиеся
+    чаще threshold раз (по умолчанию NPLUSONE_THRESHOLD).
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = settings.NPLUSONE_THRESHOLD if threshold is None else threshold
+        self.fingerprints = Counter()
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.fingerprints[fingerprint_sql(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
+
+    def violations(self):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > self.threshold]
+
+    def report(self):
+        return '\n'.join(f'{count} x {sql}' for sql, count in self.violations())
+
+
+class NPlusOneMiddleware:
+    """
+    Проверяет каждый запрос на повторяющиеся SQL-запросы. Режим задается NPLUSONE_MODE:
+    'off' - выключено, 'log' - предупреждение в лог, 'raise' - исключение NPlusOneError (для тестов и стенда).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.NPLUSONE_MODE
+
+        if mode == 'off':
+            return self.get_response(request)
+
+        with NPlusOneDetector() as detector:
+            response = self.get_response(request)
+
+        if detector.violations():
+            message = f"Возможная проблема N+1 в {request.method} {request.path}:\n{detector.report()}"
+
+            if mode == 'raise':
+                raise NPlusOneError(message)
+            logger.warning(message)
+
+        return response
+
+
+def _gzip_compressor():
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _brotli_compressor():
+    import brotli
+
+    compressor = brotli.Compressor(quality=5)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def _zstd_compressor():
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    return (compressor.compress, lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush)
+
+
+# Доступные алгоритмы сжатия в порядке предпочтения сервера: {Content-Encoding: фабрика (compress, flush, finish)}.
+# Наличие пакетов проверяется без импорта, сами модули загружаются при первом сжатии
+COMPRESSORS = {
+    **({'br': _brotli_compressor} if find_spec('brotli') else {}),
+    **({'zstd': _zstd_compressor} if find_spec('zstandard') else {}),
+    'gzip': _gzip_compressor,
+}
+
+
+def choose_encoding(accept_encoding):
+    """
+    Выбирает алгоритм сжатия по заголовку Accept-Encoding (с учетом q=0) или возвращает None.
+    """
+    accepted = {}
+
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+
+        accepted[name.strip().lower()] = quality
+
+    for encoding in COMPRESSORS:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы типов из COMPRESSION_CONTENT_TYPES алгоритмом, выбранным по Accept-Encoding
+    (brotli и zstd - если установлены пакеты brotli и zstandard, иначе gzip). Обычные ответы меньше
+    COMPRESSION_MIN_SIZE байт не сжимаются, потоковые сжимаются по частям без буферизации всего ответа.
+    К сильному ETag добавляется суффикс алгоритма ("3" -> "3-gzip"): сжатое представление отличается побайтно,
+    но тег остается сильным и содержит версию объекта, поэтому If-Match с ним принимается.
+    Объем до и после сжатия учитывается в метриках.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+
+        if encoding is None:
+            return response
+
+        compress, flush, finish = COMPRESSORS[encoding]()
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(response.streaming_content, encoding, compress, flush, finish)
+            del response['Content-Length']
+        else:
+            original = len(response.content)
+            compressed = compress(response.content) + finish()
+
+            if len(compressed) >= original:
+                return response
+
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+            registry.observe_compression(encoding, original, len(compressed))
+
+        etag = response.get('ETag')
+
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'{etag[:-1]}-{encoding}"'
+
+        response['Content-Encoding'] = encoding
+
+        return response
+
+    @staticmethod
+    def compress_stream(chunks, encoding, compress, flush, finish):
+        # Каждая часть отправляется клиенту сразу после сжатия, чтобы не задерживать потоковую выдачу
+        original = compressed = 0
+
+        for chunk in chunks:
+            original += len(chunk)
+            data = compress(chunk) + flush()
+            compressed += len(data)
+
+            if data:
+                yield data
+
+        data = finish()
+        compressed += len(data)
+        registry.observe_compression(encoding, original, compressed)
+
+        yield data
+
+
+def metrics_view(request):
+    """
+    Отдает накопленные метрики в текстовом формате Prometheus.
+    Требуется заголовок Authorization: Bearer <REQUEST_METRICS_TOKEN>; без токена эндпоинт доступен только при DEBUG.
+    """
+    token = settings.REQUEST_METRICS_TOKEN
+
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,60 @@
+# project_management_system_backend/normalization.py
+
+from rest_framework.exceptions import ValidationError
+
+
+def normalize_rows(rows, normalized_fields):
+    """
+    Выносит повторяющиеся данные связанных объектов из строк списка в отдельные таблицы.
+    normalized_fields - словарь {поле со ссылкой: (имя таблицы, {ключ в таблице: поле строки})}.
+    Поля строки переносятся в запись таблицы с ключом, равным значению ссылки, а в строке остается только ссылка.
+    Возвращает список строк и словарь таблиц.
+    """
+    tables = {table: {} for table, _ in normalized_fields.values()}
+    results = []
+
+    for row in rows:
+        row = dict(row)
+
+        for reference, (table, columns) in normalized_fields.items():
+            # Без ссылки (например, она не запрошена в fields) данные остаются в строке
+            if reference not in row:
+                continue
+
+            values = {key: row.pop(column) for key, column in columns.items() if column in row}
+            pk = row[reference]
+
+            if pk is not None and values:
+                tables[table].setdefault(pk, values)
+
+        results.append(row)
+
+    return results, tables
+
+
+class NormalizedListMixin:
+    """
+    Примесь для списочных вью: с параметром shape=normalized данные пользователей (и других связанных объектов)
+    передаются один раз в отдельных таблицах ответа, а не повторяются в каждой строке.
+    Ответ: {"results": [...], "users": {id: {...}}, ...} (и count/next/previous при постраничном выводе).
+    """
+    normalized_fields = {}
+
+    def list(self, request, *args, **kwargs):
+        shape = request.query_params.get('shape')
+
+        if shape not in (None, 'normalized'):
+            raise ValidationError({'shape': 'Поддерживается только значение normalized.'})
+
+        response = super().list(request, *args, **kwargs)
+
+        if shape is None:
+            return response
+
+        data = response.data
+        paginated = isinstance(data, dict)
+        results, tables = normalize_rows(data['results'] if paginated else data, self.normalized_fields)
+
+        response.data = {**data, 'results': results, **tables} if paginated else {'results': results, **tables}
+
+        return response
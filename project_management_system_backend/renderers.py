@@ -0,0 +1,50 @@
+# project_management_system_backend/renderers.py
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer
+import orjson
+
+# Типы, которые не поддерживаются orjson и msgpack напрямую, преобразуются так же, как в JSONRenderer DRF:
+# QuerySet и другие итерируемые объекты (например, ответ из values()), Decimal, timedelta, ленивые строки
+encode_default = JSONEncoder().default
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON-рендерер на orjson: в несколько раз быстрее стандартного json и сразу возвращает bytes.
+    Отступы (Accept: application/json; indent=...) поддерживаются только в два пробела.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=encode_default, option=option)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Рендерер MessagePack (Accept: application/msgpack) - компактный двоичный формат для клиентов,
+    которые его поддерживают. Требует пакет msgpack, без него в DEFAULT_RENDERER_CLASSES не включается.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Импорт при первом использовании: большинство клиентов запрашивают JSON
+        import msgpack
+
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
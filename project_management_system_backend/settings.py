@@ -9,8 +9,11 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+from corsheaders.defaults import default_headers
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,10 +46,13 @@ INSTALLED_APPS = [
     'tasks',
     'comments',
     'management',
-    'statistics',
+    'project_statistics',
 ]
 
 MIDDLEWARE = [
+    'project_management_system_backend.middleware.RequestMetricsMiddleware',
+    'project_management_system_backend.middleware.NPlusOneMiddleware',
+    'project_management_system_backend.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'project_management_system_backend.throttling.ThrottleMiddleware',
 ]
 
 ROOT_URLCONF = 'project_management_system_backend.urls'
@@ -91,6 +98,15 @@ DATABASES = {
         }
 }
 
+# Для локальных замеров и CI можно использовать SQLite: DJANGO_DB_ENGINE=sqlite
+if os.environ.get('DJANGO_DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -141,6 +157,10 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # Разрешить запросы с фронтенда React
 ]
 
+# Версия объекта для оптимистичной блокировки: ETag в ответах, If-Match в запросах на изменение
+CORS_EXPOSE_HEADERS = ['ETag']
+CORS_ALLOW_HEADERS = (*default_headers, 'if-match')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -148,8 +168,31 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson по умолчанию, MessagePack по Accept: application/msgpack (если установлен msgpack),
+    # браузерный интерфейс DRF - только в режиме отладки
+    'DEFAULT_RENDERER_CLASSES': [
+        'project_management_system_backend.renderers.ORJSONRenderer',
+        *(['project_management_system_backend.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'project_management_system_backend.throttling.UserTokenBucketThrottle',
+        'project_management_system_backend.throttling.ScopedUserTokenBucketThrottle',
+    ],
+    # 'ip' и лимиты вью без аутентификации проверяются по IP в ThrottleMiddleware, остальные - по пользователю
+    'DEFAULT_THROTTLE_RATES': {
+        'ip': '600/min',
+        'user': '1200/min',
+        'login': '10/min',
+        'registration': '10/hour',
+        'password_reset': '5/hour',
+        'statistics': '120/min',
+        'join_request': '30/hour',
+    },
 }
 
+TEST_RUNNER = 'project_management_system_backend.testing.TestRunner'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=480),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -165,3 +208,74 @@ EMAIL_HOST_USER = 'an4stasiyafedorova@yandex.ru'
 EMAIL_HOST_PASSWORD = 'aeybjfyixzfijrpg'
 
 FRONTEND_URL = "http://localhost:3000"
+
+# Хранение журнала действий пользователей
+USER_ACTIONS_RETENTION_DAYS = 365
+USER_ACTIONS_PARTITIONS_AHEAD = 3
+USER_ACTIONS_ARCHIVE_DIR = BASE_DIR / 'archive' / 'user_actions'
+
+# Статусы задач для статистики по времени (burndown, пропускная способность, время выполнения)
+STATISTICS_DONE_TASK_STATUSES = ['Завершено']
+STATISTICS_CLOSED_TASK_STATUSES = STATISTICS_DONE_TASK_STATUSES + ['Отменено']
+# Время выполнения задачи отсчитывается от первого перехода в один из этих статусов (начало работы)
+STATISTICS_ACTIVE_TASK_STATUSES = ['В процессе']
+
+# Перекрытие окна инкрементального пересчета статистики (в секундах): записи журнала статусов,
+# транзакции которых зафиксированы с опозданием не больше этого интервала, не пропускаются
+STATISTICS_ROLLUP_OVERLAP_SECONDS = 600
+
+# Интервал обновления кэшированной статистики по портфелю проектов (в секундах)
+STATISTICS_PORTFOLIO_CACHE_SECONDS = 300
+
+# Замеры времени и SQL-запросов выполняются для всех запросов (порог медленного запроса в мс, токен эндпоинта метрик).
+# Текст SQL для лога медленных запросов сохраняется только при REQUEST_METRICS_CAPTURE_SQL=true и только для доли
+# запросов REQUEST_METRICS_SAMPLE_RATE. Время сериализации учитывается при REQUEST_METRICS_SERIALIZER_TIMING=true
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', 0.1))
+REQUEST_METRICS_CAPTURE_SQL = os.environ.get('REQUEST_METRICS_CAPTURE_SQL', 'false') == 'true'
+REQUEST_METRICS_SERIALIZER_TIMING = os.environ.get('REQUEST_METRICS_SERIALIZER_TIMING', 'true') == 'true'
+REQUEST_METRICS_SLOW_MS = 500
+REQUEST_METRICS_TOKEN = os.environ.get('REQUEST_METRICS_TOKEN', '')
+
+# Поиск проблем N+1: 'off', 'log' (предупреждение в лог) или 'raise' (ошибка, для тестов и стенда)
+NPLUSONE_MODE = os.environ.get('NPLUSONE_MODE', 'off')
+NPLUSONE_THRESHOLD = 5
+
+# Очередь событий (outbox): количество попыток отправки до пометки события как ошибочного и время (в секундах),
+# на которое обработчик занимает выбранные события; если он не завершится за это время, события обработает другой
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_CLAIM_SECONDS = 600
+
+# Напоминания о сроках: за сколько дней предупреждать о приближении срока и сколько дней напоминать о просрочке
+DUE_REMINDERS_DUE_SOON_DAYS = 2
+DUE_REMINDERS_OVERDUE_DAYS = 7
+OVERDUE_TASKS_CACHE_SECONDS = 60
+
+# Ограничение частоты запросов (DEFAULT_THROTTLE_RATES). Отключается в тестах и командах замеров
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', 'true') == 'true'
+
+# Общий кэш (счетчики ограничения частоты запросов, кэшированная статистика). Без CACHE_URL используется
+# локальная память процесса, и при нескольких воркерах каждый считает лимиты отдельно
+if os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Сжатие ответов: минимальный размер обычного ответа в байтах и сжимаемые типы содержимого
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/x-ndjson',
+    'application/msgpack',
+    'text/csv',
+    'text/plain',
+    'text/html',
+]
@@ -0,0 +1,71 @@
+"""
+Профиль настроек для продакшена: DJANGO_SETTINGS_MODULE=project_management_system_backend.settings_production.
+
+Приложение - JSON API с аутентификацией по JWT, поэтому сессии, сообщения, статика, шаблоны и браузерный
+интерфейс DRF не подключаются: воркер быстрее запускается и меньше делает на каждый запрос.
+Секреты, адреса и параметры подключения задаются переменными окружения.
+"""
+from .settings import *
+import os
+
+DEBUG = os.environ.get('DJANGO_DEBUG') == 'true'
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in ('django.contrib.sessions', 'django.contrib.messages', 'django.contrib.staticfiles')
+]
+
+# Пользователь определяется JWT-аутентификацией DRF, AuthenticationMiddleware и сессии не нужны
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+NPLUSONE_MODE = os.environ.get('NPLUSONE_MODE', 'off')
+
+if NPLUSONE_MODE == 'off':
+    MIDDLEWARE.remove('project_management_system_backend.middleware.NPlusOneMiddleware')
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ],
+}
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DB_NAME', 'project_management_db'),
+        'USER': os.environ.get('DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Постоянные соединения: без них каждый запрос тратит время на подключение к PostgreSQL
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+CORS_ALLOWED_ORIGINS = [
+    origin.strip() for origin in os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',') if origin.strip()
+]
+
+FRONTEND_URL = os.environ.get('FRONTEND_URL', FRONTEND_URL)
+
+EMAIL_HOST = os.environ.get('EMAIL_HOST', EMAIL_HOST)
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', EMAIL_PORT))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
@@ -0,0 +1,136 @@
+# project_management_system_backend/testing.py
+
+from .middleware import NPlusOneDetector
+from management.models import Group, User_project, Project_request
+from django.test.runner import DiscoverRunner
+from rest_framework.test import APIClient
+from django.core.cache import cache
+from django.conf import settings
+from users.models import User, Action_type, User_action
+from django.utils.timezone import now
+from types import SimpleNamespace
+from projects.models import Project
+from comments.models import Comment
+from django.test import TestCase
+from datetime import timedelta
+import json
+from tasks.models import Task
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Тесты выполняют много запросов с одного адреса, поэтому ограничение частоты в них отключено
+    (как Django подменяет почтовый бэкенд). Тесты ограничения включают его через override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.THROTTLE_ENABLED = False
+
+
+def create_user(username, **fields):
+    return User.objects.create(
+        username=username,
+        email=f'{username}@example.com',
+        first_name=f'Имя {username}',
+        last_name=f'Фамилия {username}',
+        **fields
+    )
+
+
+def create_project_fixture(rows=8):
+    """
+    Создает набор данных, в котором каждый списочный эндпоинт возвращает rows записей:
+    проекты с участниками, задачи, комментарии, заявки и действия пользователей.
+    """
+    groups = {group.name: group for group in Group.objects.all()}
+    due_date = now().date() + timedelta(days=30)
+
+    leader = create_user('leader', is_project_leader=True)
+    admin = create_user('admin', is_admin=True)
+    members = [create_user(f'member{i}') for i in range(rows)]
+    outsiders = [create_user(f'outsider{i}') for i in range(rows)]
+    member = members[0]
+
+    projects = [
+        Project.objects.create(title=f'Проект {i}', due_date=due_date, status='В процессе',
+                               priority='Средний', created_by=leader)
+        for i in range(rows)
+    ]
+    project = projects[0]
+
+    for item in projects:
+        User_project.objects.create(project=item, user=leader, user_group=groups['Руководитель проекта'])
+        User_project.objects.create(project=item, user=member, user_group=groups['Исполнитель'])
+
+    for other in members[1:]:
+        User_project.objects.create(project=project, user=other, user_group=groups['Исполнитель'])
+
+    tasks = [
+        Task.objects.create(title=f'Задача {i}', due_date=due_date, status='В процессе', priority='Средний',
+                            project=project, created_by=leader, assigned_to=member)
+        for i in range(rows)
+    ]
+
+    for i, author in enumerate(members):
+        Comment.objects.create(task=tasks[0], created_by=author, text=f'Комментарий {i}')
+
+    for outsider in outsiders:
+        Project_request.objects.create(project=project, created_by=outsider, status='Ожидает')
+
+    action_type = Action_type.objects.get_or_create(name='Задачи')[0]
+
+    for i in range(rows):
+        User_action.objects.create(type=action_type, user=member, description=f'Действие {i}', status='Успешно')
+
+    return SimpleNamespace(
+        leader=leader, admin=admin, member=member, members=members, outsiders=outsiders,
+        projects=projects, project=project, tasks=tasks, task=tasks[0], action_type=action_type,
+    )
+
+
+class ProjectFixtureTestCase(TestCase):
+    """
+    Базовый класс тестов эндпоинтов: набор данных create_project_fixture(rows) создается один раз на класс,
+    а перед каждым тестом очищается кэш и создается клиент, авторизованный пользователем набора данных
+    с именем user (None - без авторизации).
+    """
+    rows = 3
+    user = 'leader'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_project_fixture(cls.rows)
+
+    def setUp(self):
+        # Кэшированные ответы и состояние ограничения частоты не должны переходить из теста в тест
+        cache.clear()
+        self.client = APIClient()
+
+        if self.user:
+            self.client.force_authenticate(getattr(self.data, self.user))
+
+
+class NPlusOneTestCase(ProjectFixtureTestCase):
+    """
+    Базовый класс тестов списочных эндпоинтов: проверяет, что число SQL-запросов не растет с числом строк.
+    """
+    rows = 8
+
+    def assertNoNPlusOne(self, user, url, count=None):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        # Потоковый ответ читается внутри детектора: запросы к БД выполняются при его формировании
+        with NPlusOneDetector() as detector:
+            response = client.get(url)
+            content = b''.join(response.streaming_content) if response.streaming else None
+
+        self.assertEqual(response.status_code, 200, content or response.content)
+        self.assertFalse(detector.violations(), f"Повторяющиеся запросы:\n{detector.report()}")
+
+        if count is not None:
+            data = json.loads(content) if response.streaming else response.data
+            self.assertEqual(len(data), count)
+
+        return response
@@ -0,0 +1,151 @@
+# project_management_system_backend/throttling.py
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.permissions import AllowAny
+from rest_framework.settings import api_settings
+from django.http import JsonResponse
+from django.conf import settings
+import math
+
+
+def take_token(cache, key, num_requests, duration, now):
+    """
+    Берет один токен из "ведра" key емкостью num_requests, которое равномерно пополняется за duration секунд.
+    Состояние (остаток токенов, время) хранится в общем кэше. Возвращает 0, если запрос разрешен,
+    иначе - через сколько секунд появится следующий токен. Чтение и запись не атомарны, поэтому
+    при одновременных запросах возможно небольшое превышение лимита - для защиты от перегрузки это допустимо.
+    """
+    refill_rate = num_requests / duration
+    tokens, updated = cache.get(key, (num_requests, now))
+    tokens = min(num_requests, tokens + (now - updated) * refill_rate)
+
+    if tokens < 1:
+        return (1 - tokens) / refill_rate
+
+    cache.set(key, (tokens - 1, now), duration)
+    return 0
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по алгоритму token bucket: допускает короткие всплески до лимита,
+    а в среднем не больше указанной частоты. Частоты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'].
+    """
+    wait_seconds = None
+
+    def get_rate(self):
+        # Частоты читаются при каждом запросе, а не при импорте (как THROTTLE_RATES в DRF),
+        # поэтому их можно переопределить через override_settings
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"Не задана частота запросов для scope «{self.scope}».")
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED or self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+
+        if self.key is None:
+            return True
+
+        self.wait_seconds = take_token(self.cache, self.key, self.num_requests, self.duration, self.timer())
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Общий лимит на аутентифицированного пользователя (scope 'user').
+    """
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class ScopedUserTokenBucketThrottle(UserTokenBucketThrottle):
+    """
+    Лимит пользователя для отдельного эндпоинта: scope берется из атрибута throttle_scope вью.
+    """
+
+    def __init__(self):
+        # Частота определяется позже, когда известна вью
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, 'throttle_scope', None)
+
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return super().allow_request(request, view)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Лимит по IP-адресу клиента. Используется в ThrottleMiddleware, до аутентификации.
+    """
+
+    def __init__(self, scope='ip'):
+        self.scope = scope
+        super().__init__()
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': f'ip_{self.scope}', 'ident': self.get_ident(request)}
+
+
+def is_anonymous_view(view_class):
+    permission_classes = getattr(view_class, 'permission_classes', ())
+
+    return not permission_classes or AllowAny in permission_classes
+
+
+class ThrottleMiddleware:
+    """
+    Проверяет лимиты по IP до аутентификации, разбора тела запроса и обращений к БД, поэтому
+    отклоненный запрос почти ничего не стоит. Для всех вью DRF применяется общий лимит 'ip',
+    для вью, доступных без входа (вход, регистрация, восстановление пароля), - еще и лимит их throttle_scope.
+    Лимиты аутентифицированных пользователей проверяют DEFAULT_THROTTLE_CLASSES.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+
+        if view_class is None or not settings.THROTTLE_ENABLED:
+            return None
+
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        scopes = ['ip']
+        scope = getattr(view_class, 'throttle_scope', None)
+
+        if scope in rates and is_anonymous_view(view_class):
+            scopes.append(scope)
+
+        for scope in scopes:
+            throttle = IPTokenBucketThrottle(scope)
+
+            if not throttle.allow_request(request, None):
+                wait = math.ceil(throttle.wait())
+                response = JsonResponse({'detail': f'Слишком много запросов. Повторите попытку через {wait} с.'}, status=429)
+                response['Retry-After'] = str(wait)
+
+                return response
+
+        return None
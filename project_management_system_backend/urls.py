@@ -1,5 +1,6 @@
 # urls.py
 
+from project_management_system_backend.middleware import metrics_view
 from django.urls import path, include
 
 urlpatterns = [
@@ -8,5 +9,6 @@ urlpatterns = [
     path('api/', include('tasks.urls')),
     path('api/', include('comments.urls')),
     path('api/', include('management.urls')),
-    path('api/', include('statistics.urls')),
+    path('api/', include('project_statistics.urls')),
+    path('metrics/', metrics_view, name='request-metrics'),
 ]
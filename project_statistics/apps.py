@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class StatisticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    # Пакет не называется statistics, чтобы не перекрывать одноименный модуль стандартной библиотеки
+    # (его использует, например, бэкенд SQLite). Метка прежняя: таблицы и миграции не меняются
+    name = 'project_statistics'
+    label = 'statistics'
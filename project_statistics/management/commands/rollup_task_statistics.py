@@ -0,0 +1,20 @@
+# project_statistics/management/commands/rollup_task_statistics.py
+
+from django.core.management.base import BaseCommand
+from project_statistics.rollups import rollup_status_snapshots, rollup_transitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновляет предрассчитанную статистику задач: снимок статусов на сегодня, "
+        "пропускную способность и время выполнения задач. Рекомендуется запускать по расписанию "
+        "(например, раз в час), повторные запуски в течение дня перезаписывают снимок текущего дня."
+    )
+
+    def handle(self, *args, **options):
+        completions = rollup_transitions()
+        snapshots = rollup_status_snapshots()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Обработано завершенных задач: {completions}, записано строк снимка статусов: {snapshots}"
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+STATUSES = {1: 'Ожидает', 2: 'В процессе', 3: 'Приостановлено', 4: 'Отменено', 5: 'Завершено'}
+FIELDS = {'status': STATUSES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбца
+    atomic = False
+
+    dependencies = [
+        ('statistics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('statistics', 'project_status_snapshot', FIELDS),
+            convert_labels('statistics', 'project_status_snapshot', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='project_status_snapshot',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=STATUSES),
+        ),
+    ]
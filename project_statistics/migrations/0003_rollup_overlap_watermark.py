@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+def clear_cycle_times(apps, schema_editor):
+    # Раньше время выполнения записывалось на каждое завершение задачи. Строки удаляются, а отметка
+    # сбрасывается, поэтому следующий запуск rollup_task_statistics пересчитает статистику по всему журналу
+    apps.get_model('statistics', 'Task_cycle_time').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0002_project_status_snapshot_codes'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_cycle_times, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='rollup_watermark',
+            name='last_id',
+        ),
+        migrations.AddField(
+            model_name='rollup_watermark',
+            name='last_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='task_cycle_time',
+            constraint=models.UniqueConstraint(fields=('task',), name='unique_task_cycle_time'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations
+
+
+def reset_cycle_times(apps, schema_editor):
+    # Время выполнения раньше отсчитывалось от создания задачи. Строки удаляются, а отметка сбрасывается,
+    # поэтому следующий запуск rollup_task_statistics пересчитает его от перехода в работу по всему журналу
+    apps.get_model('statistics', 'Task_cycle_time').objects.all().delete()
+    apps.get_model('statistics', 'Rollup_watermark').objects.update(last_changed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistics', '0003_rollup_overlap_watermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_cycle_times, migrations.RunPython.noop),
+    ]
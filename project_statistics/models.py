@@ -0,0 +1,78 @@
+# project_statistics/models.py
+
+from django.db import models
+from project_management_system_backend.fields import LabelChoiceField
+from projects.models import Project, STATUSES
+from tasks.models import Task
+
+
+class Project_status_snapshot(models.Model):
+    project = models.ForeignKey(
+        Project,
+        related_name='status_snapshots',
+        on_delete=models.CASCADE
+    )
+    date = models.DateField()
+    status = LabelChoiceField(labels=STATUSES)
+    task_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'date', 'status'], name='unique_project_status_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"Проект '{self.project.title}' на {self.date}: '{self.status}' - {self.task_count}."
+
+
+class Project_daily_throughput(models.Model):
+    project = models.ForeignKey(
+        Project,
+        related_name='daily_throughput',
+        on_delete=models.CASCADE
+    )
+    date = models.DateField()
+    completed_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'date'], name='unique_project_daily_throughput'),
+        ]
+
+    def __str__(self):
+        return f"Проект '{self.project.title}' на {self.date}: завершено задач - {self.completed_count}."
+
+
+class Task_cycle_time(models.Model):
+    project = models.ForeignKey(
+        Project,
+        related_name='task_cycle_times',
+        on_delete=models.CASCADE
+    )
+    task = models.ForeignKey(
+        Task,
+        related_name='cycle_times',
+        null=True,
+        on_delete=models.SET_NULL
+    )
+    completed_at = models.DateTimeField()
+    cycle_hours = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'completed_at'], name='cycle_time_project_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['task'], name='unique_task_cycle_time'),
+        ]
+
+    def __str__(self):
+        return f"Время выполнения задачи в проекте '{self.project.title}': {self.cycle_hours:.1f} ч."
+
+
+class Rollup_watermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    last_changed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_changed_at}"
@@ -0,0 +1,131 @@
+# project_statistics/rollups.py
+
+from django.utils.timezone import localdate, localtime, get_current_timezone
+from tasks.models import Task, Task_status_transition
+from django.db.models.functions import TruncDate
+from django.db.models import F, Count, Max, Min
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.conf import settings
+from .models import *
+
+TRANSITIONS_WATERMARK = 'task_status_transitions'
+
+
+def rollup_status_snapshots(date=None):
+    """
+    Сохраняет снимок количества задач каждого проекта по статусам на указанную дату (по умолчанию сегодня).
+    Личные задачи (создатель = исполнитель) не учитываются, как и в остальной статистике.
+    Архивные задачи учитываются: архивирование не должно менять историю проекта.
+    Возвращает количество записанных строк.
+    """
+    date = date or localdate()
+    counts = Task.all_objects.filter(project__deleted_at__isnull=True).exclude(created_by=F('assigned_to')).values('project', 'status').annotate(task_count=Count('id'))
+
+    with transaction.atomic():
+        Project_status_snapshot.objects.filter(date=date).delete()
+        snapshots = Project_status_snapshot.objects.bulk_create(
+            [
+                Project_status_snapshot(
+                    project_id=row['project'],
+                    date=date,
+                    status=row['status'],
+                    task_count=row['task_count']
+                )
+                for row in counts.iterator()
+            ],
+            batch_size=1000
+        )
+
+    return len(snapshots)
+
+
+def rollup_transitions():
+    """
+    Инкрементально обрабатывает журнал смены статусов задач: пересчитывает ежедневную пропускную
+    способность проектов и время выполнения завершенных задач.
+    Каждый запуск заново просматривает записи за STATISTICS_ROLLUP_OVERLAP_SECONDS до сохраненной отметки,
+    поэтому запись, транзакция которой зафиксирована позже более новых записей, будет учтена следующим запуском.
+    Затронутые дни и задачи пересчитываются по журналу целиком и записываются upsert'ом: повторная обработка
+    записей ничего не удваивает, а задача, завершенная в один день несколько раз, учитывается в нем один раз.
+    Время выполнения хранится одной строкой на задачу: от первого перехода в статус из
+    STATISTICS_ACTIVE_TASK_STATUSES (время ожидания в бэклоге не учитывается) до последнего завершения.
+    Если переход в работу не записан в журнал, отсчет идет от создания задачи.
+    Возвращает количество обработанных завершенных задач.
+    """
+    completions = Task_status_transition.objects.filter(
+        to_status__in=settings.STATISTICS_DONE_TASK_STATUSES
+    ).exclude(task__created_by=F('task__assigned_to'))
+
+    with transaction.atomic():
+        watermark, _ = Rollup_watermark.objects.select_for_update().get_or_create(name=TRANSITIONS_WATERMARK)
+        new_completions = completions
+
+        if watermark.last_changed_at is not None:
+            overlap = timedelta(seconds=settings.STATISTICS_ROLLUP_OVERLAP_SECONDS)
+            new_completions = completions.filter(changed_at__gte=watermark.last_changed_at - overlap)
+
+        rows = list(new_completions.values('project', 'task', 'changed_at'))
+
+        if not rows:
+            return 0
+
+        days = {(row['project'], localtime(row['changed_at']).date()) for row in rows}
+        tasks = {row['task'] for row in rows}
+        first_day = min(date for _, date in days)
+        last_day = max(date for _, date in days)
+        timezone = get_current_timezone()
+
+        throughput = completions.filter(
+            project__in={project for project, _ in days},
+            changed_at__gte=datetime.combine(first_day, time.min, tzinfo=timezone),
+            changed_at__lt=datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=timezone)
+        ).annotate(date=TruncDate('changed_at')).values('project', 'date').annotate(
+            completed_count=Count('task', distinct=True)
+        ).order_by()
+
+        Project_daily_throughput.objects.bulk_create(
+            [
+                Project_daily_throughput(project_id=row['project'], date=row['date'], completed_count=row['completed_count'])
+                for row in throughput
+                if (row['project'], row['date']) in days
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['project', 'date'],
+            update_fields=['completed_count']
+        )
+
+        last_completions = completions.filter(task__in=tasks).values('task', 'project', 'task__created_at').annotate(
+            completed_at=Max('changed_at')
+        ).order_by()
+        started = dict(
+            Task_status_transition.objects.filter(
+                task__in=tasks,
+                to_status__in=settings.STATISTICS_ACTIVE_TASK_STATUSES
+            ).values('task').annotate(started_at=Min('changed_at')).order_by().values_list('task', 'started_at')
+        )
+
+        Task_cycle_time.objects.bulk_create(
+            [
+                Task_cycle_time(
+                    project_id=row['project'],
+                    task_id=row['task'],
+                    completed_at=row['completed_at'],
+                    cycle_hours=(row['completed_at'] - started.get(row['task'], row['task__created_at'])).total_seconds() / 3600
+                )
+                for row in last_completions
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['task'],
+            update_fields=['project', 'completed_at', 'cycle_hours']
+        )
+
+        last_changed_at = max(row['changed_at'] for row in rows)
+
+        if watermark.last_changed_at is None or last_changed_at > watermark.last_changed_at:
+            watermark.last_changed_at = last_changed_at
+            watermark.save(update_fields=['last_changed_at'])
+
+    return len(tasks)
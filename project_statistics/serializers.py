@@ -0,0 +1,43 @@
+# project_statistics/serializers.py
+
+from rest_framework import serializers
+
+
+# Сериализатор для данных о распределении задач проекта по статусам
+class TaskStatusDistributionSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+# Сериализатор для данных о распределении задач проекта по приоритетам
+class TaskPriorityDistributionSerializer(serializers.Serializer):
+    priority = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+# Сериализатор для данных о нагрузке пользователей проекта
+class LoadedUsersSerializer(serializers.Serializer):
+    username = serializers.CharField()
+    task_count = serializers.IntegerField()
+
+
+# Сериализатор для данных диаграммы сгорания задач проекта
+class BurndownSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    remaining = serializers.IntegerField()
+    completed = serializers.IntegerField()
+
+
+# Сериализатор для данных о пропускной способности проекта по неделям
+class ThroughputSerializer(serializers.Serializer):
+    week = serializers.DateField()
+    completed = serializers.IntegerField()
+
+
+# Сериализатор для перцентилей времени выполнения задач проекта (в часах)
+class CycleTimeSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    p50 = serializers.FloatField(allow_null=True)
+    p75 = serializers.FloatField(allow_null=True)
+    p90 = serializers.FloatField(allow_null=True)
+    p95 = serializers.FloatField(allow_null=True)
@@ -0,0 +1,176 @@
+# project_statistics/tests.py
+
+from project_management_system_backend.testing import ProjectFixtureTestCase
+from django.utils.timezone import localdate, now
+from importlib.util import find_spec
+from tasks.models import Task, Task_status_transition
+from tasks.utils import log_status_transition
+from unittest import skipUnless
+from datetime import timedelta
+from .rollups import rollup_status_snapshots, rollup_transitions
+from .models import *
+import json
+
+
+class StatisticsRenderingTests(ProjectFixtureTestCase):
+    """
+    Ответы статистики строятся из values() - рендереры должны сериализовать QuerySet так же, как JSONRenderer DRF.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/project/{self.data.project.id}/statistics/status-distribution/'
+
+    def test_json(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), [{'status': 'В процессе', 'count': 3}])
+
+    @skipUnless(find_spec('msgpack'), "Пакет msgpack не установлен.")
+    def test_msgpack(self):
+        import msgpack
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), [{'status': 'В процессе', 'count': 3}])
+
+    def test_priority_distribution(self):
+        response = self.client.get(f'/api/project/{self.data.project.id}/statistics/priority-distribution/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), [{'priority': 'Средний', 'count': 3}])
+
+
+class PortfolioStatisticsTests(ProjectFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        task = cls.data.tasks[0]
+        task.status, task.priority = 'Отменено', 'Высокий'
+        task.save(update_fields=['status', 'priority'])
+
+    def get_metric(self, name):
+        response = self.client.get(f'/api/statistics/portfolio/{name}/')
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.content)['results']
+        self.assertEqual([row['project_id'] for row in results], [project.id for project in self.data.projects])
+
+        return results[0]
+
+    def test_status_distribution(self):
+        row = self.get_metric('status-distribution')
+
+        self.assertCountEqual(row['status_distribution'], [
+            {'status': 'Отменено', 'count': 1},
+            {'status': 'В процессе', 'count': 2},
+        ])
+
+    def test_priority_distribution(self):
+        row = self.get_metric('priority-distribution')
+
+        self.assertCountEqual(row['priority_distribution'], [
+            {'priority': 'Высокий', 'count': 1},
+            {'priority': 'Средний', 'count': 2},
+        ])
+
+    def test_workload_excludes_cancelled_tasks(self):
+        row = self.get_metric('workload')
+
+        self.assertEqual(row['workload'], [{'username': self.data.member.username, 'task_count': 2}])
+
+
+class RollupTransitionsTests(ProjectFixtureTestCase):
+    user = None
+
+    def set_status(self, task, status):
+        from_status, task.status = task.status, status
+        task.save(update_fields=['status'])
+        log_status_transition(task, from_status, self.data.leader)
+
+    def get_throughput(self):
+        return list(Project_daily_throughput.objects.values_list('project', 'date', 'completed_count'))
+
+    def test_repeated_completion_counted_once(self):
+        task = self.data.task
+        self.set_status(task, 'Завершено')
+        self.set_status(task, 'В процессе')
+        self.set_status(task, 'Завершено')
+
+        self.assertEqual(rollup_transitions(), 1)
+        self.assertEqual(self.get_throughput(), [(self.data.project.id, localdate(), 1)])
+        self.assertEqual(Task_cycle_time.objects.filter(task=task).count(), 1)
+
+    def test_rerun_is_idempotent(self):
+        for task in self.data.tasks:
+            self.set_status(task, 'Завершено')
+
+        rollup_transitions()
+        rollup_transitions()
+
+        self.assertEqual(self.get_throughput(), [(self.data.project.id, localdate(), 3)])
+        self.assertEqual(Task_cycle_time.objects.count(), 3)
+
+    def test_cycle_time_starts_when_work_starts(self):
+        task, waiting = self.data.tasks[:2]
+        completed_at = now()
+        Task.objects.filter(id__in=[task.id, waiting.id]).update(created_at=completed_at - timedelta(days=10))
+
+        self.set_status(task, 'Ожидает')
+        self.set_status(task, 'В процессе')
+        self.set_status(task, 'Завершено')
+        Task_status_transition.objects.filter(task=task, to_status='Ожидает').update(changed_at=completed_at - timedelta(days=10))
+        Task_status_transition.objects.filter(task=task, to_status='В процессе').update(changed_at=completed_at - timedelta(hours=6))
+        Task_status_transition.objects.filter(task=task, to_status='Завершено').update(changed_at=completed_at)
+
+        # Переход в работу не записан - отсчет от создания задачи
+        self.set_status(waiting, 'Завершено')
+        Task_status_transition.objects.filter(task=waiting).update(changed_at=completed_at)
+
+        rollup_transitions()
+
+        self.assertAlmostEqual(Task_cycle_time.objects.get(task=task).cycle_hours, 6)
+        self.assertAlmostEqual(Task_cycle_time.objects.get(task=waiting).cycle_hours, 240)
+
+    def test_late_commit_within_overlap_is_counted(self):
+        first, late = self.data.tasks[:2]
+        self.set_status(first, 'Завершено')
+        rollup_transitions()
+
+        # Запись, вставленная раньше, но зафиксированная после предыдущего запуска
+        self.set_status(late, 'Завершено')
+        watermark = Rollup_watermark.objects.get().last_changed_at
+        Task_status_transition.objects.filter(task=late).update(changed_at=watermark - timedelta(seconds=60))
+
+        self.assertEqual(rollup_transitions(), 2)
+        self.assertEqual(self.get_throughput(), [(self.data.project.id, localdate(), 2)])
+
+
+class ArchivedTaskStatisticsTests(ProjectFixtureTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Task.objects.filter(id=cls.data.task.id).update(status='Завершено')
+
+    def get_statistics(self):
+        project_id = self.data.project.id
+        rollup_status_snapshots()
+
+        return {
+            'status': json.loads(self.client.get(f'/api/project/{project_id}/statistics/status-distribution/').content),
+            'burndown': json.loads(self.client.get(f'/api/project/{project_id}/statistics/burndown/').content),
+            'snapshots': list(Project_status_snapshot.objects.values_list('status', 'task_count').order_by('status')),
+        }
+
+    def test_archiving_completed_task_keeps_statistics(self):
+        before = self.get_statistics()
+        self.assertEqual(before['burndown'][0]['completed'], 1)
+
+        response = self.client.post(f'/api/task/{self.data.task.id}/archive/')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertEqual(self.get_statistics(), before)
@@ -1,4 +1,4 @@
-# statistics/urls.py
+# project_statistics/urls.py
 
 from django.urls import path
 from .views import *
@@ -9,4 +9,10 @@ urlpatterns = [
     path('project/<project_id>/statistics/overloaded-users/', OverloadedUsersView.as_view(), name='project-statistics-overloaded-users'),
     path('project/<project_id>/statistics/underloaded-users/', UnderloadedUsersView.as_view(), name='project-statistics-underloaded-users'),
     path('project/<project_id>/statistics/task-status-distribution/user/<user_id>/', TaskDistributionByUserView.as_view(), name='project-statistics-user-task-distribution'),
+    path('project/<project_id>/statistics/burndown/', BurndownView.as_view(), name='project-statistics-burndown'),
+    path('project/<project_id>/statistics/throughput/', ThroughputView.as_view(), name='project-statistics-throughput'),
+    path('project/<project_id>/statistics/cycle-time/', CycleTimeView.as_view(), name='project-statistics-cycle-time'),
+    path('statistics/portfolio/status-distribution/', PortfolioStatusDistributionView.as_view(), name='portfolio-statistics-status-distribution'),
+    path('statistics/portfolio/priority-distribution/', PortfolioPriorityDistributionView.as_view(), name='portfolio-statistics-priority-distribution'),
+    path('statistics/portfolio/workload/', PortfolioWorkloadView.as_view(), name='portfolio-statistics-workload'),
 ]
\ No newline at end of file
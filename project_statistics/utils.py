@@ -1,5 +1,6 @@
-# statistics/utils.py
+# project_statistics/utils.py
 
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import ValidationError
 from management.permissions import IsAssigner
 from management.models import User_project
@@ -27,4 +28,25 @@ def check_project_id(kwargs):
 
     if not project_id:
         raise ValidationError({'no_project_id': 'Не передан id проекта.'})
-    return project_id
\ No newline at end of file
+    return project_id
+
+
+def percentile(sorted_values, percent):
+    """
+    Возвращает перцентиль (методом ближайшего ранга) для отсортированного списка значений.
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+
+class PortfolioPagination(PageNumberPagination):
+    """
+    Постраничный вывод проектов в статистике по портфелю проектов.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,260 @@
+# project_statistics/views.py
+
+from management.base_access_views import BaseCheckNotOrdinaryUserView, BaseAdminOrProjectLeaderAccessView
+from rest_framework.generics import GenericAPIView
+from django.db.models.functions import TruncWeek
+from rest_framework.response import Response
+from django.db.models import F, Count, Q, Sum
+from django.utils.timezone import localdate
+from django.core.cache import cache
+from projects.models import Project
+from users.utils import get_date_param
+from django.conf import settings
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from users.models import User
+from tasks.models import Task
+from .serializers import *
+from .models import *
+from .utils import *
+
+
+# Вью для получения данных о распределении задач проекта по статусам
+class TaskStatusDistributionView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = TaskStatusDistributionSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+
+        # Архивные задачи остаются в статистике, поэтому используется all_objects
+        tasks = Task.all_objects.filter(project=project, project__deleted_at__isnull=True).exclude(created_by=F('assigned_to'))
+        status_distribution = tasks.values('status').annotate(count=Count('id'))
+
+        return Response(status_distribution)
+
+
+# Вью для получения данных о распределении задач проекта по приоритетам
+class TaskPriorityDistributionView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = TaskPriorityDistributionSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+
+        tasks = Task.all_objects.filter(project=project, project__deleted_at__isnull=True).exclude(created_by=F('assigned_to'))
+        priority_distribution = tasks.values('priority').annotate(count=Count('id'))
+
+        return Response(priority_distribution)
+
+
+# Вью для получения данных о самых загруженных участниках проекта
+class OverloadedUsersView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = LoadedUsersSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+        project_users = get_project_users(self, request, project)
+
+        # Подсчет по обратной связи обходит менеджер Task.objects, поэтому архивные задачи
+        # и задачи удаленных проектов исключаются явно
+        overloaded_users = User.objects.filter(id__in=project_users).annotate(
+            task_count=Count(
+                'user_tasks_to_do',
+                filter=Q(user_tasks_to_do__archived_at__isnull=True, user_tasks_to_do__project__deleted_at__isnull=True)&
+                    ~Q(user_tasks_to_do__status__in=['Отменено', 'Приостановлено'])&
+                    ~Q(user_tasks_to_do__created_by=F('user_tasks_to_do__assigned_to'))
+            )
+        ).order_by('-task_count')[:5]
+
+        return Response(overloaded_users.values('username', 'task_count'))
+
+
+# Вью для получения данных о самых незагруженных участниках проекта
+class UnderloadedUsersView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = LoadedUsersSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+        project_users = get_project_users(self, request, project)
+
+        underloaded_users = User.objects.filter(id__in=project_users).annotate(
+            task_count=Count(
+                'user_tasks_to_do',
+                filter=Q(user_tasks_to_do__archived_at__isnull=True, user_tasks_to_do__project__deleted_at__isnull=True)&
+                    ~Q(user_tasks_to_do__status__in=['Отменено', 'Приостановлено'])&
+                    ~Q(user_tasks_to_do__created_by=F('user_tasks_to_do__assigned_to'))
+            )
+        ).order_by('task_count')[:5]
+
+        return Response(underloaded_users.values('username', 'task_count'))
+
+
+# Вью для получения данных о распределении задач пользователя в проекте по статусам
+class TaskDistributionByUserView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = TaskStatusDistributionSerializer
+
+    def get(self, request, *args, **kwargs):
+        user = kwargs.get('user_id')
+        project = check_project_id(kwargs)
+
+        tasks = Task.all_objects.filter(assigned_to=user, project=project, project__deleted_at__isnull=True).exclude(created_by=F('assigned_to'))
+        task_distribution = tasks.values('status').annotate(count=Count('id'))
+
+        return Response(task_distribution)
+
+
+# Вью для получения данных диаграммы сгорания задач проекта (из ежедневных снимков статусов)
+class BurndownView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = BurndownSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+        date_to = get_date_param(request, 'date_to') or localdate()
+        date_from = get_date_param(request, 'date_from') or date_to - timedelta(days=30)
+
+        burndown = Project_status_snapshot.objects.filter(
+            project=project,
+            date__gte=date_from,
+            date__lte=date_to
+        ).values('date').annotate(
+            remaining=Sum('task_count', filter=~Q(status__in=settings.STATISTICS_CLOSED_TASK_STATUSES), default=0),
+            completed=Sum('task_count', filter=Q(status__in=settings.STATISTICS_DONE_TASK_STATUSES), default=0)
+        ).order_by('date')
+
+        return Response(self.get_serializer(burndown, many=True).data)
+
+
+# Вью для получения данных о количестве завершенных задач проекта по неделям
+class ThroughputView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = ThroughputSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+
+        try:
+            weeks = min(int(request.query_params.get('weeks', 12)), 104)
+        except ValueError:
+            raise ValidationError({'weeks': 'Количество недель должно быть числом.'})
+
+        throughput = Project_daily_throughput.objects.filter(
+            project=project,
+            date__gte=localdate() - timedelta(weeks=weeks)
+        ).annotate(week=TruncWeek('date')).values('week').annotate(completed=Sum('completed_count')).order_by('week')
+
+        return Response(self.get_serializer(throughput, many=True).data)
+
+
+# Вью для получения перцентилей времени выполнения задач проекта (от начала работы над задачей до завершения)
+class CycleTimeView(BaseCheckNotOrdinaryUserView, GenericAPIView):
+    throttle_scope = 'statistics'
+    serializer_class = CycleTimeSerializer
+
+    def get(self, request, *args, **kwargs):
+        project = check_project_id(kwargs)
+        date_to = get_date_param(request, 'date_to') or localdate()
+        date_from = get_date_param(request, 'date_from') or date_to - timedelta(days=90)
+
+        cycle_hours = list(Task_cycle_time.objects.filter(
+            project=project,
+            completed_at__gte=datetime.combine(date_from, time.min, tzinfo=dt_timezone.utc),
+            completed_at__lt=datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+        ).order_by('cycle_hours').values_list('cycle_hours', flat=True))
+
+        cycle_time = {'count': len(cycle_hours)}
+        cycle_time.update({f'p{percent}': percentile(cycle_hours, percent) for percent in (50, 75, 90, 95)})
+
+        return Response(self.get_serializer(cycle_time).data)
+
+
+
+# Базовая вью для статистики по портфелю проектов (все проекты для администратора, свои - для руководителя)
+class BasePortfolioStatisticsView(BaseAdminOrProjectLeaderAccessView, GenericAPIView):
+    """
+    Метрика считается одним сгруппированным запросом по задачам страницы проектов:
+    group_by - пары (поле строки метрики, поле задачи), count_key - имя поля с количеством,
+    excluded_statuses - статусы, задачи в которых не учитываются, metric_ordering - порядок строк,
+    include_archived - учитываются ли архивные задачи (в распределениях да, в текущей нагрузке нет).
+    """
+    throttle_scope = 'statistics'
+    pagination_class = PortfolioPagination
+    metric = None
+    group_by = ()
+    count_key = 'count'
+    excluded_statuses = ()
+    metric_ordering = ()
+    include_archived = True
+
+    def get_queryset(self):
+        user = self.request.user
+        projects = Project.objects.only('id', 'title').order_by('id')
+
+        if not user.is_admin:
+            projects = projects.filter(created_by=user)
+
+        return projects
+
+    def get_metric(self, project_ids):
+        """
+        Возвращает словарь "ID проекта: список значений метрики".
+        """
+        metric = {}
+        manager = Task.all_objects if self.include_archived else Task.objects
+        tasks = manager.filter(project__in=project_ids).exclude(created_by=F('assigned_to'))
+
+        if self.excluded_statuses:
+            tasks = tasks.exclude(status__in=self.excluded_statuses)
+
+        rows = tasks.values('project', *(field for _, field in self.group_by)).annotate(
+            **{self.count_key: Count('id')}
+        ).order_by(*self.metric_ordering)
+
+        for row in rows:
+            item = {key: row[field] for key, field in self.group_by}
+            item[self.count_key] = row[self.count_key]
+            metric.setdefault(row['project'], []).append(item)
+
+        return metric
+
+    def get(self, request, *args, **kwargs):
+        scope = 'all' if request.user.is_admin else request.user.id
+        cache_key = f"statistics:portfolio:{self.metric}:{scope}:{request.query_params.urlencode()}"
+        data = cache.get(cache_key)
+
+        if data is None:
+            projects = self.paginate_queryset(self.get_queryset())
+            metric = self.get_metric([project.id for project in projects])
+            results = [
+                {'project_id': project.id, 'project_title': project.title, self.metric: metric.get(project.id, [])}
+                for project in projects
+            ]
+            data = self.get_paginated_response(results).data
+            cache.set(cache_key, data, settings.STATISTICS_PORTFOLIO_CACHE_SECONDS)
+
+        return Response(data)
+
+
+# Вью для получения распределения задач по статусам во всех проектах портфеля
+class PortfolioStatusDistributionView(BasePortfolioStatisticsView):
+    metric = 'status_distribution'
+    group_by = (('status', 'status'),)
+
+
+# Вью для получения распределения задач по приоритетам во всех проектах портфеля
+class PortfolioPriorityDistributionView(BasePortfolioStatisticsView):
+    metric = 'priority_distribution'
+    group_by = (('priority', 'priority'),)
+
+
+# Вью для получения нагрузки участников во всех проектах портфеля
+class PortfolioWorkloadView(BasePortfolioStatisticsView):
+    metric = 'workload'
+    group_by = (('username', 'assigned_to__username'),)
+    count_key = 'task_count'
+    excluded_statuses = ('Отменено', 'Приостановлено')
+    metric_ordering = ('project', '-task_count')
+    include_archived = False
@@ -0,0 +1,45 @@
+# projects/management/commands/benchmark_project_overview.py
+
+from project_management_system_backend.benchmarks import get_client, measure, format_report
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время и количество SQL-запросов эндпоинта project/<id>/overview/ "
+        "с последовательностью из шести запросов, которые раньше делала страница проекта."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int)
+        parser.add_argument('user_id', type=int, help="ID участника проекта, от имени которого идут запросы.")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        project_id = options['project_id']
+
+        try:
+            user = User.objects.get(id=options['user_id'])
+        except User.DoesNotExist:
+            raise CommandError("Пользователь не найден.")
+
+        client = get_client(user)
+        sequence = [
+            f'/api/project/{project_id}/get-details/',
+            f'/api/project/{project_id}/get-users/',
+            f'/api/project/{project_id}/get-user-group/',
+            f'/api/project/{project_id}/get-not-private-tasks/',
+            f'/api/project/{project_id}/get-my-tasks/',
+            f'/api/project/{project_id}/get-requests/',
+        ]
+
+        try:
+            results = {
+                "Шесть запросов": measure(client, 'get', sequence, options['repeat']),
+                "overview": measure(client, 'get', f'/api/project/{project_id}/overview/', options['repeat']),
+            }
+        except RuntimeError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(format_report(results))
@@ -0,0 +1,28 @@
+# projects/management/commands/purge_deleted_projects.py
+
+from django.core.management.base import BaseCommand
+from projects.utils import purge_deleted_projects
+from time import sleep
+
+
+class Command(BaseCommand):
+    help = (
+        "Порциями удаляет задачи и комментарии проектов, поставленных в очередь на удаление. С параметром --loop "
+        "работает постоянно и опрашивает очередь с интервалом --interval секунд."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = purge_deleted_projects(options['batch_size'])
+
+            if deleted:
+                self.stdout.write(f"Удалено записей: {deleted}")
+            elif not options['loop']:
+                break
+            else:
+                sleep(options['interval'])
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+STATUSES = {1: 'Ожидает', 2: 'В процессе', 3: 'Приостановлено', 4: 'Отменено', 5: 'Завершено'}
+PRIORITIES = {1: 'Низкий', 2: 'Средний', 3: 'Высокий'}
+FIELDS = {'status': STATUSES, 'priority': PRIORITIES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбцов
+    atomic = False
+
+    dependencies = [
+        ('projects', '0003_project_archived_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('projects', 'project', FIELDS),
+            convert_labels('projects', 'project', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=STATUSES),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='priority',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=PRIORITIES),
+        ),
+    ]
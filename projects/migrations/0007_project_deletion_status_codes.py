@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+DELETION_STATUSES = {1: 'Ожидает', 2: 'В процессе', 5: 'Завершено'}
+FIELDS = {'status': DELETION_STATUSES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбца
+    atomic = False
+
+    dependencies = [
+        ('projects', '0006_project_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('projects', 'project_deletion', FIELDS),
+            convert_labels('projects', 'project_deletion', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='project_deletion',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(default='Ожидает', labels=DELETION_STATUSES),
+        ),
+    ]
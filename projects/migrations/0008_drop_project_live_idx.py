@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_deletion_status_codes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='project_live_idx',
+        ),
+    ]
@@ -1,23 +1,97 @@
 # projects/models.py
 
+from project_management_system_backend.fields import LabelChoiceField
 from django.db import models
 from users.models import User
 
+# Коды статусов и приоритетов хранятся в базе, метки отдаются в API (см. LabelChoiceField).
+# Статусы общие для проектов и задач
+STATUSES = {
+    1: 'Ожидает',
+    2: 'В процессе',
+    3: 'Приостановлено',
+    4: 'Отменено',
+    5: 'Завершено',
+}
+
+PRIORITIES = {
+    1: 'Низкий',
+    2: 'Средний',
+    3: 'Высокий',
+}
+
+# Статусы удаления проекта - подмножество STATUSES с теми же кодами
+DELETION_STATUSES = {code: STATUSES[code] for code in (1, 2, 5)}
+
+
+class ProjectManager(models.Manager):
+    """
+    Менеджер по умолчанию: скрывает архивные проекты и проекты, поставленные в очередь на удаление.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True, archived_at__isnull=True)
+
+
 class Project(models.Model):
     title = models.CharField(max_length=150)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField()
-    status = models.CharField(max_length=20)
-    priority = models.CharField(max_length=20)
+    status = LabelChoiceField(labels=STATUSES)
+    priority = LabelChoiceField(labels=PRIORITIES)
     is_gittable = models.BooleanField(default=False)
     git_url = models.CharField(max_length=150, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
     created_by = models.ForeignKey(
         User,
         related_name='user_created_projects',
         on_delete=models.CASCADE
     )
 
+    objects = ProjectManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['due_date', 'status'],
+                condition=models.Q(archived_at__isnull=True, deleted_at__isnull=True),
+                name='project_live_due_status_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class Project_deletion(models.Model):
+    project = models.OneToOneField(
+        Project,
+        related_name='deletion',
+        null=True,
+        on_delete=models.SET_NULL
+    )
+    requested_by = models.ForeignKey(
+        User,
+        related_name='requested_project_deletions',
+        null=True,
+        on_delete=models.SET_NULL
+    )
+    project_title = models.CharField(max_length=150)
+    status = LabelChoiceField(labels=DELETION_STATUSES, default='Ожидает')
+    tasks_total = models.PositiveIntegerField(default=0)
+    tasks_deleted = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='project_deletion_status_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"Удаление проекта '{self.project_title}' со статусом '{self.status}'."
@@ -3,6 +3,8 @@
 from management.models import Group, User_project
 from rest_framework import serializers
 from django.utils.timezone import now
+from django.db import transaction
+from project_management_system_backend.concurrency import get_expected_version, update_changed_fields
 from users.utils import *
 from .models import *
 
@@ -38,6 +40,7 @@ class CreateProjectSerializer(serializers.ModelSerializer):
 
         return data
     
+    @transaction.atomic
     def create(self, validated_data):
         created_by = validated_data.pop('created_by_id')
         project = Project.objects.create(created_by=created_by, **validated_data)
@@ -86,6 +89,8 @@ class GetProjectSerializer(serializers.ModelSerializer):
             'updated_at', 
             'is_gittable', 
             'git_url', 
+            'version',
+            'archived_at',
             'created_by',
             'participants'
         ]
@@ -116,17 +121,18 @@ class ChangeProjectStatusSerializer(serializers.ModelSerializer):
 
         return data
     
+    @transaction.atomic
     def update(self, instance, validated_data):
-        if instance.status != validated_data.get('status', instance.status):    
-            instance = super().update(instance, validated_data)
+        expected_version = get_expected_version(self.context['request'])
 
+        if update_changed_fields(instance, validated_data, expected_version):
             log_user_action(
                 user=self.context['request'].user, 
                 action_name="Проекты", 
                 description=f"Пользователь изменил статус проекта «{instance.title}»"
             )
 
-            return instance
+        return instance
 
 
 # Сериализатор для изменения информации о проекте
@@ -155,21 +161,31 @@ class ChangeProjectSerializer(serializers.ModelSerializer):
         
         return data
     
+    @transaction.atomic
     def update(self, instance, validated_data):
-        fields_changed = False
-
-        for field in validated_data:
-            if getattr(instance, field) != validated_data[field]:
-                fields_changed = True
-                break
-
-        if fields_changed:
-            instance = super().update(instance, validated_data)
+        expected_version = get_expected_version(self.context['request'])
 
+        if update_changed_fields(instance, validated_data, expected_version):
             log_user_action(
                 user=self.context['request'].user, 
                 action_name="Проекты", 
                 description=f"Пользователь изменил проект «{instance.title}»"
             )
 
-        return instance
\ No newline at end of file
+        return instance
+
+# Сериализатор для получения прогресса удаления проекта
+class ProjectDeletionSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project_deletion
+        fields = ['id', 'project_title', 'status', 'tasks_total', 'tasks_deleted', 'progress', 'created_at', 'finished_at']
+
+    def get_progress(self, deletion):
+        if deletion.status == 'Завершено':
+            return 100
+        if not deletion.tasks_total:
+            return 0
+
+        return min(99, deletion.tasks_deleted * 100 // deletion.tasks_total)
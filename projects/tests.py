@@ -1,3 +1,100 @@
-from django.test import TestCase
+# projects/tests.py
 
-# Create your tests here.
+from project_management_system_backend.testing import NPlusOneTestCase, ProjectFixtureTestCase
+from .utils import purge_deleted_projects
+from tasks.reminders import send_due_reminders
+from django.utils.timezone import localdate
+from comments.models import Comment
+from users.models import User
+from tasks.models import Task
+from .models import *
+
+
+class ProjectListQueriesTests(NPlusOneTestCase):
+    def test_get_all_projects_list(self):
+        self.assertNoNPlusOne(self.data.member, '/api/get-all-projects-list/', self.rows)
+
+    def test_get_my_projects_list(self):
+        self.assertNoNPlusOne(self.data.member, '/api/get-my-projects-list/', self.rows)
+
+
+class ProjectDeletionTests(ProjectFixtureTestCase):
+    user = None
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.data.project
+
+    def delete_project(self):
+        self.client.force_authenticate(self.data.leader)
+        response = self.client.delete(f'/api/project/{self.project.id}/delete/')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'Ожидает')
+        self.assertEqual(response.data['tasks_total'], 3)
+
+        return Project_deletion.objects.get(id=response.data['id'])
+
+    def test_deleted_project_hidden_everywhere(self):
+        self.delete_project()
+        self.client.force_authenticate(self.data.admin)
+
+        self.assertFalse(Project.objects.filter(id=self.project.id).exists())
+        self.assertEqual(len(self.client.get(f'/api/project/{self.project.id}/get-all-tasks/').data), 0)
+        self.assertEqual(len(self.client.get(f'/api/project/{self.project.id}/get-not-private-tasks/').data), 0)
+        self.assertEqual(self.client.get(f'/api/task/{self.data.task.id}/get-details/').status_code, 404)
+        self.assertEqual(b''.join(self.client.get('/api/export-tasks/').streaming_content), b'')
+
+        # Бывший исполнитель больше не участник, поэтому задачи пропадают и из его списков
+        self.client.force_authenticate(self.data.member)
+        self.assertEqual(self.client.get('/api/tasks/my-inbox/').data['results'], [])
+
+    def test_no_reminders_for_deleted_project(self):
+        Task.objects.filter(project=self.project).update(due_date=localdate())
+        User.objects.filter(id=self.data.member.id).update(notifications_status=True)
+        self.assertEqual(send_due_reminders(), 1)
+
+        self.delete_project()
+
+        self.assertEqual(send_due_reminders(), 0)
+
+    def test_purge_in_batches(self):
+        deletion = self.delete_project()
+
+        self.assertEqual(purge_deleted_projects(batch_size=2), 2)
+        deletion.refresh_from_db()
+        self.assertEqual((deletion.status, deletion.tasks_deleted), ('В процессе', 2))
+
+        self.assertEqual(purge_deleted_projects(batch_size=2), 1)
+        self.assertEqual(purge_deleted_projects(batch_size=2), 1)
+        self.assertEqual(purge_deleted_projects(batch_size=2), 0)
+
+        deletion.refresh_from_db()
+        self.assertEqual(deletion.status, 'Завершено')
+        self.assertIsNone(deletion.project_id)
+        self.assertFalse(Project.all_objects.filter(id=self.project.id).exists())
+        self.assertFalse(Task.all_objects.filter(project=self.project.id).exists())
+        self.assertFalse(Comment.objects.filter(task=self.data.task.id).exists())
+        # Другие проекты не затронуты
+        self.assertTrue(Project.objects.filter(id=self.data.projects[1].id).exists())
+
+    def test_only_creator_can_delete(self):
+        self.client.force_authenticate(self.data.member)
+
+        self.assertEqual(self.client.delete(f'/api/project/{self.project.id}/delete/').status_code, 400)
+        self.assertTrue(Project.objects.filter(id=self.project.id).exists())
+
+
+class ProjectIfMatchTests(ProjectFixtureTestCase):
+    rows = 1
+
+    def test_concurrent_status_change(self):
+        url = f'/api/project/{self.data.project.id}/change-status/'
+        etag = self.client.get(f'/api/project/{self.data.project.id}/get-details/')['ETag']
+
+        first = self.client.patch(url, {'status': 'Приостановлено'}, format='json', headers={'If-Match': etag})
+        second = self.client.patch(url, {'status': 'Завершено'}, format='json', headers={'If-Match': etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 412)
+        self.assertEqual(Project.objects.get(id=self.data.project.id).status, 'Приостановлено')
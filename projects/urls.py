@@ -7,8 +7,13 @@ urlpatterns = [
     path('create-project/', CreateProjectView.as_view(), name='create-project'),
     path('get-all-projects-list/', GetAllProjectsListView.as_view(), name='get-all-projects-list'),
     path('get-my-projects-list/', GetMyProjectsListView.as_view(), name='get-my-projects-list'),
+    path('get-archived-projects-list/', GetArchivedProjectsListView.as_view(), name='get-archived-projects-list'),
     path('project/<int:pk>/get-details/', GetProjectDetailsView.as_view(), name='get-project-details'),
+    path('project/<int:project_id>/overview/', GetProjectOverviewView.as_view(), name='get-project-overview'),
     path('project/<int:pk>/change-status/', ChangeProjectStatusView.as_view(), name='change-project-status'),
+    path('project/<int:pk>/archive/', ArchiveProjectView.as_view(), name='archive-project'),
+    path('project/<int:pk>/restore/', RestoreProjectView.as_view(), name='restore-project'),
     path('project/<int:pk>/delete/', DeleteProjectView.as_view(), name='delete-project'),
+    path('project-deletion/<int:pk>/', GetProjectDeletionView.as_view(), name='get-project-deletion'),
     path('project/<int:pk>/change-info/', ChangeProjectView.as_view(), name='change-project-info'),
 ]
\ No newline at end of file
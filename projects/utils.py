@@ -0,0 +1,83 @@
+# projects/utils.py
+
+from management.models import User_project, Project_request
+from tasks.models import Task, Task_status_transition
+from django.utils.timezone import now
+from users.utils import log_user_action
+from comments.models import Comment
+from django.db import transaction
+from .models import *
+
+
+def schedule_project_deletion(project, user):
+    """
+    Мягко удаляет проект: он сразу скрывается из всех эндпоинтов, участники и заявки удаляются
+    (одним запросом каждые, без каскадов), а задачи с комментариями удаляются позже порциями
+    командой purge_deleted_projects. Возвращает запись Project_deletion для отслеживания прогресса.
+    """
+    with transaction.atomic():
+        Project.all_objects.filter(id=project.id).update(deleted_at=now())
+        User_project.objects.filter(project=project).delete()
+        Project_request.objects.filter(project=project).delete()
+
+        deletion = Project_deletion.objects.create(
+            project=project,
+            requested_by=user,
+            project_title=project.title,
+            tasks_total=Task.all_objects.filter(project=project).count()
+        )
+
+        log_user_action(
+            user=user,
+            action_name="Проекты",
+            description=f"Руководитель удалил проект «{project.title}»"
+        )
+
+    return deletion
+
+
+def purge_deleted_projects(batch_size=200):
+    """
+    Удаляет очередную порцию задач (с комментариями и историей статусов) одного мягко удаленного проекта,
+    а когда задач не осталось — сам проект. Каждая порция выполняется в отдельной короткой транзакции,
+    строка Project_deletion блокируется с SKIP LOCKED, поэтому обработчики могут работать параллельно.
+    Возвращает количество удаленных записей (0, если очередь пуста).
+    """
+    with transaction.atomic():
+        deletion = Project_deletion.objects.select_for_update(skip_locked=True).filter(
+            status__in=['Ожидает', 'В процессе']
+        ).order_by('id').first()
+
+        if deletion is None:
+            return 0
+
+        task_ids = list(
+            Task.all_objects.filter(project=deletion.project_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+
+        if task_ids:
+            # Дочерние строки удаляются явно, чтобы сборщик Django не обходил их в Python
+            Comment.objects.filter(task__in=task_ids).delete()
+            Task_status_transition.objects.filter(task__in=task_ids).delete()
+            Task.all_objects.filter(id__in=task_ids).delete()
+
+            deletion.tasks_deleted += len(task_ids)
+            deletion.status = 'В процессе'
+            deletion.save(update_fields=['tasks_deleted', 'status'])
+
+            return len(task_ids)
+
+        Project.all_objects.filter(id=deletion.project_id).delete()
+
+        deletion.status = 'Завершено'
+        deletion.finished_at = now()
+        deletion.save(update_fields=['status', 'finished_at'])
+
+        if deletion.requested_by_id:
+            log_user_action(
+                user=deletion.requested_by,
+                action_name="Проекты",
+                description=f"Данные проекта «{deletion.project_title}» полностью удалены"
+            )
+
+    return 1
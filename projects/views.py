@@ -1,9 +1,21 @@
 # projects/views.py
 
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
-from rest_framework.exceptions import ValidationError
-from management.models import User_project
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
+from management.serializers import GetUsersSerializer, GetProjectRequestsSerializer
+from rest_framework.exceptions import ValidationError, PermissionDenied
+from management.models import User_project, Project_request
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+from management.pagination import OptionalPageNumberPagination
+from django.utils.timezone import now
+from django.db import transaction
+from rest_framework import status
+from tasks.serializers import GetTaskSerializer
+from django.db.models import Prefetch, Q, F
 from users.utils import log_user_action
+from tasks.models import Task
+from project_management_system_backend.concurrency import ETagMixin
+from .utils import schedule_project_deletion
 from .serializers import *
 from .models import *
 
@@ -14,11 +26,22 @@ class CreateProjectView(CreateAPIView):
     serializer_class = CreateProjectSerializer
 
 
+# Запрос проектов вместе с создателем и участниками для GetProjectSerializer
+def get_projects_with_participants(projects=None):
+    projects = Project.objects.all() if projects is None else projects
+
+    return projects.select_related('created_by').prefetch_related(
+        Prefetch('project_user', queryset=User_project.objects.select_related('user'))
+    )
+
+
 # Вью для получения информации о всех проектах
 class GetAllProjectsListView(ListAPIView):
-    queryset = Project.objects.all()
     serializer_class = GetProjectSerializer
 
+    def get_queryset(self):
+        return get_projects_with_participants()
+
 
 # Вью для получения информации о "моих" проектах
 class GetMyProjectsListView(ListAPIView):
@@ -28,30 +51,172 @@ class GetMyProjectsListView(ListAPIView):
         user_id = self.request.user.id
         current_user_projects = User_project.objects.filter(user=user_id).values('project')
 
-        return Project.objects.filter(id__in=current_user_projects)
+        return get_projects_with_participants().filter(id__in=current_user_projects)
+
+
+# Вью для получения архивных проектов: администратору - всех, остальным - тех, в которых они участвуют
+class GetArchivedProjectsListView(ListAPIView):
+    serializer_class = GetProjectSerializer
+    pagination_class = OptionalPageNumberPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        projects = Project.all_objects.filter(deleted_at__isnull=True, archived_at__isnull=False)
+
+        if not user.is_admin:
+            projects = projects.filter(id__in=User_project.objects.filter(user=user.id).values('project'))
+
+        return get_projects_with_participants(projects).order_by('-archived_at', 'id')
 
 
 # Вью для получения полной информации о проекте
-class GetProjectDetailsView(RetrieveAPIView):
+class GetProjectDetailsView(ETagMixin, RetrieveAPIView):
     serializer_class = GetProjectSerializer
-    queryset = Project.objects.all()
+
+    def get_queryset(self):
+        return get_projects_with_participants()
+
+
+# Вью для получения всех данных страницы проекта одним запросом
+class GetProjectOverviewView(GenericAPIView):
+    """
+    Объединяет ответы get-details, get-users, get-user-group, get-not-private-tasks,
+    get-my-tasks и get-requests. Участие пользователя в проекте определяется один раз.
+    Параметр fields (через запятую) позволяет получить только нужные разделы.
+    """
+    sections = ('project', 'users', 'user_group', 'not_private_tasks', 'my_tasks', 'requests')
+
+    def get_sections(self):
+        fields = self.request.query_params.get('fields')
+
+        if not fields:
+            return set(self.sections)
+
+        requested = {field.strip() for field in fields.split(',') if field.strip()}
+        unknown = requested - set(self.sections)
+
+        if unknown:
+            raise ValidationError({'fields': f"Неизвестные разделы: {', '.join(sorted(unknown))}."})
+        return requested
+
+    def get(self, request, *args, **kwargs):
+        sections = self.get_sections()
+        user = request.user
+
+        project = get_object_or_404(
+            Project.objects.select_related('created_by').prefetch_related(
+                Prefetch('project_user', queryset=User_project.objects.select_related('user', 'user_group'))
+            ),
+            id=self.kwargs['project_id']
+        )
+        memberships = {user_project.user_id: user_project for user_project in project.project_user.all()}
+        membership = memberships.get(user.id)
+
+        if membership is None and not user.is_admin:
+            raise PermissionDenied({'no_membership': 'Вы не участвуете в этом проекте.'})
+
+        data = {}
+
+        if 'project' in sections:
+            data['project'] = GetProjectSerializer(project).data
+
+        if 'users' in sections:
+            users = [user_project.user for user_project in memberships.values()]
+            data['users'] = GetUsersSerializer(users, many=True, context={'memberships': memberships}).data
+
+        if 'user_group' in sections:
+            data['user_group'] = {'group_name_in_project': membership.user_group.name if membership else None}
+
+        if sections & {'not_private_tasks', 'my_tasks'}:
+            # Обе выборки задач получаются одним запросом и разделяются в памяти
+            tasks = Task.objects.filter(project=project).filter(
+                ~Q(created_by=F('assigned_to_id')) | Q(assigned_to=user.id)
+            ).select_related('project', 'created_by', 'assigned_to')
+            tasks = list(tasks)
+
+            if 'not_private_tasks' in sections:
+                not_private = [task for task in tasks if task.created_by_id != task.assigned_to_id]
+                data['not_private_tasks'] = GetTaskSerializer(not_private, many=True).data
+
+            if 'my_tasks' in sections:
+                my_tasks = [task for task in tasks if task.assigned_to_id == user.id]
+                data['my_tasks'] = GetTaskSerializer(my_tasks, many=True).data
+
+        if 'requests' in sections:
+            requests = Project_request.objects.filter(project=project).exclude(status="Принята").select_related('created_by')
+            data['requests'] = GetProjectRequestsSerializer(requests, many=True).data
+
+        return Response(data)
 
 
 # Вью для изменения статуса проекта
-class ChangeProjectStatusView(UpdateAPIView):
+class ChangeProjectStatusView(ETagMixin, UpdateAPIView):
     queryset = Project.objects.all()
     serializer_class = ChangeProjectStatusSerializer
 
 
 # Вью для изменения информации о проекте
-class ChangeProjectView(UpdateAPIView):
+class ChangeProjectView(ETagMixin, UpdateAPIView):
     queryset = Project.objects.all()
     serializer_class = ChangeProjectSerializer
 
 
+# Базовая вью для переноса проекта в архив и восстановления из него
+class BaseProjectArchiveView(GenericAPIView):
+    archive = True
+
+    def get_queryset(self):
+        return Project.all_objects.filter(deleted_at__isnull=True, archived_at__isnull=self.archive)
+
+    def post(self, request, *args, **kwargs):
+        project = self.get_object()
+        user = request.user
+        action = "перенос в архив" if self.archive else "восстановление из архива"
+
+        if project.created_by != user:
+            log_user_action(
+                user=user, 
+                action_name="Проекты", 
+                description=f"Пользователь послал запрос на {action} проекта «{project.title}»",
+                status='Ошибка прав доступа'
+            )
+            raise ValidationError({'no_rights': 'Вы не являетесь создателем проекта.'})
+
+        with transaction.atomic():
+            # Задачи архивируются вместе с проектом той же меткой времени, поэтому при восстановлении
+            # возвращаются только они, а задачи, заархивированные раньше отдельно, остаются в архиве
+            if self.archive:
+                archived_at = now()
+                Task.objects.filter(project=project).update(archived_at=archived_at)
+            else:
+                archived_at = None
+                Task.all_objects.filter(project=project, archived_at=project.archived_at).update(archived_at=None)
+
+            project.archived_at = archived_at
+            project.save(update_fields=['archived_at'])
+
+            log_user_action(
+                user=user,
+                action_name="Проекты",
+                description=f"Руководитель выполнил {action} проекта «{project.title}»"
+            )
+
+        return Response(GetProjectSerializer(project).data)
+
+
+# Вью для переноса проекта в архив
+class ArchiveProjectView(BaseProjectArchiveView):
+    archive = True
+
+
+# Вью для восстановления проекта из архива
+class RestoreProjectView(BaseProjectArchiveView):
+    archive = False
+
+
 # Вью для удаления проекта
 class DeleteProjectView(DestroyAPIView):
-    queryset = Project.objects.all()
+    queryset = Project.all_objects.filter(deleted_at__isnull=True)
 
     def perform_destroy(self, instance):
         user = self.request.user
@@ -65,12 +230,22 @@ class DeleteProjectView(DestroyAPIView):
             )
             raise ValidationError({'no_rights': 'У Вас отсутствуют права для удаления проекта.'})
         
-        project_title = instance.title
+        # Проект сразу скрывается, а его задачи и комментарии удаляются в фоне (purge_deleted_projects)
+        self.deletion = schedule_project_deletion(instance, user)
 
-        instance.delete()
-        
-        log_user_action(
-            user=user,
-            action_name="Проекты",
-            description=f"Руководитель удалил проект «{project_title}»"
-        )
\ No newline at end of file
+    def destroy(self, request, *args, **kwargs):
+        self.perform_destroy(self.get_object())
+
+        return Response(ProjectDeletionSerializer(self.deletion).data, status=status.HTTP_202_ACCEPTED)
+
+
+# Вью для получения прогресса удаления проекта
+class GetProjectDeletionView(RetrieveAPIView):
+    serializer_class = ProjectDeletionSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+
+        if user.is_admin:
+            return Project_deletion.objects.all()
+        return Project_deletion.objects.filter(requested_by=user)
\ No newline at end of file
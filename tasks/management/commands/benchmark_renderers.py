@@ -0,0 +1,93 @@
+# tasks/management/commands/benchmark_renderers.py
+
+from project_management_system_backend.renderers import ORJSONRenderer, MessagePackRenderer
+from project_management_system_backend.normalization import normalize_rows
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from project_statistics.utils import percentile
+from tasks.views import BaseTaskListView
+from importlib.util import find_spec
+from time import perf_counter
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга и размер ответа списка задач (по умолчанию 10 000 строк) "
+        "для стандартного JSONRenderer DRF, orjson и MessagePack, в обычном и нормализованном (shape=normalized) виде."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=50, help="Число различных пользователей в строках.")
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        rows = self.get_rows(options['rows'], options['users'])
+        results, tables = normalize_rows(rows, BaseTaskListView.normalized_fields)
+        shapes = {
+            'обычный': rows,
+            'normalized': {'results': results, **tables},
+        }
+        renderers = {'DRF JSONRenderer': JSONRenderer(), 'orjson': ORJSONRenderer()}
+
+        if find_spec('msgpack'):
+            renderers['MessagePack'] = MessagePackRenderer()
+        else:
+            self.stdout.write("Пакет msgpack не установлен, MessagePack не замеряется.")
+
+        lines = [f"{'Рендерер':<18}  {'Вид':<10}  {'p50, мс':>9}  {'p95, мс':>9}  {'Размер, КБ':>10}"]
+
+        for renderer_name, renderer in renderers.items():
+            for shape_name, data in shapes.items():
+                timings = []
+
+                for _ in range(options['repeat']):
+                    start = perf_counter()
+                    content = renderer.render(data, renderer.media_type)
+                    timings.append((perf_counter() - start) * 1000)
+
+                timings.sort()
+                lines.append(
+                    f"{renderer_name:<18}  {shape_name:<10}  {percentile(timings, 50):>9.1f}  "
+                    f"{percentile(timings, 95):>9.1f}  {len(content) / 1024:>10.1f}"
+                )
+
+        self.stdout.write('\n'.join(lines))
+
+    def get_rows(self, count, users):
+        """
+        Строки в формате GetTaskSerializer: данные пользователей и проекта повторяются в каждой строке, как в API.
+        """
+        rows = []
+
+        for index in range(count):
+            creator = index % users + 1
+            assignee = (index * 7) % users + 1
+
+            rows.append({
+                'id': index + 1,
+                'title': f'Задача {index + 1}',
+                'description': 'Описание задачи для замера размера ответа.',
+                'created_at': '2026-10-19T10:00:00.000000Z',
+                'updated_at': '2026-10-19T10:00:00.000000Z',
+                'due_date': '2026-11-01',
+                'status': 'В процессе',
+                'priority': 'Средний',
+                'comment_count': index % 5,
+                'version': 1,
+                'is_gittable': False,
+                'git_url': None,
+                'archived_at': None,
+                'project_name': 'Проект для замеров',
+                'project': 1,
+                'created_by': creator,
+                'created_by_username': f'user_{creator}',
+                'created_by_first_name': f'Имя{creator}',
+                'created_by_last_name': f'Фамилия{creator}',
+                'assigned_to': assignee,
+                'assigned_to_username': f'user_{assignee}',
+                'assigned_to_first_name': f'Имя{assignee}',
+                'assigned_to_last_name': f'Фамилия{assignee}',
+            })
+
+        return rows
@@ -0,0 +1,28 @@
+# tasks/management/commands/send_due_reminders.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from tasks.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Ставит в очередь письма-сводки о просроченных и скоро истекающих задачах и проектах. "
+        "Запускается по расписанию раз в день (например, из cron), повторный запуск за ту же дату писем не дублирует."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Дата напоминаний в формате ГГГГ-ММ-ДД (по умолчанию сегодня)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        date = None
+
+        if options['date']:
+            date = parse_date(options['date'])
+
+            if date is None:
+                raise CommandError("Некорректная дата, ожидается формат ГГГГ-ММ-ДД.")
+
+        queued = send_due_reminders(date, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Поставлено сводок в очередь: {queued}"))
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations, models
+
+STATUSES = {1: 'Ожидает', 2: 'В процессе', 3: 'Приостановлено', 4: 'Отменено', 5: 'Завершено'}
+PRIORITIES = {1: 'Низкий', 2: 'Средний', 3: 'Высокий'}
+TASK_FIELDS = {'status': STATUSES, 'priority': PRIORITIES}
+TRANSITION_FIELDS = {'from_status': STATUSES, 'to_status': STATUSES}
+
+
+def blank_from_status_to_null(apps, schema_editor):
+    Task_status_transition = apps.get_model('tasks', 'task_status_transition')
+    Task_status_transition.objects.filter(from_status='').update(from_status=None)
+
+
+def null_from_status_to_blank(apps, schema_editor):
+    Task_status_transition = apps.get_model('tasks', 'task_status_transition')
+    Task_status_transition.objects.filter(from_status__isnull=True).update(from_status='')
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельными транзакциями до смены типа столбцов
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0005_task_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task_status_transition',
+            name='from_status',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.RunPython(blank_from_status_to_null, null_from_status_to_blank),
+        migrations.RunPython(
+            convert_labels('tasks', 'task', TASK_FIELDS),
+            convert_labels('tasks', 'task', TASK_FIELDS, to_codes=False)
+        ),
+        migrations.RunPython(
+            convert_labels('tasks', 'task_status_transition', TRANSITION_FIELDS),
+            convert_labels('tasks', 'task_status_transition', TRANSITION_FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=STATUSES),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=PRIORITIES),
+        ),
+        migrations.AlterField(
+            model_name='task_status_transition',
+            name='from_status',
+            field=project_management_system_backend.fields.LabelChoiceField(blank=True, labels=STATUSES, null=True),
+        ),
+        migrations.AlterField(
+            model_name='task_status_transition',
+            name='to_status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=STATUSES),
+        ),
+    ]
@@ -2,7 +2,20 @@
 
 from django.db import models
 from users.models import User
-from projects.models import Project
+from project_management_system_backend.fields import LabelChoiceField
+from projects.models import Project, STATUSES, PRIORITIES
+
+
+class TaskManager(models.Manager):
+    """
+    Менеджер по умолчанию: скрывает архивные задачи. Задачи проектов, поставленных в очередь на удаление,
+    менеджер не скрывает (это добавило бы соединение с projects_project в каждый запрос): участники удаленного
+    проекта исключаются сразу, а там, где доступ не проверяется через участие, фильтр по project__deleted_at
+    задается явно.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(archived_at__isnull=True)
 
 
 class Task(models.Model):
@@ -11,10 +24,13 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField()
-    status = models.CharField(max_length=20)
-    priority = models.CharField(max_length=20)
+    status = LabelChoiceField(labels=STATUSES)
+    priority = LabelChoiceField(labels=PRIORITIES)
     is_gittable = models.BooleanField(default=False)
     git_url = models.CharField(max_length=150, blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
     project = models.ForeignKey(
         Project,
         related_name='project_tasks',
@@ -31,5 +47,77 @@ class Task(models.Model):
         on_delete=models.CASCADE
     )
 
+    objects = TaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['project', 'assigned_to'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_assignee_idx'
+            ),
+            models.Index(
+                fields=['project', 'created_by'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_creator_idx'
+            ),
+            models.Index(
+                fields=['project', 'status'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_status_idx'
+            ),
+            models.Index(
+                fields=['project', 'due_date'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_due_date_idx'
+            ),
+            models.Index(
+                fields=['due_date', 'status'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_due_status_idx'
+            ),
+            models.Index(
+                fields=['assigned_to', 'due_date', 'id'],
+                condition=models.Q(archived_at__isnull=True),
+                name='task_live_inbox_idx'
+            ),
+            models.Index(
+                fields=['project', 'archived_at'],
+                condition=models.Q(archived_at__isnull=False),
+                name='task_archived_idx'
+            ),
+        ]
+
     def __str__(self):
         return f"Задание '{self.title}' в проекте '{self.project.title}'."
+
+
+class Task_status_transition(models.Model):
+    task = models.ForeignKey(
+        Task,
+        related_name='status_transitions',
+        on_delete=models.CASCADE
+    )
+    project = models.ForeignKey(
+        Project,
+        related_name='task_status_transitions',
+        on_delete=models.CASCADE
+    )
+    changed_by = models.ForeignKey(
+        User,
+        related_name='task_status_changes',
+        null=True,
+        on_delete=models.SET_NULL
+    )
+    from_status = LabelChoiceField(labels=STATUSES, null=True, blank=True)
+    to_status = LabelChoiceField(labels=STATUSES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'changed_at'], name='task_transition_project_idx'),
+        ]
+
+    def __str__(self):
+        return f"Смена статуса задачи '{self.task.title}': '{self.from_status}' -> '{self.to_status}'."
@@ -0,0 +1,72 @@
+# tasks/reminders.py
+
+from users.utils import email_event
+from django.utils.timezone import localdate
+from users.models import User, Outbox_event
+from projects.models import Project
+from collections import defaultdict
+from django.db import transaction
+from django.conf import settings
+from datetime import timedelta
+from .models import Task
+
+
+def get_reminder_window(date):
+    """
+    Возвращает диапазон сроков, попадающих в напоминания на дату date: просроченные не более чем на
+    DUE_REMINDERS_OVERDUE_DAYS дней и наступающие в ближайшие DUE_REMINDERS_DUE_SOON_DAYS дней.
+    Ограниченный диапазон сохраняет стоимость сканирования постоянной при любом объеме старых просрочек.
+    """
+    return (
+        date - timedelta(days=settings.DUE_REMINDERS_OVERDUE_DAYS),
+        date + timedelta(days=settings.DUE_REMINDERS_DUE_SOON_DAYS)
+    )
+
+
+def format_due_line(subject, due_date, date):
+    if due_date < date:
+        return f"{subject}: срок истек {due_date:%d.%m.%Y}"
+    return f"{subject}: срок {due_date:%d.%m.%Y}"
+
+
+def send_due_reminders(date=None, batch_size=1000):
+    """
+    Ставит в очередь писем (Outbox_event) по одной сводке на пользователя: его незакрытые задачи и
+    проекты, у которых срок прошел или скоро наступит. Задачи и проекты выбираются одним диапазонным
+    запросом каждые по индексу (due_date, status). Ключ идемпотентности включает дату, поэтому
+    повторный запуск в тот же день писем не дублирует. Возвращает количество поставленных сводок.
+    """
+    date = date or localdate()
+    window = get_reminder_window(date)
+    closed = settings.STATISTICS_CLOSED_TASK_STATUSES
+    lines = defaultdict(list)
+
+    tasks = Task.objects.filter(due_date__range=window, project__deleted_at__isnull=True).exclude(status__in=closed).values_list(
+        'assigned_to', 'title', 'due_date', 'project__title'
+    ).order_by('due_date')
+
+    for user_id, title, due_date, project_title in tasks.iterator(chunk_size=batch_size):
+        lines[user_id].append(format_due_line(f"Задача «{title}» проекта «{project_title}»", due_date, date))
+
+    projects = Project.objects.filter(due_date__range=window).exclude(status__in=closed).values_list(
+        'created_by', 'title', 'due_date'
+    ).order_by('due_date')
+
+    for user_id, title, due_date in projects.iterator(chunk_size=batch_size):
+        lines[user_id].append(format_due_line(f"Проект «{title}»", due_date, date))
+
+    users = User.objects.filter(id__in=lines, notifications_status=True).only('id', 'email')
+    events = [
+        email_event(
+            user,
+            "Сроки задач и проектов",
+            "Требуют внимания:\n" + "\n".join(lines[user.id]),
+            idempotency_key=f"due-reminder:{date}"
+        )
+        for user in users.iterator(chunk_size=batch_size)
+    ]
+
+    with transaction.atomic():
+        Outbox_event.objects.bulk_create(events, batch_size=batch_size, ignore_conflicts=True)
+
+    return len(events)
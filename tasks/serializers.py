@@ -3,6 +3,9 @@
 from management.models import User_project
 from rest_framework import serializers
 from django.utils.timezone import now
+from django.db import transaction
+from project_management_system_backend.concurrency import get_expected_version, update_changed_fields
+from .utils import log_status_transition
 from users.utils import *
 from .models import *
 
@@ -71,6 +74,7 @@ class CreateTaskSerializer(serializers.ModelSerializer):
 
         return data
     
+    @transaction.atomic
     def create(self, validated_data):
         validated_data['project'] = validated_data.pop('project_id')
         validated_data['assigned_to'] = validated_data.pop('assigned_to_id')
@@ -78,6 +82,8 @@ class CreateTaskSerializer(serializers.ModelSerializer):
         
         task = super().create(validated_data)
 
+        log_status_transition(task, None, task.created_by)
+
         log_user_action(
             user=task.created_by,
             action_name="Задачи",
@@ -87,7 +93,8 @@ class CreateTaskSerializer(serializers.ModelSerializer):
         send_mail_notification(
             users=[task.assigned_to],
             header="Новая задача",
-            text=f"Обнаружена новая порученная Вам задача «{task.title}» в проекте «{task.project.title}»."
+            text=f"Обнаружена новая порученная Вам задача «{task.title}» в проекте «{task.project.title}».",
+            idempotency_key=f"task-created:{task.id}"
         )
 
         return task
@@ -106,14 +113,23 @@ class GetTaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ['id', 'title', 'description', 'created_at', 'updated_at',
-                  'due_date', 'status', 'priority',
-                  'is_gittable', 'git_url', 'project_name', 'project',
+                  'due_date', 'status', 'priority', 'comment_count', 'version',
+                  'is_gittable', 'git_url', 'archived_at', 'project_name', 'project',
                   'created_by', 'created_by_username', 
                   'created_by_first_name', 'created_by_last_name', 
                   'assigned_to','assigned_to_username', 
                   'assigned_to_first_name', 'assigned_to_last_name',
                 ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+
+        # Параметр fields списочных вью: в ответ попадают только запрошенные поля
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
 # Сериализатор для изменения статуса задачи
 class ChangeTaskStatusSerializer(serializers.ModelSerializer):
@@ -136,11 +152,16 @@ class ChangeTaskStatusSerializer(serializers.ModelSerializer):
 
         return data
     
+    @transaction.atomic
     def update(self, instance, validated_data):
-        if instance.status != validated_data.get('status', instance.status):
-            instance = super().update(instance, validated_data)
+        from_status = instance.status
+        expected_version = get_expected_version(self.context['request'])
+
+        if update_changed_fields(instance, validated_data, expected_version):
             user = self.context['request'].user
 
+            log_status_transition(instance, from_status, user)
+
             log_user_action(
                 user=user, 
                 action_name="Задачи", 
@@ -152,7 +173,8 @@ class ChangeTaskStatusSerializer(serializers.ModelSerializer):
             send_mail_notification(
                 users=[receiver], 
                 header="Изменение статуса в задаче", 
-                text=f"Изменился статус задачи «{instance.title}» проекта «{instance.project.title}»."
+                text=f"Изменился статус задачи «{instance.title}» проекта «{instance.project.title}».",
+                idempotency_key=f"task-status:{instance.id}:{instance.version}"
             )
 
         return instance
@@ -184,17 +206,11 @@ class ChangeTaskSerializer(serializers.ModelSerializer):
 
         return data
     
+    @transaction.atomic
     def update(self, instance, validated_data):
-        fields_changed = False
-
-        for field in validated_data:
-            if getattr(instance, field) != validated_data[field]:
-                fields_changed = True
-                break
-
-        if fields_changed:
-            instance = super().update(instance, validated_data)
+        expected_version = get_expected_version(self.context['request'])
 
+        if update_changed_fields(instance, validated_data, expected_version):
             log_user_action(
                 user=self.context['request'].user, 
                 action_name="Задачи", 
@@ -204,7 +220,8 @@ class ChangeTaskSerializer(serializers.ModelSerializer):
             send_mail_notification(
                 users=[instance.assigned_to], 
                 header="Изменения задачи", 
-                text=f"Задача «{instance.title}» проекта «{instance.project.title}» была изменена."
+                text=f"Задача «{instance.title}» проекта «{instance.project.title}» была изменена.",
+                idempotency_key=f"task-changed:{instance.id}:{instance.version}"
             )
 
         return instance
@@ -1,3 +1,490 @@
-from django.test import TestCase
+# tasks/tests.py
 
-# Create your tests here.
+from project_management_system_backend.testing import NPlusOneTestCase, ProjectFixtureTestCase, create_user
+from project_management_system_backend.middleware import NPlusOneDetector, registry, choose_encoding
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.utils.timezone import now
+from django.test import TransactionTestCase, override_settings
+from django.db.migrations.executor import MigrationExecutor
+from django.db import connection
+from management.models import User_project
+from projects.models import Project
+from datetime import timedelta
+from .models import Task
+import json
+import gzip
+
+
+class TaskListQueriesTests(NPlusOneTestCase):
+    def test_get_all_tasks(self):
+        self.assertNoNPlusOne(self.data.admin, f'/api/project/{self.data.project.id}/get-all-tasks/', self.rows)
+
+    def test_get_my_tasks(self):
+        self.assertNoNPlusOne(self.data.member, f'/api/project/{self.data.project.id}/get-my-tasks/', self.rows)
+
+    def test_get_my_tasks_to_others(self):
+        self.assertNoNPlusOne(self.data.leader, f'/api/project/{self.data.project.id}/get-my-tasks-to-others/', self.rows)
+
+    def test_get_not_private_tasks(self):
+        self.assertNoNPlusOne(self.data.member, f'/api/project/{self.data.project.id}/get-not-private-tasks/', self.rows)
+
+    def test_detector_reports_lazy_relations(self):
+        # Обращение к связанному объекту в цикле без select_related дает по запросу на строку
+        with NPlusOneDetector() as detector:
+            [task.project.title for task in Task.objects.filter(project=self.data.project)]
+
+        violations = detector.violations()
+        self.assertEqual(len(violations), 1)
+        self.assertIn('FROM "projects_project"', violations[0][0])
+        self.assertEqual(violations[0][1], self.rows)
+
+    def test_detector_ignores_select_related(self):
+        with NPlusOneDetector() as detector:
+            [task.project.title for task in Task.objects.filter(project=self.data.project).select_related('project')]
+
+        self.assertEqual(detector.violations(), [])
+
+
+class NormalizedTaskListTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/project/{self.data.project.id}/get-all-tasks/'
+
+    def test_users_and_projects_moved_to_tables(self):
+        response = self.client.get(self.url, {'shape': 'normalized'})
+        data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data['results']), 3)
+        self.assertNotIn('created_by_username', data['results'][0])
+        self.assertEqual(data['results'][0]['created_by'], self.data.leader.id)
+        self.assertEqual(data['users'][str(self.data.member.id)]['username'], self.data.member.username)
+        self.assertEqual(data['projects'][str(self.data.project.id)], {'title': self.data.project.title})
+
+    def test_paginated(self):
+        data = json.loads(self.client.get(self.url, {'shape': 'normalized', 'page': 1, 'page_size': 2}).content)
+
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(len(data['results']), 2)
+        self.assertIn('users', data)
+
+    def test_unknown_shape(self):
+        self.assertEqual(self.client.get(self.url, {'shape': 'compact'}).status_code, 400)
+
+
+class TaskArchiveTests(ProjectFixtureTestCase):
+    """
+    Архивные задачи скрыты менеджером Task.objects, но обслуживающие операции должны их затрагивать.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.data.task
+        self.client.post(f'/api/task/{self.task.id}/archive/')
+
+    def get_ids(self, url, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.data.leader)
+
+        return {task['id'] for task in json.loads(client.get(url).content)}
+
+    def test_hidden_from_lists(self):
+        project_id = self.data.project.id
+
+        self.assertNotIn(self.task.id, self.get_ids(f'/api/project/{project_id}/get-all-tasks/', self.data.admin))
+        self.assertEqual(self.get_ids(f'/api/project/{project_id}/get-archived-tasks/'), {self.task.id})
+
+    def test_restore(self):
+        response = self.client.post(f'/api/task/{self.task.id}/restore/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.task.id, self.get_ids(f'/api/project/{self.data.project.id}/get-all-tasks/', self.data.admin))
+
+    def test_remove_member_reassigns_archived_tasks(self):
+        response = self.client.delete(f'/api/project/{self.data.project.id}/remove-member/{self.data.member.id}/')
+        self.task.refresh_from_db()
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.task.assigned_to, self.data.leader)
+        self.assertIsNotNone(self.task.archived_at)
+
+    def test_bulk_remove_deletes_archived_tasks_of_removed_member(self):
+        own_task = Task.objects.create(title='Своя задача', due_date=self.task.due_date, status='В процессе',
+                                       priority='Средний', project=self.data.project,
+                                       created_by=self.data.member, assigned_to=self.data.member)
+        Task.objects.filter(id=own_task.id).update(archived_at=now())
+
+        response = self.client.post(f'/api/project/{self.data.project.id}/bulk-remove-members/',
+                                    {'user_ids': [self.data.member.id]}, format='json')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(Task.all_objects.filter(id=own_task.id).exists())
+        self.assertEqual(Task.all_objects.get(id=self.task.id).assigned_to, self.data.leader)
+
+
+class StreamingRequestMetricsTests(ProjectFixtureTestCase):
+    """
+    Выгрузка читает БД при формировании тела, уже после выхода из middleware - эти запросы должны попасть в метрики.
+    """
+    user = 'admin'
+
+    def setUp(self):
+        super().setUp()
+        registry.views.pop('export-tasks', None)
+
+    def test_body_queries_attributed_to_request(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/export-tasks/')
+
+            self.assertNotIn('export-tasks', registry.views)
+            lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(registry.views['export-tasks']['queries_sum'], len(context.captured_queries))
+        self.assertEqual(registry.views['export-tasks']['requests'], {'200': 1})
+
+    def get_slow_log(self):
+        with self.assertLogs('request_metrics', 'WARNING') as logs:
+            response = self.client.get('/api/export-tasks/')
+            b''.join(response.streaming_content)
+
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(registry.views['export-tasks']['requests'], {'200': 1})
+
+        return logs.output[0]
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0.0, REQUEST_METRICS_CAPTURE_SQL=True, REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_request_logged_without_sampling(self):
+        self.assertIn('текст SQL не сохранен', self.get_slow_log())
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_CAPTURE_SQL=True, REQUEST_METRICS_SLOW_MS=0)
+    def test_sampled_slow_request_logs_sql(self):
+        self.assertIn('FROM "tasks_task"', self.get_slow_log())
+
+
+class MyOverdueTasksTests(ProjectFixtureTestCase):
+    rows = 3
+    user = 'member'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Task.objects.update(due_date=now().date() - timedelta(days=1))
+
+    def get_ids(self):
+        return [task['id'] for task in self.client.get('/api/get-my-overdue-tasks/').json()]
+
+    def test_closed_archived_and_due_today_excluded(self):
+        first, second, third = self.data.tasks
+        Task.objects.filter(id=first.id).update(status='Завершено')
+        Task.objects.filter(id=second.id).update(archived_at=now())
+        Task.objects.filter(id=third.id).update(due_date=now().date())
+
+        self.assertEqual(self.get_ids(), [])
+
+    def test_ordered_by_due_date(self):
+        first, second, third = self.data.tasks
+        Task.objects.filter(id=third.id).update(due_date=now().date() - timedelta(days=2))
+
+        self.assertEqual(self.get_ids(), [third.id, first.id, second.id])
+
+    def test_only_projects_with_membership(self):
+        User_project.objects.filter(project=self.data.project, user=self.data.member).delete()
+
+        self.assertEqual(self.get_ids(), [])
+
+    def test_cached_per_user(self):
+        self.get_ids()
+        self.client.force_authenticate(self.data.leader)
+
+        # Руководителю задачи не поручены, кэш участника ему не отдается
+        self.assertEqual(self.get_ids(), [])
+
+
+class LabelChoiceFieldTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for task, status, priority in zip(cls.data.tasks, ('Завершено', 'Ожидает', 'Приостановлено'), ('Низкий', 'Высокий', 'Средний')):
+            Task.objects.filter(id=task.id).update(status=status, priority=priority)
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/project/{self.data.project.id}/get-all-tasks/'
+
+    def test_filter_by_label(self):
+        response = self.client.get(self.url, {'status': 'Ожидает,Завершено'})
+
+        self.assertEqual({task['status'] for task in response.json()}, {'Ожидает', 'Завершено'})
+
+    def test_unknown_label(self):
+        response = self.client.get(self.url, {'priority': 'Срочный'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'priority': 'Недопустимые значения: Срочный.'})
+
+    def test_unknown_label_in_inbox(self):
+        self.client.force_authenticate(self.data.member)
+
+        self.assertEqual(self.client.get('/api/tasks/my-inbox/', {'status': 'Готово'}).status_code, 400)
+
+    def test_ordering_by_code(self):
+        statuses = [task['status'] for task in self.client.get(self.url, {'ordering': 'status'}).json()]
+        priorities = [task['priority'] for task in self.client.get(self.url, {'ordering': '-priority'}).json()]
+
+        self.assertEqual(statuses, ['Ожидает', 'Приостановлено', 'Завершено'])
+        self.assertEqual(priorities, ['Высокий', 'Средний', 'Низкий'])
+
+
+class StatusCodesMigrationTests(TransactionTestCase):
+    """
+    Миграция переписывает метки в коды и обратно без потери значений.
+    """
+    serialized_rollback = True
+    labels = [('tasks', '0005_task_list_filter_indexes')]
+    codes = [('tasks', '0006_task_status_priority_codes')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def get_columns(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT t.status, t.priority, s.from_status, s.to_status FROM tasks_task t '
+                           'JOIN tasks_task_status_transition s ON s.task_id = t.id')
+            return [tuple(str(value) if value is not None else None for value in row) for row in cursor.fetchall()]
+
+    def test_round_trip(self):
+        apps = self.migrate(self.labels)
+        # Пользователи и проекты не откатываются, поэтому создаются текущими моделями
+        user = create_user('user')
+        project = Project.objects.create(title='Проект', due_date=now().date(), status='В процессе',
+                                         priority='Средний', created_by=user)
+        task = apps.get_model('tasks', 'Task').objects.create(
+            title='Задача', due_date=now().date(), status='Завершено', priority='Высокий',
+            project_id=project.id, created_by_id=user.id, assigned_to_id=user.id
+        )
+        apps.get_model('tasks', 'Task_status_transition').objects.create(
+            task=task, project_id=project.id, from_status='', to_status='Завершено'
+        )
+
+        self.migrate(self.codes)
+        self.assertEqual(self.get_columns(), [('5', '3', None, '5')])
+
+        self.migrate(self.labels)
+        self.assertEqual(self.get_columns(), [('Завершено', 'Высокий', '', 'Завершено')])
+
+
+class TaskListFilterTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        first, second, third = cls.data.tasks
+        Task.objects.filter(id=first.id).update(due_date=now().date() - timedelta(days=1), title='Отчет за квартал')
+        Task.objects.filter(id=second.id).update(assigned_to=cls.data.leader)
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/project/{self.data.project.id}/get-all-tasks/'
+
+    def get(self, **params):
+        return self.client.get(self.url, params)
+
+    def get_ids(self, **params):
+        response = self.get(**params)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        return [task['id'] for task in response.json()]
+
+    def test_overdue_excludes_closed_and_due_today(self):
+        first, second, third = self.data.tasks
+        Task.objects.filter(id=second.id).update(due_date=now().date())
+
+        self.assertEqual(self.get_ids(overdue='true'), [first.id])
+
+        Task.objects.filter(id=first.id).update(status='Завершено')
+
+        self.assertEqual(self.get_ids(overdue='true'), [])
+
+    def test_archived_excluded(self):
+        first, second, third = self.data.tasks
+        Task.objects.filter(id=first.id).update(archived_at=now())
+
+        self.assertEqual(self.get_ids(), [second.id, third.id])
+        self.assertEqual(self.get_ids(search='квартал'), [])
+        self.assertEqual(self.get_ids(overdue='true'), [])
+
+    def test_blank_search(self):
+        first, second, third = self.data.tasks
+
+        self.assertEqual(self.get_ids(search='  '), [first.id, second.id, third.id])
+        self.assertEqual(self.get_ids(search=' квартал '), [first.id])
+
+    def test_empty_due_range(self):
+        today = now().date()
+
+        self.assertEqual(self.get_ids(due_from=str(today), due_to=str(today - timedelta(days=1))), [])
+
+    def test_ordering_ties_broken_by_id(self):
+        first, second, third = self.data.tasks
+
+        # У всех задач одинаковый статус, поэтому порядок определяется id
+        self.assertEqual(self.get_ids(ordering='-status'), [first.id, second.id, third.id])
+
+    def test_fields(self):
+        response = self.get(fields='title,status')
+
+        self.assertEqual(set(response.json()[0]), {'id', 'title', 'status'})
+
+    def test_invalid_params(self):
+        for params, key in (
+            ({'fields': 'title,secret'}, 'fields'),
+            ({'ordering': 'description'}, 'ordering'),
+            ({'due_from': '2026-13-01'}, 'due_from'),
+            ({'due_to': 'завтра'}, 'due_to'),
+            ({'assigned_to': 'leader'}, 'assigned_to'),
+            ({'status': 'Готово'}, 'status'),
+        ):
+            with self.subTest(params=params):
+                response = self.get(**params)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(key, response.json())
+
+
+class TaskIfMatchTests(ProjectFixtureTestCase):
+    rows = 1
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/task/{self.data.task.id}/change-status/'
+
+    def change_status(self, status, **headers):
+        return self.client.patch(self.url, {'status': status}, format='json', headers=headers)
+
+    def test_etag(self):
+        response = self.client.get(f'/api/task/{self.data.task.id}/get-details/')
+
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_matching_version(self):
+        response = self.change_status('Завершено', **{'If-Match': '"1"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(Task.objects.get(id=self.data.task.id).status, 'Завершено')
+
+    def test_stale_version(self):
+        self.change_status('Приостановлено', **{'If-Match': '"1"'})
+        response = self.change_status('Завершено', **{'If-Match': '"1"'})
+
+        self.assertEqual(response.status_code, 412)
+        self.assertIn('version_conflict', response.json())
+        self.assertEqual(Task.objects.get(id=self.data.task.id).status, 'Приостановлено')
+
+    def test_malformed_header(self):
+        for value in ('latest', 'W/"1"', '"1-deflate"'):
+            with self.subTest(value=value):
+                response = self.change_status('Завершено', **{'If-Match': value})
+
+                self.assertEqual(response.status_code, 412)
+                self.assertEqual(Task.objects.get(id=self.data.task.id).version, 1)
+
+    def test_without_header(self):
+        self.assertEqual(self.change_status('Завершено').status_code, 200)
+
+    def test_unchanged_keeps_version(self):
+        response = self.change_status('В процессе', **{'If-Match': '"1"'})
+
+        self.assertEqual(response['ETag'], '"1"')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0)
+class CompressionTests(ProjectFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/task/{self.data.task.id}/get-details/'
+
+    def test_gzip_with_encoding_etag(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], '"1-gzip"')
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_encoding_etag_accepted_by_if_match(self):
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        response = self.client.patch(f'/api/task/{self.data.task.id}/change-status/', {'status': 'Завершено'},
+                                     format='json', headers={'If-Match': etag})
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(COMPRESSION_MIN_SIZE=1024 * 1024)
+    def test_small_response_not_compressed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_streaming(self):
+        self.client.force_authenticate(self.data.admin)
+        plain = b''.join(self.client.get('/api/export-tasks/').streaming_content)
+        response = self.client.get('/api/export-tasks/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('gzip, deflate'), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0, identity'))
+        self.assertIsNone(choose_encoding(''))
+        self.assertIsNotNone(choose_encoding('*'))
+
+
+class ExportTasksTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    def get_ids(self, params):
+        response = self.client.get('/api/export-tasks/', params)
+
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line)['id'] for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_bad_id(self):
+        for param in ('project_id', 'user_id', 'created_by'):
+            response = self.client.get('/api/export-tasks/', {param: 'abc'})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {param: 'Идентификатор должен быть числом.'})
+
+    def test_empty_id_ignored(self):
+        ids = self.get_ids({'project_id': '', 'user_id': '', 'created_by': ''})
+
+        self.assertEqual(ids, [task.id for task in self.data.tasks])
+
+    def test_archived_and_deleted_excluded(self):
+        _, archived, deleted = self.data.tasks
+        deleted_project = self.data.projects[1]
+        Task.objects.filter(id=archived.id).update(archived_at=now())
+        Task.objects.filter(id=deleted.id).update(project=deleted_project)
+        Project.objects.filter(id=deleted_project.id).update(deleted_at=now())
+
+        self.assertEqual(self.get_ids({}), [self.data.task.id])
+        self.assertEqual(self.get_ids({'project_id': deleted_project.id}), [])
@@ -8,9 +8,16 @@ urlpatterns = [
     path('project/<project_id>/get-my-tasks/', GetMyTasksView.as_view(), name='project-my-tasks'),
     path('project/<project_id>/get-my-tasks-to-others/', GetMyTasksToOthersView.as_view(), name='project-get-my-tasks-to-others'),
     path('project/<project_id>/get-not-private-tasks/', GetNotPrivateTasksView.as_view(), name='project-get-not-private-tasks'),
+    path('project/<project_id>/get-archived-tasks/', GetArchivedTasksView.as_view(), name='project-get-archived-tasks'),
+    path('project/<project_id>/get-overdue-tasks/', GetProjectOverdueTasksView.as_view(), name='project-get-overdue-tasks'),
+    path('get-my-overdue-tasks/', GetMyOverdueTasksView.as_view(), name='get-my-overdue-tasks'),
+    path('tasks/my-inbox/', GetMyInboxView.as_view(), name='get-my-inbox'),
+    path('export-tasks/', ExportTasksView.as_view(), name='export-tasks'),
     path('create-task/', CreateTaskView.as_view(), name='create-task'),
     path('task/<int:pk>/get-details/', GetTaskDetailsView.as_view(), name='get-task-details'),
     path('task/<int:pk>/change-status/', ChangeTaskStatusView.as_view(), name='change-task-status'),
+    path('task/<int:pk>/archive/', ArchiveTaskView.as_view(), name='archive-task'),
+    path('task/<int:pk>/restore/', RestoreTaskView.as_view(), name='restore-task'),
     path('task/<int:pk>/delete/', DeleteTaskView.as_view(), name='delete-task'),
     path('task/<int:pk>/change-info/', ChangeTaskView.as_view(), name='change-task-info'),
 ]
\ No newline at end of file
@@ -0,0 +1,65 @@
+# tasks/utils.py
+
+from django.db.models import OuterRef, Subquery, Count, Exists
+from django.db.models.functions import Coalesce
+from django.utils.timezone import localdate
+from django.core.cache import cache
+from django.conf import settings
+from management.models import User_project
+from .models import Task, Task_status_transition
+from comments.models import Comment
+
+
+def log_status_transition(task, from_status, user):
+    """
+    Функция для записи смены статуса задачи в журнал переходов Task_status_transition.
+    Для новой задачи from_status передается как None.
+    """
+    Task_status_transition.objects.create(
+        task=task,
+        project_id=task.project_id,
+        changed_by=user,
+        from_status=from_status,
+        to_status=task.status
+    )
+
+
+def refresh_comment_counts(task_ids):
+    """
+    Пересчитывает счетчик комментариев comment_count для указанных задач.
+    Используется, когда комментарии удаляются каскадно (например, вместе с аккаунтом автора).
+    """
+    comment_count = Comment.objects.filter(task=OuterRef('pk')).order_by().values('task').annotate(
+        count=Count('id')
+    ).values('count')
+
+    Task.all_objects.filter(id__in=task_ids).update(comment_count=Coalesce(Subquery(comment_count), 0))
+
+
+def get_member_tasks(user_id):
+    """
+    Возвращает задачи, порученные пользователю, в проектах, где он состоит (участие проверяется через EXISTS).
+    Задачи удаленных проектов сюда не попадают: участники удаляются вместе с проектом.
+    """
+    return Task.objects.filter(assigned_to=user_id).filter(
+        Exists(User_project.objects.filter(project=OuterRef('project'), user=user_id))
+    )
+
+
+def get_cached_overdue_tasks(view, scope, tasks):
+    """
+    Возвращает просроченные незакрытые задачи из tasks, сериализованные сериализатором вью view.
+    Список кэшируется на OVERDUE_TASKS_CACHE_SECONDS под ключом tasks:overdue:{scope}:{дата}.
+    """
+    today = localdate()
+    cache_key = f"tasks:overdue:{scope}:{today}"
+    data = cache.get(cache_key)
+
+    if data is None:
+        tasks = tasks.filter(due_date__lt=today).exclude(
+            status__in=settings.STATISTICS_CLOSED_TASK_STATUSES
+        ).select_related('project', 'created_by', 'assigned_to').order_by('due_date', 'id')
+        data = view.get_serializer(tasks, many=True).data
+        cache.set(cache_key, data, settings.OVERDUE_TASKS_CACHE_SECONDS)
+
+    return data
@@ -1,56 +1,339 @@
 # tasks/views.py
 
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
 from management.base_access_views import BaseAdminAccessView, BaseProjectAccessView, BaseCheckCanAssignView 
 from rest_framework.exceptions import ValidationError
-from django.db.models import F
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from django.db.models import F, Q, Count
+from project_management_system_backend.normalization import NormalizedListMixin
+from project_management_system_backend.concurrency import ETagMixin
+from management.pagination import OptionalPageNumberPagination
+from rest_framework.response import Response
+from django.utils.timezone import now, localdate
+from django.core.cache import cache
+from django.conf import settings
+from django.db import transaction
+from .utils import get_member_tasks, get_cached_overdue_tasks
 from .serializers import *
 from users.utils import *
 from .models import *
 
 
-# Вью для получения информации о всех задачах проекта
-class GetAllTasksView(BaseAdminAccessView, ListAPIView):
+# Базовая вью для списков задач с фильтрацией, сортировкой и выбором полей на стороне сервера
+class BaseTaskListView(NormalizedListMixin, ListAPIView):
+    """
+    Параметры запроса:
+    status, priority - списки значений через запятую; due_from, due_to - диапазон срока (ГГГГ-ММ-ДД);
+    assigned_to - id исполнителя; overdue=true - только просроченные незакрытые задачи;
+    search - подстрока в названии; ordering - поле сортировки из ordering_fields (с "-" по убыванию),
+    status и priority сортируются по коду: Ожидает, В процессе, Приостановлено, Отменено, Завершено
+    и Низкий, Средний, Высокий (см. STATUSES и PRIORITIES);
+    fields - поля ответа через запятую. page и page_size включают постраничный вывод.
+    shape=normalized - пользователи и проекты выносятся из строк в таблицы users и projects.
+    """
     serializer_class = GetTaskSerializer
+    pagination_class = OptionalPageNumberPagination
+    ordering_fields = ('id', 'title', 'due_date', 'created_at', 'updated_at', 'status', 'priority')
+    normalized_fields = {
+        'project': ('projects', {'title': 'project_name'}),
+        'created_by': ('users', {
+            'username': 'created_by_username',
+            'first_name': 'created_by_first_name',
+            'last_name': 'created_by_last_name',
+        }),
+        'assigned_to': ('users', {
+            'username': 'assigned_to_username',
+            'first_name': 'assigned_to_first_name',
+            'last_name': 'assigned_to_last_name',
+        }),
+    }
+
+    def get_fields(self):
+        value = self.request.query_params.get('fields')
+
+        if not value:
+            return None
+
+        fields = {item.strip() for item in value.split(',') if item.strip()}
+        unknown = fields - set(GetTaskSerializer.Meta.fields)
+
+        if unknown:
+            raise ValidationError({'fields': f"Неизвестные поля: {', '.join(sorted(unknown))}."})
+        return fields | {'id'}
+
+    def filter_queryset(self, queryset):
+        params = self.request.query_params
+
+        statuses = get_choice_params(self.request, Task, 'status')
+        priorities = get_choice_params(self.request, Task, 'priority')
+
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        if priorities:
+            queryset = queryset.filter(priority__in=priorities)
+
+        due_from = get_date_param(self.request, 'due_from')
+        due_to = get_date_param(self.request, 'due_to')
+
+        if due_from:
+            queryset = queryset.filter(due_date__gte=due_from)
+
+        if due_to:
+            queryset = queryset.filter(due_date__lte=due_to)
+
+        if params.get('assigned_to'):
+            try:
+                queryset = queryset.filter(assigned_to=int(params['assigned_to']))
+            except ValueError:
+                raise ValidationError({'assigned_to': 'Идентификатор исполнителя должен быть числом.'})
+
+        if params.get('overdue') == 'true':
+            queryset = queryset.filter(due_date__lt=localdate()).exclude(status__in=settings.STATISTICS_CLOSED_TASK_STATUSES)
+
+        search = params.get('search', '').strip()
+
+        if search:
+            queryset = queryset.filter(title__icontains=search[:150])
+
+        ordering = params.get('ordering', 'id')
+
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({'ordering': f"Сортировка возможна по полям: {', '.join(self.ordering_fields)}."})
+
+        if ordering.lstrip('-') == 'id':
+            queryset = queryset.order_by(ordering)
+        else:
+            queryset = queryset.order_by(ordering, 'id')
+
+        return self.select_columns(queryset)
+
+    def select_columns(self, queryset):
+        fields = self.get_fields()
+
+        if fields is None:
+            return queryset.select_related('project', 'created_by', 'assigned_to')
+
+        # Из базы выбираются только столбцы (и соединения), нужные для запрошенных полей
+        serializer_fields = GetTaskSerializer().fields
+        columns = {'id'}
+
+        for name in fields:
+            source = serializer_fields[name].source
+            columns.add(source.replace('.', '__'))
+
+            if '.' in source:
+                columns.add(source.split('.')[0])
+
+        relations = [column for column in ('project', 'created_by', 'assigned_to')
+                     if any(item.startswith(f'{column}__') for item in columns)]
+
+        return queryset.select_related(*relations).only(*columns)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_fields()
+
+        return context
+
+
+# Вью для получения информации о всех задачах проекта
+class GetAllTasksView(BaseAdminAccessView, BaseTaskListView):
 
     def get_queryset(self):
         project_id = self.kwargs['project_id']
 
-        return  Task.objects.filter(project=project_id)
+        return Task.objects.filter(project=project_id, project__deleted_at__isnull=True)
+
+
+# Вью для потоковой выгрузки задач (NDJSON/CSV)
+class ExportTasksView(BaseAdminAccessView, GenericAPIView):
+    columns = {
+        'id': 'id',
+        'title': 'title',
+        'project': 'project_id',
+        'project_name': 'project__title',
+        'status': 'status',
+        'priority': 'priority',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'due_date': 'due_date',
+        'created_by': 'created_by_id',
+        'created_by_username': 'created_by__username',
+        'assigned_to': 'assigned_to_id',
+        'assigned_to_username': 'assigned_to__username',
+    }
+
+    def get_queryset(self):
+        tasks = Task.objects.filter(project__deleted_at__isnull=True)
+
+        for param, lookup in (('project_id', 'project'), ('user_id', 'assigned_to'), ('created_by', 'created_by')):
+            value = get_id_param(self.request, param)
+
+            if value is not None:
+                tasks = tasks.filter(**{lookup: value})
+
+        for param in ('status', 'priority'):
+            values = get_choice_params(self.request, Task, param)
+
+            if values:
+                tasks = tasks.filter(**{f'{param}__in': values})
+
+        date_from = get_date_param(self.request, 'date_from')
+        date_to = get_date_param(self.request, 'date_to')
+
+        if date_from:
+            tasks = tasks.filter(created_at__gte=datetime.combine(date_from, time.min, tzinfo=dt_timezone.utc))
+
+        if date_to:
+            tasks = tasks.filter(created_at__lt=datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=dt_timezone.utc))
+
+        return tasks.order_by('id')
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+
+        return stream_export(self.get_queryset(), self.columns, export_format, 'tasks')
 
 
 # Вью для получения информации о "моих" задачах проекта
-class GetMyTasksView(BaseProjectAccessView, ListAPIView):
-    serializer_class = GetTaskSerializer
+class GetMyTasksView(BaseProjectAccessView, BaseTaskListView):
 
     def get_queryset(self):
         project_id = self.kwargs['project_id']
         user_id = self.request.user.id
 
-        return Task.objects.filter(project=project_id, assigned_to=user_id)
+        return Task.objects.filter(project=project_id, project__deleted_at__isnull=True, assigned_to=user_id)
 
 
 # Вью для получения информации о назначенных "мной" задачах другим участникам проекта
-class GetMyTasksToOthersView(BaseCheckCanAssignView, ListAPIView):
-    serializer_class = GetTaskSerializer
+class GetMyTasksToOthersView(BaseCheckCanAssignView, BaseTaskListView):
 
     def get_queryset(self):
         project_id = self.kwargs['project_id']
         user_id = self.request.user.id
         
-        return Task.objects.filter(project=project_id, created_by=user_id).exclude(assigned_to=user_id)
+        return Task.objects.filter(project=project_id, project__deleted_at__isnull=True, created_by=user_id).exclude(assigned_to=user_id)
     
 
 # Вью для получения информации о не личных задачах проекта
-class GetNotPrivateTasksView(BaseProjectAccessView, ListAPIView):
-    serializer_class = GetTaskSerializer
+class GetNotPrivateTasksView(BaseProjectAccessView, BaseTaskListView):
 
     def get_queryset(self):
         project_id = self.kwargs['project_id']
 
-        return Task.objects.filter(project=project_id).exclude(created_by=F('assigned_to_id'))
+        return Task.objects.filter(project=project_id, project__deleted_at__isnull=True).exclude(created_by=F('assigned_to_id'))
     
 
+# Вью для получения архивных задач проекта
+class GetArchivedTasksView(BaseProjectAccessView, ListAPIView):
+    serializer_class = GetTaskSerializer
+    pagination_class = OptionalPageNumberPagination
+
+    def get_queryset(self):
+        project_id = self.kwargs['project_id']
+
+        return Task.all_objects.filter(project=project_id, project__deleted_at__isnull=True, archived_at__isnull=False).select_related(
+            'project', 'created_by', 'assigned_to'
+        ).order_by('-archived_at', 'id')
+
+
+# Вью для получения просроченных задач проекта (кроме личных)
+class GetProjectOverdueTasksView(BaseProjectAccessView, GenericAPIView):
+    serializer_class = GetTaskSerializer
+
+    def get(self, request, *args, **kwargs):
+        project_id = self.kwargs['project_id']
+        tasks = Task.objects.filter(project=project_id, project__deleted_at__isnull=True).exclude(created_by=F('assigned_to_id'))
+
+        return Response(get_cached_overdue_tasks(self, f"project:{project_id}", tasks))
+
+
+# Вью для получения "моих" просроченных задач во всех проектах
+class GetMyOverdueTasksView(GenericAPIView):
+    serializer_class = GetTaskSerializer
+
+    def get(self, request, *args, **kwargs):
+        tasks = get_member_tasks(request.user.id)
+
+        return Response(get_cached_overdue_tasks(self, f"user:{request.user.id}", tasks))
+
+
+# Вью для получения "моих" задач во всех проектах, где пользователь состоит
+class GetMyInboxView(GenericAPIView):
+    """
+    Задачи выбираются одним запросом по индексу (assigned_to, due_date, id) с проверкой участия через EXISTS.
+    Параметры: status, priority (через запятую), due_from, due_to, limit и cursor (значение next_cursor
+    предыдущего ответа). В ответе также количество подходящих задач по каждому проекту.
+    """
+    serializer_class = GetTaskSerializer
+    default_limit = 50
+    max_limit = 200
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Лимит должен быть числом.'})
+
+        return min(max(limit, 1), self.max_limit)
+
+    def get_cursor(self):
+        cursor = self.request.query_params.get('cursor')
+
+        if not cursor:
+            return None
+
+        try:
+            due_date, task_id = cursor.split('_')
+            return date.fromisoformat(due_date), int(task_id)
+        except ValueError:
+            raise ValidationError({'cursor': 'Некорректный курсор.'})
+
+    def get_queryset(self):
+        tasks = get_member_tasks(self.request.user.id)
+
+        for param in ('status', 'priority'):
+            values = get_choice_params(self.request, Task, param)
+
+            if values:
+                tasks = tasks.filter(**{f'{param}__in': values})
+
+        due_from = get_date_param(self.request, 'due_from')
+        due_to = get_date_param(self.request, 'due_to')
+
+        if due_from:
+            tasks = tasks.filter(due_date__gte=due_from)
+
+        if due_to:
+            tasks = tasks.filter(due_date__lte=due_to)
+
+        return tasks
+
+    def get(self, request, *args, **kwargs):
+        tasks = self.get_queryset()
+        limit = self.get_limit()
+        cursor = self.get_cursor()
+
+        projects = tasks.values('project', 'project__title').annotate(count=Count('id')).order_by('project')
+
+        # Продолжение выдачи после последней полученной задачи (keyset по сроку и id), без OFFSET
+        if cursor:
+            tasks = tasks.filter(Q(due_date__gt=cursor[0]) | Q(due_date=cursor[0], id__gt=cursor[1]))
+
+        page = list(tasks.select_related('project', 'created_by', 'assigned_to').order_by('due_date', 'id')[:limit + 1])
+        next_cursor = f"{page[limit - 1].due_date.isoformat()}_{page[limit - 1].id}" if len(page) > limit else None
+
+        return Response({
+            'results': self.get_serializer(page[:limit], many=True).data,
+            'next_cursor': next_cursor,
+            'projects': [
+                {'project_id': row['project'], 'project_title': row['project__title'], 'count': row['count']}
+                for row in projects
+            ],
+        })
+
+
 # Вью для создания задачи
 class CreateTaskView(BaseProjectAccessView, CreateAPIView):
     queryset = Task.objects.all()
@@ -58,26 +341,26 @@ class CreateTaskView(BaseProjectAccessView, CreateAPIView):
 
 
 # Вью для получения полной информации о задаче
-class GetTaskDetailsView(BaseProjectAccessView, RetrieveAPIView):
+class GetTaskDetailsView(ETagMixin, BaseProjectAccessView, RetrieveAPIView):
     serializer_class = GetTaskSerializer
-    queryset = Task.objects.all()
+    queryset = Task.objects.filter(project__deleted_at__isnull=True).select_related('project', 'created_by', 'assigned_to')
 
 
 # Вью для изменения статуса задачи
-class ChangeTaskStatusView(BaseProjectAccessView, UpdateAPIView):
-    queryset = Task.objects.all()
+class ChangeTaskStatusView(ETagMixin, BaseProjectAccessView, UpdateAPIView):
+    queryset = Task.objects.filter(project__deleted_at__isnull=True)
     serializer_class = ChangeTaskStatusSerializer
 
 
 # Вью для изменения информации о задаче
-class ChangeTaskView(UpdateAPIView):
-    queryset = Task.objects.all()
+class ChangeTaskView(ETagMixin, UpdateAPIView):
+    queryset = Task.objects.filter(project__deleted_at__isnull=True)
     serializer_class = ChangeTaskSerializer
 
 
 # Вью для удаления задачи
 class DeleteTaskView(DestroyAPIView):
-    queryset = Task.objects.all()
+    queryset = Task.objects.filter(project__deleted_at__isnull=True)
 
     def perform_destroy(self, instance):
         user = self.request.user
@@ -91,19 +374,71 @@ class DeleteTaskView(DestroyAPIView):
             )
             raise ValidationError({'no_rights': 'У Вас отсутствуют права для удаления этой задачи.'})
         
+        task_id = instance.id
         task_title = instance.title
         project_title = instance.project.title
         reciever = instance.assigned_to
 
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
 
-        log_user_action(
-            user=user, 
-            action_name="Задачи", 
-            description=f"Пользователь удалил задачу «{task_title}»."
-        )
-        send_mail_notification(
-            users=[reciever], 
-            header="Удаление задачи", 
-            text=f"Задача «{task_title}» проекта «{project_title}» была удалена."
+            log_user_action(
+                user=user, 
+                action_name="Задачи", 
+                description=f"Пользователь удалил задачу «{task_title}»."
+            )
+            send_mail_notification(
+                users=[reciever], 
+                header="Удаление задачи", 
+                text=f"Задача «{task_title}» проекта «{project_title}» была удалена.",
+                idempotency_key=f"task-deleted:{task_id}"
+            )
+
+
+# Базовая вью для переноса задачи в архив и восстановления из него
+class BaseTaskArchiveView(GenericAPIView):
+    archive = True
+
+    def get_queryset(self):
+        return Task.all_objects.filter(project__deleted_at__isnull=True, archived_at__isnull=self.archive).select_related(
+            'project', 'created_by', 'assigned_to'
         )
+
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        user = request.user
+        action = "перенос в архив" if self.archive else "восстановление из архива"
+
+        if user not in (task.created_by, task.project.created_by):
+            log_user_action(
+                user=user, 
+                action_name="Задачи", 
+                description=f"Пользователь послал запрос на {action} задачи «{task.title}»",
+                status='Ошибка прав доступа'
+            )
+            raise ValidationError({'no_rights': 'У Вас отсутствуют права для изменения этой задачи.'})
+
+        if not self.archive and task.project.archived_at:
+            raise ValidationError({'process_error': 'Проект задачи находится в архиве, сначала восстановите проект.'})
+
+        with transaction.atomic():
+            task.archived_at = now() if self.archive else None
+            task.save(update_fields=['archived_at'])
+
+            log_user_action(
+                user=user, 
+                action_name="Задачи", 
+                description=f"Пользователь выполнил {action} задачи «{task.title}»"
+            )
+
+        return Response(GetTaskSerializer(task).data)
+
+
+# Вью для переноса задачи в архив
+class ArchiveTaskView(BaseTaskArchiveView):
+    archive = True
+
+
+# Вью для восстановления задачи из архива
+class RestoreTaskView(BaseTaskArchiveView):
+    archive = False
@@ -0,0 +1,58 @@
+# users/management/commands/archive_user_actions.py
+
+from django.core.management.base import BaseCommand, CommandError
+from users.partitions import *
+import json
+
+
+class Command(BaseCommand):
+    help = (
+        "Архивирует действия пользователей старше срока хранения в сжатые JSONL-файлы "
+        "и удаляет их из базы. Также позволяет прочитать архив или восстановить его в базу."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help="Срок хранения в днях (по умолчанию USER_ACTIONS_RETENTION_DAYS).")
+        parser.add_argument('--archive-dir', default=None,
+                            help="Каталог для архивов (по умолчанию USER_ACTIONS_ARCHIVE_DIR).")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Только показать месяцы, которые будут заархивированы.")
+        parser.add_argument('--read', metavar='FILE',
+                            help="Вывести записи архива построчно в формате JSONL.")
+        parser.add_argument('--user', type=int, default=None,
+                            help="Фильтр по ID пользователя при чтении архива.")
+        parser.add_argument('--restore', metavar='FILE',
+                            help="Восстановить записи архива в базу.")
+
+    def handle(self, *args, **options):
+        if options['read']:
+            return self.read_archive(options['read'], options['user'])
+
+        if options['restore']:
+            restored = restore_archive(options['restore'], batch_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f"Восстановлено записей: {restored}"))
+            return
+
+        months = get_expired_months(options['retention_days'])
+
+        if not months:
+            self.stdout.write("Нет записей старше срока хранения.")
+            return
+
+        for month in months:
+            if options['dry_run']:
+                self.stdout.write(f"Будет заархивирован месяц {month:%Y-%m}")
+                continue
+
+            path, count = archive_month(month, options['archive_dir'], options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f"{month:%Y-%m}: заархивировано записей {count} в {path}"))
+
+    def read_archive(self, path, user_id):
+        try:
+            for row in iter_archive(path):
+                if user_id is None or row['user_id'] == user_id:
+                    self.stdout.write(json.dumps(row, ensure_ascii=False))
+        except FileNotFoundError:
+            raise CommandError(f"Архив {path} не найден.")
@@ -0,0 +1,45 @@
+# users/management/commands/benchmark_compression.py
+
+from project_management_system_backend.benchmarks import get_client, measure
+from project_management_system_backend.middleware import COMPRESSORS
+from django.core.management.base import BaseCommand, CommandError
+from .run_benchmarks import Command as RunBenchmarksCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает объем передаваемых данных и время ответа списков задач (get-not-private-tasks) "
+        "и пользователей (get-all-users-info) без сжатия и с каждым доступным алгоритмом сжатия "
+        "на данных, созданных командой generate_load_data."
+    )
+    endpoints = ('get-not-private-tasks', 'get-all-users-info')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='benchmark-password')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        scenarios = RunBenchmarksCommand().get_scenarios(options['prefix'], options['password'])
+        lines = [f"{'Эндпоинт':<22}  {'Сжатие':<8}  {'Размер, КБ':>10}  {'Экономия':>8}  {'p50, мс':>9}  {'p95, мс':>9}"]
+
+        for name in self.endpoints:
+            user, method, url, data, rollback, expected_status = scenarios[name]
+            original = None
+
+            for encoding in ('identity', *COMPRESSORS):
+                try:
+                    result = measure(get_client(user), method, url, options['repeat'], data=data,
+                                     expected_status=expected_status, headers={'HTTP_ACCEPT_ENCODING': encoding})
+                except RuntimeError as error:
+                    raise CommandError(f"{name}: {error}")
+
+                original = original or result['bytes']
+                saved = 100 * (1 - result['bytes'] / original) if original else 0
+
+                lines.append(
+                    f"{name:<22}  {encoding:<8}  {result['bytes'] / 1024:>10.1f}  {saved:>7.1f}%  "
+                    f"{result['p50']:>9.1f}  {result['p95']:>9.1f}"
+                )
+
+        self.stdout.write('\n'.join(lines))
@@ -0,0 +1,148 @@
+# users/management/commands/benchmark_startup.py
+
+from django.core.management.base import BaseCommand, CommandError
+from project_statistics.utils import percentile
+from collections import Counter
+from django.conf import settings
+from time import perf_counter
+import subprocess
+import json
+import sys
+import os
+
+# Холодный старт воркера: загрузка WSGI-приложения (настройки, приложения, middleware) и всех URL со вью
+STARTUP_CODE = (
+    "from project_management_system_backend.wsgi import application\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+
+def parse_importtime(output):
+    """
+    Разбирает вывод python -X importtime. Возвращает общее время импортов (мкс), число модулей
+    и собственное время импорта, сгруппированное по пакетам верхнего уровня.
+    """
+    total = modules = 0
+    packages = Counter()
+
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+
+        if not self_time.strip().isdigit():
+            continue
+
+        modules += 1
+        packages[name.strip().split('.')[0]] += int(self_time)
+
+        # Модули верхнего уровня выводятся без отступа, их суммарное время - время всех импортов
+        if name.startswith(' ') and not name.startswith('  '):
+            total += int(cumulative)
+
+    return total, modules, packages
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время холодного старта воркера (загрузка WSGI-приложения и URL) в отдельных процессах "
+        "с python -X importtime для указанных профилей настроек и выводит самые дорогие пакеты. "
+        "С параметром --baseline сравнивает результат с сохраненным и завершается с ошибкой при регрессии."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-modules', nargs='*', default=[
+            'project_management_system_backend.settings',
+            'project_management_system_backend.settings_production',
+        ])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10, help="Сколько самых дорогих пакетов выводить.")
+        parser.add_argument('--json-output', metavar='FILE', help="Сохранить результаты в JSON.")
+        parser.add_argument('--baseline', metavar='FILE', help="JSON с результатами предыдущего запуска.")
+        parser.add_argument('--max-regression', type=float, default=20.0,
+                            help="Допустимый рост медианного времени старта относительно baseline, в процентах.")
+
+    def handle(self, *args, **options):
+        results = {}
+
+        for settings_module in options['settings_modules']:
+            results[settings_module] = self.measure(settings_module, options['repeat'])
+
+            self.stdout.write(self.format_result(settings_module, results[settings_module], options['top']))
+
+        if options['json_output']:
+            with open(options['json_output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, ensure_ascii=False, indent=2)
+
+        if options['baseline']:
+            self.check_regressions(results, options['baseline'], options['max_regression'])
+
+    def measure(self, settings_module, repeat):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+        env.setdefault('DJANGO_SECRET_KEY', 'startup-benchmark')
+        timings = []
+        imports = []
+
+        for _ in range(repeat):
+            start = perf_counter()
+            process = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+            )
+            timings.append((perf_counter() - start) * 1000)
+
+            if process.returncode:
+                raise CommandError(f"{settings_module}: запуск завершился с ошибкой:\n{process.stderr[-2000:]}")
+
+            imports.append(parse_importtime(process.stderr))
+
+        timings.sort()
+        # Разбивка по пакетам берется из запуска с медианным временем импортов
+        total, modules, packages = sorted(imports, key=lambda item: item[0])[len(imports) // 2]
+
+        return {
+            'p50': percentile(timings, 50),
+            'max': timings[-1],
+            'imports_ms': total / 1000,
+            'modules': modules,
+            'packages_ms': {package: value / 1000 for package, value in packages.most_common()},
+        }
+
+    def format_result(self, settings_module, result, top):
+        lines = [
+            f"{settings_module}: старт p50 {result['p50']:.1f} мс (макс. {result['max']:.1f} мс), "
+            f"импорты {result['imports_ms']:.1f} мс, модулей {result['modules']}",
+        ]
+
+        for package, value in list(result['packages_ms'].items())[:top]:
+            lines.append(f"    {package:<40}  {value:>8.1f} мс")
+
+        return '\n'.join(lines)
+
+    def check_regressions(self, results, baseline_path, max_regression):
+        try:
+            with open(baseline_path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except FileNotFoundError:
+            raise CommandError(f"Файл {baseline_path} не найден.")
+
+        regressions = []
+
+        for name, result in results.items():
+            previous = baseline.get(name)
+
+            if previous is None:
+                continue
+
+            if result['p50'] > previous['p50'] * (1 + max_regression / 100):
+                regressions.append(f"{name}: старт {previous['p50']:.1f} мс -> {result['p50']:.1f} мс")
+
+            if result['modules'] > previous['modules']:
+                regressions.append(f"{name}: модулей {previous['modules']} -> {result['modules']}")
+
+        if regressions:
+            raise CommandError("Обнаружены регрессии:\n" + '\n'.join(regressions))
+
+        self.stdout.write(self.style.SUCCESS("Регрессий не обнаружено."))
@@ -0,0 +1,25 @@
+# users/management/commands/create_user_action_partitions.py
+
+from django.core.management.base import BaseCommand
+from users.partitions import create_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Заранее создает месячные секции таблицы действий пользователей (только PostgreSQL). "
+        "Рекомендуется запускать по расписанию раз в месяц."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=None,
+                            help="На сколько месяцев вперед создавать секции (по умолчанию USER_ACTIONS_PARTITIONS_AHEAD).")
+
+    def handle(self, *args, **options):
+        names = create_partitions(options['months_ahead'])
+
+        if not names:
+            self.stdout.write("Таблица действий пользователей не секционирована, секции не созданы.")
+            return
+
+        for name in names:
+            self.stdout.write(self.style.SUCCESS(f"Секция {name} готова"))
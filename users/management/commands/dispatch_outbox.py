@@ -0,0 +1,31 @@
+# users/management/commands/dispatch_outbox.py
+
+from django.core.management.base import BaseCommand
+from users.utils import dispatch_outbox_events
+from time import sleep
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет события из очереди Outbox_event (письма). С параметром --loop работает постоянно "
+        "и опрашивает очередь с интервалом --interval секунд."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument('--interval', type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = dispatch_outbox_events(options['batch_size'])
+
+            if processed:
+                self.stdout.write(f"Обработано событий: {processed}")
+
+            if not options['loop']:
+                break
+
+            # Пока очередь не пуста, следующая порция берется сразу
+            if processed < options['batch_size']:
+                sleep(options['interval'])
@@ -0,0 +1,209 @@
+# users/management/commands/generate_load_data.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from management.models import Group, User_project, Project_request
+from django.utils.timezone import now
+from projects.models import Project
+from comments.models import Comment
+from django.db import transaction
+from datetime import timedelta
+from tasks.models import Task
+from users.models import *
+import random
+
+TASK_STATUSES = ['Ожидает', 'В процессе', 'Приостановлено', 'Отменено', 'Завершено']
+TASK_STATUS_WEIGHTS = [30, 35, 10, 5, 20]
+PRIORITIES = ['Низкий', 'Средний', 'Высокий']
+PROJECT_STATUSES = ['В процессе', 'Приостановлено', 'Завершено']
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетические данные для нагрузочного тестирования: пользователей, проекты, участников, "
+        "задачи, комментарии, заявки и действия пользователей. Размеры проектов распределены по закону Ципфа "
+        "с показателем --skew (0 - равномерно). Результат воспроизводим при одинаковом --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=50)
+        parser.add_argument('--members', type=int, default=20, help="Среднее число участников проекта.")
+        parser.add_argument('--tasks', type=int, default=100, help="Среднее число задач проекта.")
+        parser.add_argument('--comments', type=int, default=3, help="Среднее число комментариев к задаче.")
+        parser.add_argument('--requests', type=int, default=5, help="Среднее число заявок в проект.")
+        parser.add_argument('--actions', type=int, default=20, help="Число действий на пользователя.")
+        parser.add_argument('--skew', type=float, default=1.0)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='load', help="Префикс логинов, позволяет генерировать несколько наборов.")
+        parser.add_argument('--password', default='benchmark-password')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = options['prefix']
+
+        groups = {group.name: group for group in Group.objects.all()}
+        action_types = list(Action_type.objects.all())
+
+        if len(groups) < 3 or not action_types:
+            raise CommandError("Не найдены группы или типы действий, сначала выполните migrate.")
+
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f"Данные с префиксом «{prefix}» уже существуют, укажите другой --prefix.")
+
+        with transaction.atomic():
+            users = self.create_users(prefix, options['users'], make_password(options['password']))
+            projects = self.create_projects(users, options['projects'])
+            sizes = self.get_sizes(len(projects), options['skew'])
+            counts = {'users': len(users), 'projects': len(projects), 'memberships': 0,
+                      'tasks': 0, 'comments': 0, 'requests': 0, 'actions': 0}
+
+            for project, share in zip(projects, sizes):
+                members = self.create_memberships(project, users, groups, max(1, round(options['members'] * share)))
+                counts['memberships'] += len(members)
+                counts['requests'] += self.create_requests(project, users, members, round(options['requests'] * share))
+                tasks, comments = self.create_tasks(project, members, round(options['tasks'] * share), options['comments'])
+                counts['tasks'] += tasks
+                counts['comments'] += comments
+
+            counts['actions'] = self.create_actions(users, action_types, options['actions'])
+
+        self.stdout.write(self.style.SUCCESS(
+            "Создано: " + ", ".join(f"{name} - {count}" for name, count in counts.items())
+        ))
+
+    def get_sizes(self, count, skew):
+        """
+        Возвращает относительные размеры проектов (в среднем 1.0) по закону Ципфа.
+        """
+        weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+        total = sum(weights)
+        return [weight * count / total for weight in weights]
+
+    def create_users(self, prefix, count, password):
+        leaders = max(1, count // 20)
+        users = [
+            User(
+                username=f'{prefix}_user_{i}',
+                email=f'{prefix}_user_{i}@example.com',
+                first_name=f'Имя{i}',
+                last_name=f'Фамилия{i}',
+                password=password,
+                is_project_leader=i < leaders,
+            )
+            for i in range(count)
+        ]
+        users.append(User(
+            username=f'{prefix}_admin',
+            email=f'{prefix}_admin@example.com',
+            first_name='Администратор',
+            last_name='Нагрузочный',
+            password=password,
+            is_admin=True,
+        ))
+        users = User.objects.bulk_create(users, batch_size=self.batch_size)
+
+        return users[:-1]
+
+    def create_projects(self, users, count):
+        leaders = [user for user in users if user.is_project_leader]
+        today = now().date()
+        projects = [
+            Project(
+                title=f'Проект {i}',
+                description=f'Синтетический проект {i}',
+                due_date=today + timedelta(days=self.rng.randint(30, 365)),
+                status=self.rng.choice(PROJECT_STATUSES),
+                priority=self.rng.choice(PRIORITIES),
+                created_by=self.rng.choice(leaders),
+            )
+            for i in range(count)
+        ]
+        return Project.objects.bulk_create(projects, batch_size=self.batch_size)
+
+    def create_memberships(self, project, users, groups, count):
+        candidates = [user for user in users if user.id != project.created_by_id]
+        members = self.rng.sample(candidates, min(count, len(candidates)))
+        memberships = [User_project(project=project, user=project.created_by, user_group=groups['Руководитель проекта'])]
+
+        for member in members:
+            group = groups['Менеджер'] if self.rng.random() < 0.2 else groups['Исполнитель']
+            memberships.append(User_project(project=project, user=member, user_group=group))
+
+        User_project.objects.bulk_create(memberships, batch_size=self.batch_size)
+
+        return [project.created_by] + members
+
+    def create_requests(self, project, users, members, count):
+        member_ids = {member.id for member in members}
+        candidates = [user for user in self.rng.sample(users, min(len(users), count * 2)) if user.id not in member_ids]
+        requests = [
+            Project_request(project=project, created_by=user, status=self.rng.choice(['Ожидает', 'Отклонена']))
+            for user in candidates[:count]
+        ]
+        Project_request.objects.bulk_create(requests, batch_size=self.batch_size)
+
+        return len(requests)
+
+    def create_tasks(self, project, members, count, comments_per_task):
+        today = now().date()
+        created_tasks = 0
+        created_comments = 0
+
+        for start in range(0, count, self.batch_size):
+            tasks = []
+
+            for i in range(start, min(count, start + self.batch_size)):
+                created_by = self.rng.choice(members)
+                assigned_to = created_by if self.rng.random() < 0.1 else self.rng.choice(members)
+                tasks.append(Task(
+                    title=f'Задача {i} проекта {project.id}',
+                    comment_count=self.rng.randint(0, comments_per_task * 2),
+                    description='Синтетическая задача',
+                    due_date=today + timedelta(days=self.rng.randint(-30, 90)),
+                    status=self.rng.choices(TASK_STATUSES, TASK_STATUS_WEIGHTS)[0],
+                    priority=self.rng.choice(PRIORITIES),
+                    project=project,
+                    created_by=created_by,
+                    assigned_to=assigned_to,
+                ))
+
+            tasks = Task.objects.bulk_create(tasks)
+            created_tasks += len(tasks)
+
+            comments = [
+                Comment(
+                    task=task,
+                    created_by=self.rng.choice([task.created_by, task.assigned_to]),
+                    text=f'Комментарий {j} к задаче {task.id}',
+                )
+                for task in tasks
+                for j in range(task.comment_count)
+            ]
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            created_comments += len(comments)
+
+        return created_tasks, created_comments
+
+    def create_actions(self, users, action_types, per_user):
+        created = 0
+        step = max(1, self.batch_size // max(1, per_user))
+
+        for start in range(0, len(users), step):
+            batch = users[start:start + step]
+            actions = [
+                User_action(
+                    type=self.rng.choice(action_types),
+                    user=user,
+                    description='Синтетическое действие пользователя',
+                    status=self.rng.choices(['Успешно', 'Ошибка прав доступа'], [95, 5])[0],
+                )
+                for user in batch
+                for _ in range(per_user)
+            ]
+            User_action.objects.bulk_create(actions)
+            created += len(actions)
+
+        return created
@@ -0,0 +1,127 @@
+# users/management/commands/run_benchmarks.py
+
+from project_management_system_backend.benchmarks import get_client, measure, format_report
+from django.core.management.base import BaseCommand, CommandError
+from management.models import User_project
+from django.test.utils import override_settings
+from django.db.models import Count, F
+from projects.models import Project
+from tasks.models import Task
+from users.models import *
+import json
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет p50/p95/p99 времени ответа и количество SQL-запросов ключевых эндпоинтов "
+        "на данных, созданных командой generate_load_data. С параметром --baseline сравнивает результат "
+        "с сохраненным и завершается с ошибкой при регрессии (для запуска в CI)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='benchmark-password')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--only', nargs='*', help="Замерить только указанные эндпоинты.")
+        parser.add_argument('--json-output', metavar='FILE', help="Сохранить результаты в JSON.")
+        parser.add_argument('--baseline', metavar='FILE', help="JSON с результатами предыдущего запуска.")
+        parser.add_argument('--max-regression', type=float, default=25.0,
+                            help="Допустимый рост p95 относительно baseline, в процентах.")
+
+    def handle(self, *args, **options):
+        scenarios = self.get_scenarios(options['prefix'], options['password'])
+
+        if options['only']:
+            scenarios = {name: scenario for name, scenario in scenarios.items() if name in options['only']}
+
+        results = {}
+
+        with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            for name, (user, method, url, data, rollback, expected_status) in scenarios.items():
+                try:
+                    results[name] = measure(get_client(user), method, url, options['repeat'],
+                                            data=data, rollback=rollback, expected_status=expected_status)
+                except RuntimeError as error:
+                    raise CommandError(f"{name}: {error}")
+
+        self.stdout.write(format_report(results))
+
+        if options['json_output']:
+            with open(options['json_output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, ensure_ascii=False, indent=2)
+
+        if options['baseline']:
+            self.check_regressions(results, options['baseline'], options['max_regression'])
+
+    def get_scenarios(self, prefix, password):
+        """
+        Выбирает самый крупный сгенерированный проект и пользователей с разными ролями в нем.
+        """
+        try:
+            admin = User.objects.get(username=f'{prefix}_admin')
+        except User.DoesNotExist:
+            raise CommandError(f"Данные с префиксом «{prefix}» не найдены, сначала выполните generate_load_data.")
+
+        project = Project.objects.filter(created_by__username__startswith=f'{prefix}_').annotate(
+            members=Count('project_user')
+        ).order_by('-members').select_related('created_by').first()
+
+        if project is None:
+            raise CommandError("Не найдено ни одного сгенерированного проекта.")
+
+        leader = project.created_by
+        executors = User_project.objects.filter(project=project, user_group__name='Исполнитель').select_related('user')
+        member = executors.first().user
+        removable = executors.last().user
+        task = Task.objects.filter(project=project).exclude(created_by=F('assigned_to')).annotate(
+            comments=Count('task_comments')
+        ).order_by('-comments').first()
+        action = User_action.objects.filter(user=member).first()
+
+        if task is None or action is None or member == removable:
+            raise CommandError("В сгенерированном проекте недостаточно данных для замеров.")
+
+        p = project.id
+
+        # Имя: (пользователь, метод, адрес, тело запроса, откатывать изменения, ожидаемые статусы)
+        return {
+            'login': (None, 'post', '/api/login/', {'username': member.username, 'password': password}, True, (200,)),
+            'get-all-tasks': (admin, 'get', f'/api/project/{p}/get-all-tasks/', None, False, (200,)),
+            'get-not-private-tasks': (member, 'get', f'/api/project/{p}/get-not-private-tasks/', None, False, (200,)),
+            'get-not-private-tasks-normalized': (member, 'get', f'/api/project/{p}/get-not-private-tasks/?shape=normalized', None, False, (200,)),
+            'get-my-tasks': (member, 'get', f'/api/project/{p}/get-my-tasks/', None, False, (200,)),
+            'get-comments': (leader, 'get', f'/api/task/{task.id}/get-comments/', None, False, (200,)),
+            'status-distribution': (leader, 'get', f'/api/project/{p}/statistics/status-distribution/', None, False, (200,)),
+            'overloaded-users': (leader, 'get', f'/api/project/{p}/statistics/overloaded-users/', None, False, (200,)),
+            'get-users': (leader, 'get', f'/api/project/{p}/get-users/', None, False, (200,)),
+            'get-none-users': (leader, 'get', f'/api/project/{p}/get-none-users/', None, False, (200,)),
+            'get-all-users-info': (admin, 'get', '/api/get-all-users-info/', None, False, (200,)),
+            'get-actions': (admin, 'get', f'/api/get-actions/user/{member.id}/type/{action.type_id}/', None, False, (200,)),
+            'remove-member': (leader, 'delete', f'/api/project/{p}/remove-member/{removable.id}/', None, True, (204,)),
+        }
+
+    def check_regressions(self, results, baseline_path, max_regression):
+        try:
+            with open(baseline_path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except FileNotFoundError:
+            raise CommandError(f"Файл {baseline_path} не найден.")
+
+        regressions = []
+
+        for name, result in results.items():
+            previous = baseline.get(name)
+
+            if previous is None:
+                continue
+
+            if result['queries'] > previous['queries']:
+                regressions.append(f"{name}: SQL-запросов {previous['queries']} -> {result['queries']}")
+
+            if result['p95'] > previous['p95'] * (1 + max_regression / 100):
+                regressions.append(f"{name}: p95 {previous['p95']:.1f} мс -> {result['p95']:.1f} мс")
+
+        if regressions:
+            raise CommandError("Обнаружены регрессии:\n" + '\n'.join(regressions))
+
+        self.stdout.write(self.style.SUCCESS("Регрессий не обнаружено."))
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from datetime import datetime, timezone
+from django.db import migrations, models
+
+TABLE = 'users_user_action'
+PARTITIONS_AHEAD = 3
+
+
+def next_month(value):
+    if value.month == 12:
+        return datetime(value.year + 1, 1, 1, tzinfo=timezone.utc)
+    return datetime(value.year, value.month + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_user_actions(apps, schema_editor):
+    """
+    Переводит таблицу действий пользователей на помесячное секционирование (только PostgreSQL).
+    Первичный ключ секционированной таблицы включает ключ секционирования (id, date_of_issue).
+    """
+    connection = schema_editor.connection
+
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f'{TABLE}_pkey']
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(f'SELECT min(date_of_issue) FROM {TABLE}')
+        oldest = cursor.fetchone()[0] or datetime.now(timezone.utc)
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_old')
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_part_id_seq')
+        cursor.execute(f"""
+            CREATE TABLE {TABLE} (
+                id bigint NOT NULL DEFAULT nextval('{TABLE}_part_id_seq'),
+                date_of_issue timestamp with time zone NOT NULL,
+                description text NOT NULL,
+                status varchar(20) NOT NULL,
+                type_id bigint NOT NULL REFERENCES users_action_type (id) DEFERRABLE INITIALLY DEFERRED,
+                user_id bigint NOT NULL REFERENCES users_user (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (id, date_of_issue)
+            ) PARTITION BY RANGE (date_of_issue)
+        """)
+        cursor.execute(f'ALTER SEQUENCE {TABLE}_part_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+        month = datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc)
+        now = datetime.now(timezone.utc)
+        last = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+
+        for _ in range(PARTITIONS_AHEAD):
+            last = next_month(last)
+
+        while month <= last:
+            cursor.execute(
+                f'CREATE TABLE {TABLE}_y{month.year}m{month.month:02d} PARTITION OF {TABLE} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [month, next_month(month)]
+            )
+            month = next_month(month)
+
+        cursor.execute(f"""
+            INSERT INTO {TABLE} (id, date_of_issue, description, status, type_id, user_id)
+            SELECT id, date_of_issue, description, status, type_id, user_id FROM {TABLE}_old
+        """)
+        cursor.execute(f"SELECT setval('{TABLE}_part_id_seq', COALESCE((SELECT max(id) FROM {TABLE}), 0) + 1, false)")
+        cursor.execute(f'DROP TABLE {TABLE}_old')
+
+        # Индексы внешних ключей, созданные Django, пересоздаются на новой таблице под теми же именами
+        for indexdef in indexes:
+            cursor.execute(indexdef)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_user_actions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user_action',
+            index=models.Index(fields=['user', 'type', '-date_of_issue'], name='user_action_user_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user_action',
+            index=models.Index(fields=['date_of_issue'], name='user_action_date_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+from django.db import migrations
+
+SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def create_prefix_indexes(apps, schema_editor):
+    """
+    Индексы для поиска по началу строки без учета регистра (istartswith) в PostgreSQL.
+    Django строит условие UPPER(поле::text) LIKE UPPER(...), поэтому индекс строится по тому же выражению
+    с классом операторов text_pattern_ops.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS user_{field}_prefix_idx '
+            f'ON users_user (UPPER({field}::text) text_pattern_ops)'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS user_{field}_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outbox_event'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+ACTION_STATUSES = {
+    1: 'Успешно',
+    2: 'Ошибка прав доступа',
+    3: 'Ошибка прав доступа к проекту',
+    4: 'Ошибка прав назначения задач',
+    5: 'Отказано в доступе',
+}
+FIELDS = {'status': ACTION_STATUSES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбца
+    atomic = False
+
+    dependencies = [
+        ('users', '0004_user_search_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('users', 'user_action', FIELDS),
+            convert_labels('users', 'user_action', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='user_action',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(labels=ACTION_STATUSES),
+        ),
+    ]
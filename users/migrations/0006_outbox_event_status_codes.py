@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import project_management_system_backend.fields
+from project_management_system_backend.fields import convert_labels
+from django.db import migrations
+
+OUTBOX_STATUSES = {1: 'Ожидает', 2: 'Отправлено', 3: 'Ошибка'}
+FIELDS = {'status': OUTBOX_STATUSES}
+
+
+class Migration(migrations.Migration):
+    # Метки переписываются в коды отдельной транзакцией до смены типа столбца
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_user_action_status_codes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            convert_labels('users', 'outbox_event', FIELDS),
+            convert_labels('users', 'outbox_event', FIELDS, to_codes=False)
+        ),
+        migrations.AlterField(
+            model_name='outbox_event',
+            name='status',
+            field=project_management_system_backend.fields.LabelChoiceField(default='Ожидает', labels=OUTBOX_STATUSES),
+        ),
+    ]
@@ -1,7 +1,9 @@
 # users/models.py
 
+from project_management_system_backend.fields import LabelChoiceField
 from django.db import models
 from django.contrib.auth.hashers import make_password, check_password
+from django.utils.timezone import now
 
 class User(models.Model):
     username = models.CharField(max_length=150, unique=True)
@@ -49,6 +51,16 @@ class Action_type(models.Model):
         return self.name
 
 
+# Коды статусов хранятся в базе, метки отдаются в API (см. LabelChoiceField)
+ACTION_STATUSES = {
+    1: 'Успешно',
+    2: 'Ошибка прав доступа',
+    3: 'Ошибка прав доступа к проекту',
+    4: 'Ошибка прав назначения задач',
+    5: 'Отказано в доступе',
+}
+
+
 class User_action(models.Model):
     type = models.ForeignKey(
         Action_type, 
@@ -62,7 +74,41 @@ class User_action(models.Model):
     )
     date_of_issue = models.DateTimeField(auto_now_add=True)
     description = models.TextField()
-    status = models.CharField(max_length=20)
+    status = LabelChoiceField(labels=ACTION_STATUSES)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'type', '-date_of_issue'], name='user_action_user_type_date_idx'),
+            models.Index(fields=['date_of_issue'], name='user_action_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Действие типа '{self.type.name}' со статусом '{self.status}' пользователя {self.user.username}."
+
+
+# Статусы событий очереди (коды хранятся в базе)
+OUTBOX_STATUSES = {
+    1: 'Ожидает',
+    2: 'Отправлено',
+    3: 'Ошибка',
+}
+
+
+class Outbox_event(models.Model):
+    channel = models.CharField(max_length=20)
+    payload = models.JSONField()
+    idempotency_key = models.CharField(max_length=150, unique=True)
+    status = LabelChoiceField(labels=OUTBOX_STATUSES, default='Ожидает')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_pending_idx'),
+        ]
 
     def __str__(self):
-        return f"Действие типа '{self.type.name}' со статусом '{self.status}' пользователя {self.user.username}."
\ No newline at end of file
+        return f"Событие '{self.channel}' ({self.idempotency_key}) со статусом '{self.status}'."
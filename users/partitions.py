@@ -0,0 +1,251 @@
+# users/partitions.py
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import connection, transaction
+from django.utils.timezone import now
+from django.conf import settings
+from pathlib import Path
+from .models import *
+import gzip
+import json
+import os
+
+USER_ACTION_TABLE = User_action._meta.db_table
+
+
+def month_start(value):
+    """
+    Возвращает начало месяца (UTC) для переданной даты/времени.
+    """
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def next_month(value):
+    """
+    Возвращает начало следующего месяца относительно начала месяца value.
+    """
+    if value.month == 12:
+        return datetime(value.year + 1, 1, 1, tzinfo=dt_timezone.utc)
+    return datetime(value.year, value.month + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    """
+    Формирует имя месячной секции таблицы действий пользователей.
+    """
+    return f"{USER_ACTION_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned():
+    """
+    Проверяет, разбита ли таблица действий пользователей на секции (только PostgreSQL).
+    """
+    if connection.vendor != 'postgresql':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [USER_ACTION_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_exists(month):
+    """
+    Проверяет наличие секции за указанный месяц.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [partition_name(month)])
+        return cursor.fetchone()[0] is not None
+
+
+def create_partitions(months_ahead=None):
+    """
+    Создает месячные секции на текущий месяц и months_ahead месяцев вперед.
+    Возвращает список имен созданных (или уже существующих) секций.
+    """
+    if months_ahead is None:
+        months_ahead = settings.USER_ACTIONS_PARTITIONS_AHEAD
+
+    if not is_partitioned():
+        return []
+
+    month = month_start(now())
+    names = []
+
+    with connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            name = partition_name(month)
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{USER_ACTION_TABLE}" '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [month, next_month(month)]
+            )
+            names.append(name)
+            month = next_month(month)
+
+    return names
+
+
+def get_expired_months(retention_days=None):
+    """
+    Возвращает список месяцев, все записи которых старше срока хранения.
+    """
+    if retention_days is None:
+        retention_days = settings.USER_ACTIONS_RETENTION_DAYS
+
+    cutoff = month_start(now() - timedelta(days=retention_days))
+    oldest = User_action.objects.order_by('date_of_issue').values_list('date_of_issue', flat=True).first()
+
+    if oldest is None:
+        return []
+
+    months = []
+    month = month_start(oldest)
+
+    while month < cutoff:
+        months.append(month)
+        month = next_month(month)
+
+    return months
+
+
+def serialize_action(action):
+    """
+    Формирует строку архива (JSONL) для действия пользователя.
+    """
+    return json.dumps({
+        'id': action.id,
+        'date_of_issue': action.date_of_issue.isoformat(),
+        'type_id': action.type_id,
+        'type_name': action.type.name,
+        'user_id': action.user_id,
+        'username': action.user.username,
+        'description': action.description,
+        'status': action.status,
+    }, ensure_ascii=False) + '\n'
+
+
+def delete_month(month, partitioned):
+    """
+    Удаляет действия пользователей за месяц: отсоединяет и удаляет секцию или удаляет строки таблицы.
+    """
+    with transaction.atomic():
+        if partitioned:
+            with connection.cursor() as cursor:
+                name = partition_name(month)
+                cursor.execute(f'ALTER TABLE "{USER_ACTION_TABLE}" DETACH PARTITION "{name}"')
+                cursor.execute(f'DROP TABLE "{name}"')
+        else:
+            User_action.objects.filter(date_of_issue__gte=month, date_of_issue__lt=next_month(month)).delete()
+
+
+def archive_month(month, archive_dir=None, chunk_size=2000):
+    """
+    Выгружает действия пользователей за месяц в сжатый JSONL-файл и удаляет их из таблицы.
+    Если таблица секционирована, секция месяца отсоединяется и удаляется целиком.
+    Архив собирается во временном файле и атомарно подменяет прежний, и только после этого данные удаляются
+    из базы, поэтому прерванный запуск можно просто повторить. Записи прежнего архива (например, оставшиеся
+    после восстановления) переносятся в новый, если их нет в базе, - так строки не дублируются и не теряются.
+    Возвращает путь к архиву и количество выгруженных из базы записей.
+    """
+    archive_dir = Path(archive_dir or settings.USER_ACTIONS_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    start, end = month, next_month(month)
+    path = archive_dir / f"user_actions_{month.year}_{month.month:02d}.jsonl.gz"
+    temp_path = path.with_name(path.name + '.tmp')
+    actions = User_action.objects.filter(
+        date_of_issue__gte=start,
+        date_of_issue__lt=end
+    ).select_related('type', 'user').order_by('date_of_issue', 'id')
+    partitioned = is_partitioned() and partition_exists(month)
+    count = 0
+
+    if not partitioned and not actions.exists():
+        return path, count
+
+    with open(temp_path, 'wb') as raw:
+        with gzip.open(raw, 'wt', encoding='utf-8') as archive:
+            if path.exists():
+                for rows in iter_batches(iter_archive(path), chunk_size):
+                    in_table = set(User_action.objects.filter(id__in=[row['id'] for row in rows]).values_list('id', flat=True))
+
+                    for row in rows:
+                        if row['id'] not in in_table:
+                            archive.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+            for action in actions.iterator(chunk_size=chunk_size):
+                archive.write(serialize_action(action))
+                count += 1
+
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    os.replace(temp_path, path)
+    delete_month(month, partitioned)
+
+    return path, count
+
+
+def iter_batches(rows, batch_size):
+    """
+    Разбивает поток строк на списки не длиннее batch_size.
+    """
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def iter_archive(path):
+    """
+    Построчно читает архив действий пользователей, не загружая его в память целиком.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            if line.strip():
+                yield json.loads(line)
+
+
+def restore_archive(path, batch_size=2000):
+    """
+    Возвращает записи из архива в таблицу действий пользователей.
+    Записи удаленных пользователей и уже существующие записи пропускаются.
+    Возвращает количество восстановленных записей.
+    """
+    restored = 0
+    status_field = User_action._meta.get_field('status')
+
+    def flush(batch):
+        user_ids = set(User.objects.filter(id__in={row['user_id'] for row in batch}).values_list('id', flat=True))
+        existing = set(User_action.objects.filter(id__in=[row['id'] for row in batch]).values_list('id', flat=True))
+        rows = [
+            (row['id'], datetime.fromisoformat(row['date_of_issue']), row['type_id'],
+             row['user_id'], row['description'], status_field.get_prep_value(row['status']))
+            for row in batch if row['user_id'] in user_ids and row['id'] not in existing
+        ]
+
+        # Вставка идет в обход ORM, так как auto_now_add перезаписал бы исходную дату действия
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO "{USER_ACTION_TABLE}" (id, date_of_issue, type_id, user_id, description, status) '
+                f'VALUES (%s, %s, %s, %s, %s, %s)',
+                rows
+            )
+
+        return len(rows)
+
+    with transaction.atomic():
+        for batch in iter_batches(iter_archive(path), batch_size):
+            restored += flush(batch)
+
+    return restored
@@ -9,6 +9,7 @@ from django.utils.encoding import force_bytes
 from management.models import User_project
 from rest_framework import serializers
 from django.utils.timezone import now
+from django.db import transaction
 from django.conf import settings
 from .models import *
 from .utils import *
@@ -30,6 +31,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         model = User
         fields = ('username', 'email', 'first_name', 'last_name', 'password')
     
+    @transaction.atomic
     def create(self, validated_data):
         password = validated_data.pop('password')
 
@@ -76,6 +78,7 @@ class UserLoginSerializer(serializers.Serializer):
 
         return data
     
+    @transaction.atomic
     def create(self, validated_data):
         user = validated_data['user']
 
@@ -133,6 +136,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
         return data
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         password = validated_data.pop('new_password', None)
         validated_data.pop('current_password', None)
@@ -175,7 +179,8 @@ class AllUserInfoSerializer(serializers.ModelSerializer):
         ]
 
     def get_projects(self, user):
-        user_projects = User_project.objects.filter(user=user.id).select_related('project', 'user_group')
+        # Участие в проектах заранее загружается во вью через prefetch_related
+        user_projects = user.user_project.all()
 
         return [
             {
@@ -192,13 +197,16 @@ class PasswordResetSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def validate_email(self, value):
-        if not User.objects.filter(email=value).exists():
+        # Пользователь запоминается здесь, чтобы save() не запрашивал его повторно
+        self.user = User.objects.filter(email=value).first()
+
+        if self.user is None:
             raise serializers.ValidationError({'no_user':'Пользователь с таким email не найден.'})
         return value
 
+    @transaction.atomic
     def save(self):
-        email = self.validated_data['email']
-        user = User.objects.get(email=email)
+        user = self.user
         token = default_token_generator.make_token(user)
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         reset_link = f"{settings.FRONTEND_URL}/password-reset-confirm/{uid}/{token}/"
@@ -206,7 +214,8 @@ class PasswordResetSerializer(serializers.Serializer):
         send_mail_notification(
             users=[user], 
             header="Восстановление пароля", 
-            text=f"Перейдите по ссылке для сброса пароля: {reset_link}"
+            text=f"Перейдите по ссылке для сброса пароля: {reset_link}",
+            idempotency_key=f"password-reset:{token}"
         )
 
 
@@ -214,6 +223,7 @@ class PasswordResetSerializer(serializers.Serializer):
 class ConfirmPasswordResetSerializer(serializers.Serializer):
     new_password = serializers.CharField(write_only=True)
 
+    @transaction.atomic
     def save(self):
         uidb64 = self.context.get('uidb64')
         token = self.context.get('token')
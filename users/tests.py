@@ -1,3 +1,384 @@
-from django.test import TestCase
+# users/tests.py
 
-# Create your tests here.
+from project_management_system_backend.testing import NPlusOneTestCase, ProjectFixtureTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils.timezone import now
+from django.conf import settings
+from unittest.mock import patch
+from io import StringIO
+from datetime import datetime, timedelta, timezone as dt_timezone
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from project_management_system_backend.benchmarks import get_client, measure
+from users.management.commands.run_benchmarks import Command as RunBenchmarksCommand
+from django.core.management import CommandError, call_command
+from management.models import User_project
+from .utils import OUTBOX_HANDLERS, dispatch_outbox_events, send_mail_notification
+from .partitions import archive_month, iter_archive, restore_archive
+from .views import GetAllUsersInfoView
+from .models import Outbox_event, User, User_action
+import json
+
+
+class UserListQueriesTests(NPlusOneTestCase):
+    def test_get_all_users_info(self):
+        # Руководитель, администратор, участники и пользователи вне проекта
+        self.assertNoNPlusOne(self.data.admin, '/api/get-all-users-info/', self.rows * 2 + 2)
+
+    def test_get_users_actions(self):
+        url = f'/api/get-actions/user/{self.data.member.id}/type/{self.data.action_type.id}/'
+        self.assertNoNPlusOne(self.data.admin, url, self.rows)
+
+
+class StreamingUserListTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    def get_users(self, chunk_size):
+        with patch.object(GetAllUsersInfoView, 'chunk_size', chunk_size):
+            response = self.client.get('/api/get-all-users-info/')
+            content = b''.join(response.streaming_content)
+
+        return json.loads(content)
+
+    def test_chunk_boundaries(self):
+        ids = sorted(User.objects.values_list('id', flat=True))
+        projects = {user['id']: len(user['projects']) for user in self.get_users(2000)}
+
+        # Число пользователей кратно размеру порции, не кратно ему и порция из одного пользователя
+        for chunk_size in (len(ids) // 2, len(ids) - 1, 1):
+            with self.subTest(chunk_size=chunk_size):
+                users = self.get_users(chunk_size)
+
+                self.assertEqual([user['id'] for user in users], ids)
+                self.assertEqual({user['id']: len(user['projects']) for user in users}, projects)
+
+        self.assertEqual(projects[self.data.member.id], self.rows)
+
+    def test_queries_per_chunk(self):
+        with CaptureQueriesContext(connection) as context:
+            self.get_users(len(self.data.members))
+
+        # Один запрос пользователей, читаемый порциями, и запрос участия в проектах на каждую из трех порций
+        self.assertEqual(len(context.captured_queries), 1 + 3)
+
+    def test_not_admin(self):
+        self.client.force_authenticate(self.data.leader)
+        response = self.client.get('/api/get-all-users-info/')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.streaming)
+
+
+THROTTLE_RATES = {
+    'ip': '5/min',
+    'user': '100/min',
+    'login': '2/min',
+    'registration': '2/min',
+    'password_reset': '2/min',
+    'statistics': '1/min',
+    'join_request': '2/min',
+}
+
+
+@override_settings(THROTTLE_ENABLED=True,
+                   REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': THROTTLE_RATES})
+class ThrottlingTests(ProjectFixtureTestCase):
+    rows = 2
+    user = None
+
+    def login(self):
+        return self.client.post('/api/login/', {'username': 'leader', 'password': 'wrong'}, format='json')
+
+    def test_login_rejected_before_db_work(self):
+        for _ in range(2):
+            self.assertNotEqual(self.login().status_code, 429)
+
+        with self.assertNumQueries(0):
+            response = self.login()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_ip_limit_checked_before_authentication(self):
+        # Неверный токен дал бы 401, но лимит по IP проверяется раньше аутентификации
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        url = '/api/get-my-projects-list/'
+
+        for _ in range(5):
+            self.assertEqual(self.client.get(url).status_code, 401)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 429)
+
+    def test_ip_limit_per_address(self):
+        for _ in range(2):
+            self.login()
+
+        self.assertEqual(self.login().status_code, 429)
+        response = self.client.post('/api/login/', {'username': 'leader', 'password': 'wrong'},
+                                    format='json', REMOTE_ADDR='10.0.0.2')
+        self.assertNotEqual(response.status_code, 429)
+
+    def test_scoped_user_limit(self):
+        url = f'/api/project/{self.data.project.id}/statistics/status-distribution/'
+        self.client.force_authenticate(self.data.leader)
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 429)
+
+        # Лимит считается по пользователю, а не по адресу
+        self.client.force_authenticate(self.data.admin)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(4):
+            self.assertNotEqual(self.login().status_code, 429)
+
+
+class OutboxTests(ProjectFixtureTestCase):
+    rows = 1
+    user = 'admin'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.data.member.notifications_status = True
+        cls.data.member.save(update_fields=['notifications_status'])
+
+    def enqueue(self, key='test:1'):
+        send_mail_notification([self.data.member], "Заголовок", "Текст", idempotency_key=key)
+
+    def dispatch(self, handler):
+        with patch.dict(OUTBOX_HANDLERS, {'email': handler}):
+            return dispatch_outbox_events()
+
+    def test_same_business_event_enqueued_once(self):
+        self.enqueue()
+        self.enqueue()
+
+        self.assertEqual(Outbox_event.objects.get().idempotency_key, f"email:test:1:{self.data.member.id}")
+
+    def test_repeated_action_enqueued_again(self):
+        for _ in range(2):
+            self.client.put('/api/change-project-leader-rights/', {'user_id': self.data.member.id}, format='json')
+
+        self.assertEqual(Outbox_event.objects.count(), 2)
+
+    def test_sent(self):
+        self.enqueue()
+
+        self.assertEqual(self.dispatch(lambda payload: None), 1)
+        event = Outbox_event.objects.get()
+        self.assertEqual(event.status, 'Отправлено')
+        self.assertIsNotNone(event.processed_at)
+
+    def test_claimed_before_sending(self):
+        self.enqueue()
+        nested = []
+
+        # Пока письмо отправляется, событие уже занято и другому обработчику не достается
+        self.dispatch(lambda payload: nested.append(dispatch_outbox_events()))
+
+        self.assertEqual(nested, [0])
+
+    def test_retry_with_backoff(self):
+        self.enqueue()
+        delays = []
+
+        def fail(payload):
+            raise ConnectionError("SMTP недоступен")
+
+        for _ in range(3):
+            Outbox_event.objects.update(available_at=now())
+            start = now()
+            self.dispatch(fail)
+            event = Outbox_event.objects.get()
+            delays.append(round((event.available_at - start).total_seconds()))
+
+        self.assertEqual(event.status, 'Ожидает')
+        self.assertEqual(event.attempts, 3)
+        self.assertEqual(event.last_error, "SMTP недоступен")
+        self.assertEqual(delays, [60, 120, 240])
+
+    def test_not_retried_before_backoff(self):
+        self.enqueue()
+        self.dispatch(lambda payload: 1 / 0)
+
+        self.assertEqual(self.dispatch(lambda payload: None), 0)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_dead_letter(self):
+        self.enqueue()
+
+        for _ in range(3):
+            Outbox_event.objects.update(available_at=now() - timedelta(seconds=1))
+            self.dispatch(lambda payload: 1 / 0)
+
+        event = Outbox_event.objects.get()
+        self.assertEqual(event.status, 'Ошибка')
+        self.assertEqual(event.attempts, 2)
+
+
+class ExportUserActionsTests(ProjectFixtureTestCase):
+    user = 'admin'
+
+    def get_rows(self, params):
+        response = self.client.get('/api/export-actions/', params)
+
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_bad_id(self):
+        for param in ('user_id', 'type_id'):
+            response = self.client.get('/api/export-actions/', {param: 'x'})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {param: 'Идентификатор должен быть числом.'})
+
+    def test_empty_id_ignored(self):
+        rows = self.get_rows({'user_id': '', 'type_id': ''})
+
+        self.assertEqual(len(rows), 3)
+
+    def test_unknown_id(self):
+        self.assertEqual(self.get_rows({'user_id': self.data.leader.id}), [])
+
+    def test_date_to_includes_whole_day(self):
+        first, second, third = User_action.objects.order_by('id')
+        day = datetime(2020, 1, 31, tzinfo=dt_timezone.utc)
+        User_action.objects.filter(id=first.id).update(date_of_issue=day + timedelta(days=1, microseconds=-1))
+        User_action.objects.filter(id=second.id).update(date_of_issue=day + timedelta(days=1))
+        User_action.objects.filter(id=third.id).update(date_of_issue=day - timedelta(microseconds=1))
+
+        rows = self.get_rows({'date_from': '2020-01-31', 'date_to': '2020-01-31'})
+
+        self.assertEqual([row['id'] for row in rows], [first.id])
+
+    def test_not_admin(self):
+        self.client.force_authenticate(self.data.leader)
+        response = self.client.get('/api/export-actions/')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ArchiveUserActionsTests(ProjectFixtureTestCase):
+    user = None
+    month = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        User_action.objects.update(date_of_issue=cls.month + timedelta(days=1))
+
+    def setUp(self):
+        super().setUp()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive_dir = directory.name
+
+    def get_archived_ids(self, path):
+        return sorted(row['id'] for row in iter_archive(path))
+
+    def test_other_months_untouched(self):
+        first, *rest = User_action.objects.order_by('id')
+        User_action.objects.filter(id=first.id).update(date_of_issue=self.month - timedelta(seconds=1))
+        path, count = archive_month(self.month, self.archive_dir)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(self.get_archived_ids(path), [action.id for action in rest])
+        self.assertEqual(list(User_action.objects.values_list('id', flat=True)), [first.id])
+
+    def test_empty_month(self):
+        path, count = archive_month(datetime(2019, 1, 1, tzinfo=dt_timezone.utc), self.archive_dir)
+
+        self.assertEqual(count, 0)
+        self.assertFalse(path.exists())
+        self.assertEqual(User_action.objects.count(), 3)
+
+    def test_crash_while_writing_keeps_previous_archive(self):
+        ids = sorted(User_action.objects.values_list('id', flat=True))
+        path, _ = archive_month(self.month, self.archive_dir)
+        restore_archive(path)
+
+        with patch('users.partitions.serialize_action', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_month(self.month, self.archive_dir)
+
+        self.assertEqual(self.get_archived_ids(path), ids)
+        self.assertEqual(User_action.objects.count(), 3)
+
+    def test_rerun_after_crash_does_not_duplicate(self):
+        ids = sorted(User_action.objects.values_list('id', flat=True))
+
+        # Архив записан, но удаление из базы не выполнено
+        with patch('users.partitions.delete_month', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_month(self.month, self.archive_dir)
+
+        path, _ = archive_month(self.month, self.archive_dir)
+
+        self.assertEqual(self.get_archived_ids(path), ids)
+        self.assertFalse(User_action.objects.exists())
+
+    def test_rearchive_after_partial_restore_keeps_all_rows(self):
+        User_action.objects.create(type=self.data.action_type, user=self.data.leader, description='Действие', status='Успешно')
+        User_action.objects.update(date_of_issue=self.month + timedelta(days=1))
+        ids = sorted(User_action.objects.values_list('id', flat=True))
+        path, _ = archive_month(self.month, self.archive_dir)
+
+        # Записи удаленного пользователя не восстанавливаются, но должны остаться в архиве
+        self.data.member.delete()
+
+        self.assertEqual(restore_archive(path), 1)
+        archive_month(self.month, self.archive_dir)
+        self.assertEqual(self.get_archived_ids(path), ids)
+
+
+# Клиент замеров обращается к localhost, который без DEBUG (как в тестах) не входит в ALLOWED_HOSTS
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class BenchmarkTests(ProjectFixtureTestCase):
+    user = None
+    result = {'p50': 1.0, 'p95': 10.0, 'p99': 12.0, 'queries': 5, 'bytes': 100}
+
+    def check_regressions(self, results, baseline):
+        with NamedTemporaryFile('w', suffix='.json') as baseline_file:
+            json.dump(baseline, baseline_file)
+            baseline_file.flush()
+            RunBenchmarksCommand(stdout=StringIO()).check_regressions(results, baseline_file.name, 25.0)
+
+    def test_unexpected_status(self):
+        with self.assertRaisesMessage(RuntimeError, 'GET /api/get-all-users-info/ вернул статус 403.'):
+            measure(get_client(self.data.member), 'get', '/api/get-all-users-info/', repeat=1)
+
+    def test_rollback_repeats_write(self):
+        url = f'/api/project/{self.data.project.id}/remove-member/{self.data.members[1].id}/'
+
+        # Без отката второе удаление того же участника вернуло бы ошибку
+        measure(get_client(self.data.leader), 'delete', url, repeat=2, rollback=True, expected_status=(204,))
+
+        self.assertTrue(User_project.objects.filter(project=self.data.project, user=self.data.members[1]).exists())
+
+    def test_no_load_data(self):
+        with self.assertRaisesMessage(CommandError, 'сначала выполните generate_load_data'):
+            call_command('run_benchmarks', prefix='missing', stdout=StringIO())
+
+    def test_regressions(self):
+        slower = dict(self.result, p95=12.6)
+        more_queries = dict(self.result, queries=6)
+
+        with self.assertRaisesMessage(CommandError, 'slower: p95 10.0 мс -> 12.6 мс'):
+            self.check_regressions({'slower': slower}, {'slower': self.result})
+
+        with self.assertRaisesMessage(CommandError, 'more-queries: SQL-запросов 5 -> 6'):
+            self.check_regressions({'more-queries': more_queries}, {'more-queries': self.result})
+
+    def test_within_threshold_and_new_endpoints(self):
+        results = {'same': dict(self.result, p95=12.5), 'new': dict(self.result, queries=50)}
+
+        self.check_regressions(results, {'same': self.result})
+
+    def test_missing_baseline(self):
+        with self.assertRaisesMessage(CommandError, 'не найден'):
+            RunBenchmarksCommand().check_regressions({}, '/nonexistent/baseline.json', 25.0)
@@ -16,6 +16,7 @@ urlpatterns = [
     path('get-all-users-info/', GetAllUsersInfoView.as_view(), name='get-all-users-info'),
     path('get-action-types/', GetActionTypesView.as_view(), name='get-action-types'),
     path('get-actions/user/<user_id>/type/<type_id>/', GetUsersActionsView.as_view(), name='get-user-actions'),
+    path('export-actions/', ExportUsersActionsView.as_view(), name='export-user-actions'),
     path('password-reset/', PasswordResetView.as_view(), name='password-reset'),
     path('password-reset-confirm/<uidb64>/<token>/', PasswordResetConfirmView.as_view(), name='password-reset-confirm'),
 ]
\ No newline at end of file
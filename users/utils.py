@@ -1,35 +1,267 @@
 # users/utils.py
 
 from .models import *
-from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.utils.timezone import now
+from django.db import transaction
 from django.conf import settings
+from datetime import timedelta
+import json
+import csv
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
 
 def log_user_action(user, action_name, description, status='Успешно'):
     """
     Функция для записи действий пользователей в системе в таблицу User_action.
+    Возвращает созданную запись (ее ID используется в ключах идемпотентности уведомлений).
     """
     try:
         action_type = Action_type.objects.get(name=action_name)
     except Action_type.DoesNotExist:
         action_type = Action_type.objects.create(name=action_name)
     
-    User_action.objects.create(
+    return User_action.objects.create(
         type=action_type,
         user=user,
         description=description,
         status=status
     )
 
-def send_mail_notification(users, header, text):
+def send_mail_notification(users, header, text, idempotency_key):
+    """
+    Функция для постановки писем указанным пользователям в очередь отправки (таблица Outbox_event).
+    Событие сохраняется в той же транзакции, что и изменение данных, а отправляет его команда dispatch_outbox.
+    idempotency_key описывает бизнес-событие: действие, ID объекта и, если событие с объектом может повторяться,
+    версию объекта или ID записи журнала действий (ID получателя добавляет email_event).
+    Повторная постановка с тем же ключом игнорируется.
+    """
+    events = [email_event(user, header, text, idempotency_key) for user in users if user.notifications_status]
+
+    Outbox_event.objects.bulk_create(events, ignore_conflicts=True)
+
+
+def email_event(user, header, text, idempotency_key):
+    """
+    Возвращает несохраненное событие очереди с письмом пользователю (для пакетной постановки через bulk_create).
+    """
+    return Outbox_event(
+        channel='email',
+        payload={'email': user.email, 'header': header, 'text': text},
+        idempotency_key=f"email:{idempotency_key}:{user.id}"
+    )
+
+
+def send_email_event(payload):
+    """
+    Обработчик события очереди: отправляет письмо на почту.
+    """
+    # Модули почты нужны только обработчику очереди, а не воркерам API
+    from django.core.mail import send_mail
+
+    send_mail(
+        payload['header'],
+        payload['text'],
+        settings.EMAIL_HOST_USER,
+        [payload['email']],
+        fail_silently=False,
+    )
+
+
+OUTBOX_HANDLERS = {
+    'email': send_email_event,
+}
+
+
+def claim_outbox_events(batch_size):
+    """
+    Выбирает порцию готовых к отправке событий и занимает их на OUTBOX_CLAIM_SECONDS, сдвигая available_at.
+    Транзакция короткая: строки блокируются с SKIP LOCKED только на время выбора, поэтому несколько
+    обработчиков могут работать параллельно и не ждут друг друга. Если обработчик упадет, не сохранив
+    результат, события снова станут доступны по истечении этого времени.
+    """
+    with transaction.atomic():
+        events = list(
+            Outbox_event.objects.select_for_update(skip_locked=True).filter(
+                status='Ожидает',
+                available_at__lte=now()
+            ).order_by('id')[:batch_size]
+        )
+
+        Outbox_event.objects.filter(id__in=[event.id for event in events]).update(
+            available_at=now() + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+        )
+
+    return events
+
+
+def dispatch_outbox_events(batch_size=100):
+    """
+    Обрабатывает очередную порцию готовых к отправке событий очереди (доставка "как минимум один раз").
+    События занимаются в отдельной короткой транзакции, а письма отправляются вне ее, поэтому
+    медленный SMTP-сервер не держит блокировки и транзакцию открытыми.
+    При ошибке событие откладывается с экспоненциальной задержкой, после OUTBOX_MAX_ATTEMPTS попыток
+    помечается как ошибочное. Возвращает количество обработанных событий.
+    """
+    events = claim_outbox_events(batch_size)
+
+    for event in events:
+        try:
+            OUTBOX_HANDLERS[event.channel](event.payload)
+        except Exception as error:
+            event.attempts += 1
+            event.last_error = str(error)[:1000]
+            event.available_at = now() + timedelta(seconds=min(3600, 30 * 2 ** event.attempts))
+
+            if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                event.status = 'Ошибка'
+        else:
+            event.status = 'Отправлено'
+            event.processed_at = now()
+
+    Outbox_event.objects.bulk_update(
+        events, ['status', 'attempts', 'last_error', 'available_at', 'processed_at']
+    )
+
+    return len(events)
+
+
+def get_date_param(request, name):
+    """
+    Возвращает дату из параметра запроса name (формат ГГГГ-ММ-ДД) или None, если параметр не передан.
+    """
+    value = request.query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        date = parse_date(value)
+    except ValueError:
+        date = None
+
+    if date is None:
+        raise ValidationError({name: 'Некорректная дата, ожидается формат ГГГГ-ММ-ДД.'})
+    return date
+
+
+def get_id_param(request, name):
     """
-    Функция для отправки сообщения на почту указанных пользователей.
+    Возвращает идентификатор из параметра запроса name или None, если параметр не передан.
     """
-    for user in users:
-        if user.notifications_status:
-            send_mail(
-                header,
-                text,
-                settings.EMAIL_HOST_USER,
-                [user.email],
-                fail_silently=False,
-            )
+    value = request.query_params.get(name)
+
+    if not value:
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Идентификатор должен быть числом.'})
+
+
+def get_choice_params(request, model, name, field_name=None):
+    """
+    Возвращает множество значений параметра запроса name (через запятую), проверенных по меткам
+    поля LabelChoiceField модели, или None, если параметр не передан.
+    """
+    value = request.query_params.get(name)
+
+    if not value:
+        return None
+
+    values = {item.strip() for item in value.split(',') if item.strip()}
+    unknown = values - set(model._meta.get_field(field_name or name).codes)
+
+    if unknown:
+        raise ValidationError({name: f"Недопустимые значения: {', '.join(sorted(unknown))}."})
+    return values
+
+
+def get_export_format(request):
+    """
+    Возвращает формат выгрузки из параметра file_format (ndjson по умолчанию).
+    """
+    export_format = request.query_params.get('file_format', 'ndjson')
+
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({'file_format': 'Поддерживаются только форматы ndjson и csv.'})
+    return export_format
+
+
+class _Echo:
+    """
+    Псевдо-файл для csv.writer, возвращающий записанную строку вместо ее буферизации.
+    """
+    def write(self, value):
+        return value
+
+
+def stream_export(queryset, columns, export_format, filename, chunk_size=2000):
+    """
+    Формирует потоковый ответ с выгрузкой queryset в формате NDJSON или CSV.
+    columns - словарь "название колонки: путь к полю" для values_list.
+    Строки читаются из БД частями через iterator(), поэтому потребление памяти не зависит от объема выгрузки.
+    """
+    headers = list(columns)
+    rows = queryset.values_list(*columns.values()).iterator(chunk_size=chunk_size)
+
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+
+        def format_row(row):
+            return writer.writerow(row)
+
+        first_line = writer.writerow(headers)
+    else:
+        def format_row(row):
+            return json.dumps(dict(zip(headers, row)), ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+
+        first_line = ''
+
+    def content():
+        lines = [first_line]
+
+        for row in rows:
+            lines.append(format_row(row))
+
+            if len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+
+        yield ''.join(lines)
+
+    response = StreamingHttpResponse(content(), content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+
+    return response
+
+
+def stream_json_list(queryset, serializer_class, chunk_size=2000):
+    """
+    Формирует потоковый ответ с JSON-списком объектов queryset, сериализованных serializer_class.
+    Объекты читаются частями через iterator(), prefetch_related выполняется отдельно для каждой части,
+    поэтому в памяти одновременно находится не более chunk_size объектов вместе со связанными.
+    """
+    def content():
+        lines = ['[']
+        separator = ''
+
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            lines.append(separator + json.dumps(serializer_class(instance).data, ensure_ascii=False, cls=DjangoJSONEncoder))
+            separator = ','
+
+            if len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+
+        lines.append(']')
+        yield ''.join(lines)
+
+    return StreamingHttpResponse(content(), content_type='application/json')
@@ -5,7 +5,12 @@ from management.base_access_views import BaseAdminAccessView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .utils import log_user_action
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from .utils import log_user_action, get_date_param, get_id_param, get_choice_params, get_export_format, stream_export, stream_json_list
+from management.models import User_project
+from tasks.utils import refresh_comment_counts
+from django.db.models import Prefetch
+from django.db import transaction
 from rest_framework import status
 from .serializers import *
 from .models import *
@@ -14,6 +19,7 @@ from .models import *
 # Вью для регистрации пользователей
 class UserRegistrationView(CreateAPIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'registration'
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
 
@@ -21,6 +27,7 @@ class UserRegistrationView(CreateAPIView):
 # Вью для входа пользователей в систему
 class UserLoginView(GenericAPIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
     serializer_class = UserLoginSerializer
 
     def post(self, request):
@@ -63,16 +70,44 @@ class DeleteUserAccount(DestroyAPIView):
     def get_object(self):
         return self.request.user
 
+    def perform_destroy(self, instance):
+        # Комментарии пользователя удаляются каскадно, поэтому счетчики комментариев задач пересчитываются
+        commented_tasks = list(instance.user_comments.values_list('task', flat=True).distinct())
+
+        with transaction.atomic():
+            instance.delete()
+            refresh_comment_counts(commented_tasks)
+
 
 # Вью для получения полной информации о всех пользователях
 class GetAllUsersInfoView(BaseAdminAccessView, ListAPIView):
+    """
+    Ответ формируется потоково: пользователи читаются одним запросом порциями по chunk_size, участие
+    в проектах загружается отдельным запросом на порцию, выбираются только выводимые столбцы. Потребление памяти
+    ограничено одной порцией: при 2000 пользователей и ~10 проектах у каждого это порядка 20-30 МБ
+    независимо от общего числа пользователей (в том числе для 1 млн).
+    """
     serializer_class = AllUserInfoSerializer
-    queryset = User.objects.all()
+    chunk_size = 2000
+
+    def get_queryset(self):
+        user_projects = User_project.objects.select_related('project', 'user_group').only(
+            'user_id', 'project__id', 'project__title', 'user_group__name'
+        )
+
+        return User.objects.only(
+            'id', 'username', 'first_name', 'last_name', 'email', 'date_joined', 'last_login',
+            'is_project_leader', 'is_admin', 'is_active'
+        ).prefetch_related(Prefetch('user_project', queryset=user_projects)).order_by('id')
+
+    def list(self, request, *args, **kwargs):
+        return stream_json_list(self.get_queryset(), self.serializer_class, self.chunk_size)
 
 
 # Вью для проверки пользователя и формирования письма для восстановления пароля
 class PasswordResetView(CreateAPIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'password_reset'
     serializer_class = PasswordResetSerializer
 
 
@@ -80,6 +115,7 @@ class PasswordResetView(CreateAPIView):
 class PasswordResetConfirmView(CreateAPIView):
     serializer_class = ConfirmPasswordResetSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'password_reset'
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -104,4 +140,48 @@ class GetUsersActionsView(BaseAdminAccessView, ListAPIView):
         user_id = self.kwargs.get('user_id')
         type_id = self.kwargs.get('type_id')
 
-        return User_action.objects.filter(user=user_id, type=type_id)
+        return User_action.objects.filter(user=user_id, type=type_id).select_related('user', 'type').order_by('-date_of_issue')
+
+
+# Вью для потоковой выгрузки действий пользователей в системе (NDJSON/CSV)
+class ExportUsersActionsView(BaseAdminAccessView, GenericAPIView):
+    columns = {
+        'id': 'id',
+        'date_of_issue': 'date_of_issue',
+        'user_id': 'user_id',
+        'username': 'user__username',
+        'action_type_name': 'type__name',
+        'description': 'description',
+        'status': 'status',
+    }
+
+    def get_queryset(self):
+        actions = User_action.objects.all()
+
+        for param, lookup in (('user_id', 'user'), ('type_id', 'type')):
+            value = get_id_param(self.request, param)
+
+            if value is not None:
+                actions = actions.filter(**{lookup: value})
+
+        statuses = get_choice_params(self.request, User_action, 'status')
+
+        if statuses:
+            actions = actions.filter(status__in=statuses)
+
+        date_from = get_date_param(self.request, 'date_from')
+        date_to = get_date_param(self.request, 'date_to')
+
+        # Сравнение с границами дня, а не по date_of_issue__date, позволяет использовать индекс и отсекать секции
+        if date_from:
+            actions = actions.filter(date_of_issue__gte=datetime.combine(date_from, time.min, tzinfo=dt_timezone.utc))
+
+        if date_to:
+            actions = actions.filter(date_of_issue__lt=datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=dt_timezone.utc))
+
+        return actions.order_by('date_of_issue', 'id')
+
+    def get(self, request, *args, **kwargs):
+        export_format = get_export_format(request)
+
+        return stream_export(self.get_queryset(), self.columns, export_format, 'user_actions')